@@ -26,6 +26,33 @@ def create_app(config_object=None):
 
     db.init_app(app)
     migrate = Migrate(app, db)
+
+    from app.utils.cache import init_cache
+    from app.utils.auth import init_user_cache
+    from app.utils.passwords import init_password_hasher
+    from app.utils.outbox import init_outbox
+    from app.utils.suggest import init_suggest
+    from app.utils.recommend import init_recommender
+    from app.utils.json_provider import init_json_provider
+    from app.utils.compression import init_compression
+    from app.utils.blobs import init_blob_store
+    from app.utils.avatars import init_avatar_worker
+    from app.utils.uploads import init_uploads
+    from app.utils.maintenance import init_maintenance
+    from app.utils.ratelimit import init_rate_limits
+    init_json_provider(app)
+    init_compression(app)
+    init_cache(app)
+    init_user_cache(app)
+    init_password_hasher(app)
+    init_outbox(app)
+    init_suggest(app)
+    init_recommender(app)
+    init_blob_store(app)
+    init_avatar_worker(app)
+    init_uploads(app)
+    init_maintenance(app)
+    init_rate_limits(app)
     jwt.init_app(app)
 
     # Configure JWT to use string identities
@@ -36,8 +63,8 @@ def create_app(config_object=None):
     @jwt.user_lookup_loader
     def user_lookup_callback(_jwt_header, jwt_data):
         identity = jwt_data["sub"]
-        from app.models import User
-        return User.query.get(int(identity))
+        from app.utils.auth import load_user_summary
+        return load_user_summary(int(identity))
 
     # JWT error handlers for better debugging
     @jwt.expired_token_loader
@@ -68,6 +95,10 @@ def create_app(config_object=None):
     app.register_blueprint(project_bp, url_prefix='/api/projects')
     app.register_blueprint(htf_bp, url_prefix='/api/htf')
 
+    # CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+
     # Health check route
     @app.route("/health")
     def health():
@@ -0,0 +1,190 @@
+"""
+Flask CLI commands (run with ``flask --app run <command>``).
+"""
+import click
+
+
+def register_commands(app):
+    @app.cli.command('reconcile-counters')
+    def reconcile_counters():
+        """Recompute denormalized project application counters."""
+        from app import db
+        from app.models import Project, Application
+        from app.utils.counters import reconcile_application_counts
+
+        repaired = reconcile_application_counts(db.session, Project, Application)
+        click.echo(f"Repaired counters on {repaired} project(s)")
+
+    @app.cli.command('rebuild-facets')
+    def rebuild_facets():
+        """Recompute the precomputed category/skill facet counts."""
+        from app import db
+        from app.models import Project, Skill, FacetCount, project_skills
+        from app.utils.facets import rebuild_facet_counts
+
+        written = rebuild_facet_counts(db.session, FacetCount, Project, Skill, project_skills)
+        click.echo(f"Wrote {written} facet count(s)")
+
+    @app.cli.command('migrate-blobs')
+    @click.option('--batch-size', default=50, show_default=True, help='Profiles per committed batch.')
+    def migrate_blobs(batch_size):
+        """Move legacy inline resume/avatar bytes into the blob store."""
+        from app import db
+        from app.models import Profile
+        from app.utils.blobs import get_blob_store, migrate_profile_blobs
+
+        migrated = migrate_profile_blobs(db.session, get_blob_store(), Profile, batch_size=batch_size)
+        click.echo(f"Migrated blobs for {migrated} profile(s)")
+
+    @app.cli.command('gc-blobs')
+    @click.option('--grace-minutes', default=60, show_default=True,
+                  help='Keep unreferenced blobs younger than this (uploads still committing).')
+    def gc_blobs(grace_minutes):
+        """Delete blobs no profile references any more."""
+        from datetime import timedelta
+        from app import db
+        from app.models import Profile, AvatarVariant
+        from app.utils.blobs import get_blob_store, collect_garbage, referenced_blob_hashes
+
+        referenced = referenced_blob_hashes(db.session, Profile, AvatarVariant)
+        deleted = collect_garbage(db.session, get_blob_store(), referenced, grace=timedelta(minutes=grace_minutes))
+        click.echo(f"Deleted {deleted} orphaned blob(s)")
+
+    @app.cli.command('generate-avatar-variants')
+    def generate_avatar_variants_command():
+        """Render missing avatar thumbnails (e.g. for avatars uploaded before variants existed)."""
+        from app import db
+        from app.models import Profile, AvatarVariant
+        from app.utils.blobs import get_blob_store
+        from app.utils.avatars import generate_avatar_variants, Image
+
+        if Image is None:
+            raise click.ClickException("Pillow is not installed")
+        added = 0
+        hashes = {h for (h,) in db.session.query(Profile.avatar_hash).filter(Profile.avatar_hash.isnot(None))}
+        for source_hash in hashes:
+            added += generate_avatar_variants(db.session, get_blob_store(), AvatarVariant, source_hash)
+        click.echo(f"Added {added} avatar variant(s) for {len(hashes)} avatar(s)")
+
+    @app.cli.command('email-worker')
+    @click.option('--once', is_flag=True, help='Drain what is due now and exit (e.g. from cron).')
+    def email_worker(once):
+        """Deliver queued email from the outbox over one reused SMTP connection."""
+        from app import db
+        from app.models import EmailOutbox
+        from app.utils.email import SMTPConnection, smtp_settings, smtp_configured
+        from app.utils.outbox import run_outbox_worker
+
+        settings = smtp_settings()
+        if not smtp_configured(settings):
+            raise click.ClickException("SMTP configuration missing. Set SMTP_HOST, SMTP_USER and SMTP_PASSWORD")
+        run_outbox_worker(db.session, EmailOutbox, SMTPConnection(settings), app.config, once=once, log=click.echo)
+
+    @app.cli.command('smtp-sink')
+    @click.option('--host', default='127.0.0.1', show_default=True)
+    @click.option('--port', default=1025, show_default=True)
+    def smtp_sink(host, port):
+        """Run a local SMTP server that prints mail instead of delivering it."""
+        from app.utils.smtp_sink import SMTPSink
+
+        def show(message):
+            click.echo(f"--- {message.to}: {message.subject}")
+
+        sink = SMTPSink(host, port, on_message=show)
+        click.echo(f"SMTP sink on {sink.host}:{sink.port} (use SMTP_STARTTLS=false)")
+        try:
+            sink.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    @app.cli.command('announce')
+    @click.option('--subject', help='Subject line ($name and $email are substituted).')
+    @click.option('--html-file', type=click.File('r'), help='HTML body (inserted into the club email layout).')
+    @click.option('--text-file', type=click.File('r'), help='Optional plain-text body.')
+    @click.option('--resume', 'resume_id', type=int, help='Continue an interrupted announcement by id.')
+    @click.option('--connections', default=3, show_default=True, help='Persistent SMTP connections.')
+    @click.option('--rate', default=5.0, show_default=True, help='Max emails per second (0 = unthrottled).')
+    def announce(subject, html_file, text_file, resume_id, connections, rate):
+        """Email an announcement to every member."""
+        from app import db
+        from app.models import Announcement, User, Profile, EmailOutbox
+        from app.utils.email import SMTPConnection, smtp_settings, smtp_configured
+        from app.utils.announcements import send_announcement
+
+        settings = smtp_settings()
+        if not smtp_configured(settings):
+            raise click.ClickException("SMTP configuration missing. Set SMTP_HOST, SMTP_USER and SMTP_PASSWORD")
+
+        if resume_id is not None:
+            announcement = db.session.get(Announcement, resume_id)
+            if announcement is None:
+                raise click.ClickException(f"No announcement {resume_id}")
+            if announcement.status == 'done':
+                raise click.ClickException(f"Announcement {resume_id} has already been sent")
+        else:
+            if not subject or not html_file:
+                raise click.UsageError("--subject and --html-file are required (or --resume <id>)")
+            announcement = Announcement(
+                subject=subject, body_html=html_file.read(), body_text=text_file.read() if text_file else None,
+                status='pending', last_user_id=0, sent_count=0, failed_count=0,
+            )
+            db.session.add(announcement)
+            db.session.commit()
+            click.echo(f"Created announcement {announcement.id} (resume with --resume {announcement.id})")
+
+        send_announcement(
+            db.session, db.engine, announcement, (User, Profile, EmailOutbox),
+            lambda: SMTPConnection(settings), pool_size=connections, rate=rate, log=click.echo,
+        )
+        click.echo(f"Announcement {announcement.id} done: {announcement.sent_count} sent, "
+                   f"{announcement.failed_count} handed to the email outbox")
+
+    @app.cli.group('maintenance')
+    def maintenance():
+        """Scheduled housekeeping jobs (see app.utils.maintenance)."""
+
+    @maintenance.command('run')
+    @click.option('--job', 'job_name', help='Run only this job.')
+    @click.option('--force', is_flag=True, help='Run even if the job is not due yet.')
+    @click.option('--loop', is_flag=True, help='Keep running a pass every MAINTENANCE_TICK_SECONDS.')
+    def maintenance_run(job_name, force, loop):
+        """Run the maintenance jobs that are due (e.g. from cron)."""
+        import time
+        from app import db
+        from app.models import MaintenanceRun
+        from app.utils.maintenance import JOBS, get_job, run_due_jobs
+
+        jobs = JOBS
+        if job_name:
+            job = get_job(job_name)
+            if job is None:
+                raise click.BadParameter(f"choose from {', '.join(j.name for j in JOBS)}", param_hint='--job')
+            jobs = (job,)
+        while True:
+            runs = run_due_jobs(db.session, db.engine, MaintenanceRun, jobs=jobs, force=force, log=click.echo)
+            if runs is None:
+                click.echo("Another process holds the maintenance lock; skipped")
+            elif not runs and not loop:
+                click.echo("No jobs due")
+            if not loop:
+                return
+            time.sleep(app.config['MAINTENANCE_TICK_SECONDS'])
+
+    @maintenance.command('status')
+    def maintenance_status():
+        """Show when each job last ran and how long it took."""
+        from app import db
+        from app.models import MaintenanceRun
+        from app.utils.maintenance import JOBS
+
+        runs = {run.job: run for run in db.session.query(MaintenanceRun)}
+        for job in JOBS:
+            run = runs.get(job.name)
+            if run is None or not run.run_count:
+                click.echo(f"{job.name:<22} never run (every {job.interval}s)")
+                continue
+            average = run.total_duration_ms / run.run_count
+            outcome = f"error: {run.last_error}" if run.last_error else f"result {run.last_result}"
+            click.echo(f"{job.name:<22} last {run.last_started_at:%Y-%m-%d %H:%M:%S} "
+                       f"{run.last_duration_ms:8.1f} ms (avg {average:.1f} ms over {run.run_count} runs, "
+                       f"{run.error_count} failed)  {outcome}")
@@ -1,5 +1,22 @@
 from datetime import datetime
 from . import db
+from .utils.search import register_search_ddl
+
+# Association tables for normalized skill tags. The (skill_id, owner) index
+# serves "which projects/profiles have skill X" lookups.
+project_skills = db.Table(
+    'project_skills',
+    db.Column('project_id', db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_project_skills_skill_id_project_id', 'skill_id', 'project_id'),
+)
+
+profile_skills = db.Table(
+    'profile_skills',
+    db.Column('profile_id', db.Integer, db.ForeignKey('profiles.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_profile_skills_skill_id_profile_id', 'skill_id', 'profile_id'),
+)
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -28,19 +45,38 @@ class Profile(db.Model):
     discord = db.Column(db.String(255))
     instagram = db.Column(db.String(255))
     
-    # Resume (optional)
+    # Resume (optional); bytes live in the blob store (app.utils.blobs)
     resume_filename = db.Column(db.String(255))  # Original filename
-    resume_data = db.Column(db.LargeBinary)      # PDF binary data
+    resume_hash = db.Column(db.String(64))       # SHA-256 key into the blob store
+    resume_size = db.Column(db.Integer)          # bytes
+    has_resume = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
 
     # Avatar (optional)
-    avatar_data = db.Column(db.LargeBinary)       # Image binary data (JPEG/PNG)
+    avatar_hash = db.Column(db.String(64))
+    avatar_size = db.Column(db.Integer)
+    has_avatar = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
     avatar_mimetype = db.Column(db.String(50))     # e.g. image/jpeg, image/png
 
+    # Legacy inline blobs, emptied by `flask migrate-blobs`; read only as a fallback.
+    # Deferred so loading a profile never pulls megabytes of file data.
+    resume_data = db.deferred(db.Column(db.LargeBinary))
+    avatar_data = db.deferred(db.Column(db.LargeBinary))
+
+    # Bumped on every write; ETag source for the public profile
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     # Relationship back
     user = db.relationship('User', back_populates='profile')
+    skill_tags = db.relationship('Skill', secondary=profile_skills)
 
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (
+        # Seek indexes for keyset pagination
+        db.Index('ix_projects_created_at_id', 'created_at', 'id'),
+        db.Index('ix_projects_title_id', 'title', 'id'),
+        db.Index('ix_projects_application_count_id', 'application_count', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     title = db.Column(db.String(255), nullable=False)
@@ -48,10 +84,57 @@ class Project(db.Model):
     skills = db.Column(db.Text)  # Comma-separated skills/tags for search
     category = db.Column(db.String(64))  # Project category (e.g., Web, Mobile, AI)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped on every write (counter updates included); ETag source for project lists
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Denormalized application counters (maintained by app.utils.counters)
+    application_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    pending_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    accepted_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rejected_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Truncated description, only populated when a query asks for it (view=compact)
+    description_preview = db.query_expression()
 
     # Relationships
     owner = db.relationship('User', back_populates='projects')
     applications = db.relationship('Application', back_populates='project', cascade='all, delete')
+    skill_tags = db.relationship('Skill', secondary=project_skills)
+
+# Full-text search index (tsvector + GIN on Postgres, FTS5 on SQLite)
+register_search_ddl(Project.__table__)
+
+class Skill(db.Model):
+    """Canonical skill tag (see app.utils.skills for the alias map)"""
+    __tablename__ = 'skills'
+    id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(64), unique=True, nullable=False, index=True)  # lowercase lookup key
+    name = db.Column(db.String(64), nullable=False)  # display form, e.g. "JavaScript"
+
+class FacetCount(db.Model):
+    """Precomputed project counts per category / skill for unfiltered facets"""
+    __tablename__ = 'facet_counts'
+    facet = db.Column(db.String(16), primary_key=True)   # 'category' or 'skill'
+    value = db.Column(db.String(255), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class Blob(db.Model):
+    """Content-addressed file bytes for the database blob store (see app.utils.blobs)"""
+    __tablename__ = 'blobs'
+    sha256 = db.Column(db.String(64), primary_key=True)  # hex digest of the original bytes
+    size = db.Column(db.Integer, nullable=False)          # original size
+    encoding = db.Column(db.String(16))                    # 'zstd' or None (stored as-is)
+    data = db.deferred(db.Column(db.LargeBinary, nullable=False))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)  # refreshed when stored again (GC grace)
+
+class AvatarVariant(db.Model):
+    """Resized copy of an avatar blob (see app.utils.avatars)"""
+    __tablename__ = 'avatar_variants'
+    source_hash = db.Column(db.String(64), primary_key=True)  # blob hash of the uploaded avatar
+    size = db.Column(db.Integer, primary_key=True)            # requested edge length in px
+    format = db.Column(db.String(8), primary_key=True)        # 'webp' or 'jpeg'
+    blob_hash = db.Column(db.String(64), nullable=False)
+    byte_size = db.Column(db.Integer, nullable=False)
 
 class Application(db.Model):
     __tablename__ = 'applications'
@@ -73,7 +156,7 @@ class PasswordResetToken(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     token = db.Column(db.String(128), unique=True, nullable=False, index=True)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # maintenance expiry sweep
     used = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -91,6 +174,56 @@ class HTFSubmission(db.Model):
     github_url = db.Column(db.String(512), nullable=False)
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship
     submitter = db.relationship('User', backref='htf_submissions')
+
+
+class EmailOutbox(db.Model):
+    """Outgoing email waiting for the outbox worker (see app.utils.outbox)"""
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        # The worker's "what's due" scan
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body_html = db.Column(db.Text, nullable=False)
+    body_text = db.Column(db.Text)
+    status = db.Column(db.String(16), nullable=False, default='pending')  # pending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+
+class Announcement(db.Model):
+    """A bulk email to all members and how far sending it has got (see app.utils.announcements)"""
+    __tablename__ = 'announcements'
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    body_html = db.Column(db.Text, nullable=False)   # $name / $email are substituted per recipient
+    body_text = db.Column(db.Text)
+    status = db.Column(db.String(16), nullable=False, default='pending')  # pending, running, done
+    last_user_id = db.Column(db.Integer, nullable=False, default=0)       # everyone up to here is handled
+    sent_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_count = db.Column(db.Integer, nullable=False, default=0)      # handed to the email outbox
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+
+class MaintenanceRun(db.Model):
+    """Schedule state and timing of one maintenance job (see app.utils.maintenance)"""
+    __tablename__ = 'maintenance_runs'
+    job = db.Column(db.String(64), primary_key=True)
+    last_started_at = db.Column(db.DateTime)
+    last_finished_at = db.Column(db.DateTime)
+    last_duration_ms = db.Column(db.Float)
+    last_result = db.Column(db.Integer)      # rows/items the job touched
+    last_error = db.Column(db.Text)
+    run_count = db.Column(db.Integer, nullable=False, default=0)
+    error_count = db.Column(db.Integer, nullable=False, default=0)
+    total_duration_ms = db.Column(db.Float, nullable=False, default=0)
@@ -2,8 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token
 from .. import db, limiter
 from app.models import User, Profile, PasswordResetToken
-from app.utils.auth import hash_password, verify_password, create_jwt
-from app.utils.email import send_password_reset_email, send_welcome_email
+from app.utils.auth import hash_password, verify_password, password_needs_rehash, create_jwt, invalidate_user
+from app.utils.email import password_reset_email, welcome_email
+from app.utils.outbox import deliver_email
+from app.utils.passwords import HasherBusy
 import secrets
 from datetime import datetime, timedelta
 import os
@@ -18,17 +20,6 @@ def _validate_password(password):
     return None
 
 
-def _cleanup_expired_tokens():
-    """Delete expired / used reset tokens (best-effort housekeeping)."""
-    try:
-        PasswordResetToken.query.filter(
-            (PasswordResetToken.expires_at < datetime.utcnow()) | (PasswordResetToken.used == True)
-        ).delete(synchronize_session=False)
-        db.session.commit()
-    except Exception:
-        db.session.rollback()
-
-
 # ── routes ───────────────────────────────────────────────────
 @auth_bp.route('/login', methods=['POST'])
 @limiter.limit("10/minute")
@@ -41,6 +32,14 @@ def login():
     if not user or not verify_password(password, user.password_hash):
         return jsonify({"error": "Invalid credentials"}), 401
 
+    # Upgrade hashes made with an older cost profile while we have the password
+    if password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = hash_password(password)
+            db.session.commit()
+        except HasherBusy:
+            pass  # the password checked out; upgrade on a later login
+
     access_token = create_jwt(user.id)
     return jsonify({"access_token": access_token, "user_id": user.id}), 200
 
@@ -69,13 +68,13 @@ def signup():
     # create empty profile
     profile = Profile(user_id=new_user.id)
     db.session.add(profile)
-    db.session.commit()
 
-    # Send welcome email (optional, doesn't block signup if it fails)
+    # Welcome email goes through the outbox (doesn't block signup if SMTP is slow or down)
     try:
-        send_welcome_email(email, email)
+        deliver_email(email, *welcome_email(email))
     except Exception as e:
         print(f"Failed to send welcome email: {e}")
+    db.session.commit()
 
     # Return token so user is auto-logged in
     access_token = create_jwt(new_user.id)
@@ -101,9 +100,6 @@ def request_password_reset():
     if not user:
         return jsonify({"message": "If that email exists, a reset link has been sent"}), 200
     
-    # Housekeeping: remove old tokens
-    _cleanup_expired_tokens()
-
     # Generate secure token and persist to DB
     token = secrets.token_urlsafe(32)
     reset_entry = PasswordResetToken(
@@ -112,15 +108,15 @@ def request_password_reset():
         expires_at=datetime.utcnow() + timedelta(minutes=15),
     )
     db.session.add(reset_entry)
-    db.session.commit()
     
     # Build reset link
     frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:5173')
     reset_link = f"{frontend_url}/#/reset-password?token={token}"
     
-    # Send email
+    # Queue email (committed together with the token)
     try:
-        email_sent = send_password_reset_email(email, reset_link, email)
+        email_sent = deliver_email(email, *password_reset_email(reset_link, email))
+        db.session.commit()
         if email_sent:
             return jsonify({"message": "Password reset email sent"}), 200
         else:
@@ -128,6 +124,7 @@ def request_password_reset():
             print(f"Failed to send reset email to {email}")
             return jsonify({"message": "If that email exists, a reset link has been sent"}), 200
     except Exception as e:
+        db.session.rollback()
         print(f"Error sending reset email: {e}")
         return jsonify({"error": "Failed to send reset email. Please try again later."}), 500
 
@@ -153,5 +150,6 @@ def reset_password():
     # Mark token as used so it can't be replayed
     reset_entry.used = True
     db.session.commit()
+    invalidate_user(user.id)
 
     return jsonify({"message": "Password reset successful"}), 200
@@ -1,8 +1,13 @@
 import os
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import jwt_required, verify_jwt_in_request
+from sqlalchemy import select, func
 from .. import db
 from app.models import HTFSubmission, User, Profile
+from app.serializers import htf_submission_serializer
+from app.utils.streaming import requested_stream_mode, stream_rows
+from app.utils.http_cache import make_etag, not_modified, cacheable
+from app.utils.auth import current_user, current_user_id
 
 htf_bp = Blueprint('htf', __name__)
 
@@ -16,54 +21,81 @@ def _htf_reveal_enabled():
     return os.getenv('HTF_REVEAL', 'false').lower() in ('true', '1', 'yes')
 
 
+def _submission_rows():
+    """SELECT of the columns htf_submission_serializer reads."""
+    return (
+        select(
+            HTFSubmission.id, HTFSubmission.user_id, HTFSubmission.project_name,
+            HTFSubmission.team_name, HTFSubmission.youtube_url, HTFSubmission.github_url,
+            HTFSubmission.description, HTFSubmission.created_at,
+            User.email.label('submitter_email'),
+            Profile.full_name.label('submitter_name'),
+        )
+        .outerjoin(User, User.id == HTFSubmission.user_id)
+        .outerjoin(Profile, Profile.user_id == HTFSubmission.user_id)
+    )
+
+
+def _submissions_version(reveal, viewer_id):
+    """
+    (count, latest submission edit, latest submitter profile edit) of the visible
+    submissions, in one query. Only the submitters' own profiles count, so an
+    unrelated profile edit doesn't change the ETag.
+    """
+    query = (
+        db.session.query(func.count(HTFSubmission.id), func.max(HTFSubmission.updated_at),
+                         func.max(Profile.updated_at))
+        .outerjoin(Profile, Profile.user_id == HTFSubmission.user_id)
+    )
+    if not reveal:
+        query = query.filter(HTFSubmission.user_id == viewer_id)
+    count, latest, latest_profile = query.one()
+    return count, latest and latest.isoformat(), latest_profile and latest_profile.isoformat()
+
+
 @htf_bp.route('/', methods=['GET'])
 def get_submissions():
     """
     Get HTF submissions.
     - If HTF_REVEAL is true: returns ALL submissions (public).
     - If HTF_REVEAL is false: returns only the logged-in user's own submissions.
+    Query params: stream=ndjson|json to stream the list instead of buffering it.
+    Sends an ETag; a matching If-None-Match gets a 304.
     """
     reveal = _htf_reveal_enabled()
 
     # Try to get the current user (optional auth)
-    current_user_id = None
+    viewer_id = None
     try:
         verify_jwt_in_request(optional=True)
-        identity = get_jwt_identity()
-        if identity:
-            current_user_id = int(identity)
+        viewer_id = current_user_id()
     except Exception:
         pass
 
-    if reveal:
-        submissions = HTFSubmission.query.order_by(HTFSubmission.created_at.desc()).all()
-    elif current_user_id:
-        submissions = HTFSubmission.query.filter_by(user_id=current_user_id).order_by(HTFSubmission.created_at.desc()).all()
-    else:
+    if not reveal and not viewer_id:
         # Not logged in and reveal is off — return empty
         return jsonify({'submissions': [], 'reveal': False}), 200
 
-    result = []
-    for sub in submissions:
-        # Get submitter info
-        user = User.query.get(sub.user_id)
-        profile = Profile.query.filter_by(user_id=sub.user_id).first()
-        
-        result.append({
-            'id': sub.id,
-            'project_name': sub.project_name,
-            'team_name': sub.team_name,
-            'youtube_url': sub.youtube_url,
-            'github_url': sub.github_url,
-            'description': sub.description,
-            'created_at': sub.created_at.isoformat() if sub.created_at else None,
-            'submitter': {
-                'id': user.id if user else None,
-                'name': profile.full_name if profile else (user.email.split('@')[0] if user else 'Unknown')
-            }
-        })
-    
-    return jsonify({'submissions': result, 'reveal': reveal}), 200
+    mode = requested_stream_mode()
+    etag = make_etag('htf', reveal, None if reveal else viewer_id, mode, _submissions_version(reveal, viewer_id))
+    unchanged = not_modified(etag, 'htf')
+    if unchanged:
+        return unchanged
+
+    # Plain rows with the submitter's name in one JOIN (no ORM objects)
+    query = _submission_rows().order_by(HTFSubmission.created_at.desc())
+    if not reveal:
+        query = query.where(HTFSubmission.user_id == viewer_id)
+
+    if mode:
+        response = stream_rows(
+            db.session, query, htf_submission_serializer, mode,
+            prefix='{"submissions":[', suffix='],"reveal":%s}' % ('true' if reveal else 'false'),
+        )
+        return cacheable(response, etag, 'htf')
+    result = htf_submission_serializer.many(db.session.execute(query))
+
+    return cacheable(jsonify({'submissions': result, 'reveal': reveal}), etag, 'htf'), 200
 
 
 @htf_bp.route('/', methods=['POST'])
@@ -74,8 +106,8 @@ def create_submission():
     Required: project_name, youtube_url
     Optional: description
     """
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
+    user_id = current_user_id()
+    user = current_user()
     
     if not user:
         return jsonify({"msg": "User not found"}), 404
@@ -119,22 +151,8 @@ def create_submission():
     db.session.add(submission)
     db.session.commit()
     
-    # Get profile for response
-    profile = Profile.query.filter_by(user_id=user_id).first()
-    
-    return jsonify({
-        'id': submission.id,
-        'project_name': submission.project_name,
-        'team_name': submission.team_name,
-        'youtube_url': submission.youtube_url,
-        'github_url': submission.github_url,
-        'description': submission.description,
-        'created_at': submission.created_at.isoformat(),
-        'submitter': {
-            'id': user.id,
-            'name': profile.full_name if profile else user.email.split('@')[0]
-        }
-    }), 201
+    row = db.session.execute(_submission_rows().where(HTFSubmission.id == submission.id)).one()
+    return jsonify(htf_submission_serializer(row)), 201
 
 
 @htf_bp.route('/<int:submission_id>', methods=['DELETE'])
@@ -143,7 +161,7 @@ def delete_submission(submission_id):
     """
     Delete an HTF submission (only owner can delete).
     """
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     
     submission = HTFSubmission.query.get(submission_id)
     
@@ -1,68 +1,125 @@
-from flask import Blueprint, request, jsonify, send_file
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, send_file, current_app, url_for
+from flask_jwt_extended import jwt_required
 from .. import db
-from app.models import User, Profile
+from app.models import Profile, Skill, AvatarVariant
+from app.utils.skills import sync_skill_tags
+from app.utils.cache import invalidate_tags, user_tag
+from app.utils.auth import current_user, load_user_summary, invalidate_user
+from app.serializers import serialize_profile, serialize_public_profile, avatar_version, AVATAR_VERSION_CHARS
+from app.utils.http_cache import make_etag, not_modified, cacheable
+from app.utils.blobs import get_blob_store, sha256_hex
+from app.utils.avatars import get_avatar_worker, pick_variant, VARIANT_MIMETYPES
+from app.utils.uploads import (
+    limit_request_body, spool_upload, UploadRejected, RESUME_MAX_BYTES, AVATAR_MAX_BYTES
+)
+from werkzeug.http import is_resource_modified
 import io
+import os
 
 profile_bp = Blueprint('profile', __name__)
 
-def serialize_profile(user: User, profile: Profile):
-    return {
-        "user_id": user.id,
-        "email": user.email,
-        "full_name": (profile.full_name if profile else None),
-        "program": (profile.program if profile else None),
-        "year": (profile.year if profile else None),
-        "bio": (profile.bio if profile else None),
-        "skills": (profile.skills if profile else None),
-        "linkedin": (profile.linkedin if profile else None),
-        "discord": (profile.discord if profile else None),
-        "instagram": (profile.instagram if profile else None),
-        "resume_filename": (profile.resume_filename if profile else None),
-        "has_avatar": bool(profile and profile.avatar_data),
-    }
+
+# Avatar URLs carry the content hash (?v=...), so a matching URL never changes
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+# Most ids one /avatars request may ask for (a page of search results is 20)
+MAX_AVATAR_BATCH = 100
+
+
+def _profile_of(user_id):
+    return Profile.query.filter_by(user_id=user_id).first()
+
+
+def _send_profile_file(profile, kind, mimetype, download_name=None, cache_control=REVALIDATE):
+    """Send a profile's 'resume' or 'avatar' (see _send_blob)."""
+    digest = getattr(profile, f"{kind}_hash")
+    data = None
+    if not digest:
+        # Not migrated to the blob store yet: only now load the legacy column
+        data = getattr(profile, f"{kind}_data")
+        digest = sha256_hex(data)
+    return _send_blob(digest, mimetype, profile.updated_at, download_name, cache_control, data=data)
+
+
+def _send_blob(digest, mimetype, last_modified, download_name=None, cache_control=REVALIDATE, data=None):
+    """
+    Send a stored blob. The ETag is the content hash; conditional requests get
+    a 304 before any bytes are read, and Range requests a 206.
+
+    With the filesystem blob store, the file is handed to the front server
+    when configured: BLOB_ACCEL_REDIRECT (nginx internal location mapped to
+    BLOB_STORE_PATH) or Flask's USE_X_SENDFILE.
+    """
+    if not is_resource_modified(request.environ, etag=digest, last_modified=last_modified):
+        response = current_app.response_class(status=304)
+        response.set_etag(digest)
+        response.headers['Cache-Control'] = cache_control
+        return response
+
+    store = get_blob_store()
+    if data is None and store.backend == 'filesystem':
+        path, encoding = store.locate(digest)
+        if path and encoding is None:
+            accel = current_app.config.get('BLOB_ACCEL_REDIRECT')
+            if accel:
+                # nginx serves the bytes (and Range requests) itself
+                response = current_app.response_class(mimetype=mimetype)
+                response.headers['X-Accel-Redirect'] = f"{accel.rstrip('/')}/{os.path.relpath(path, store.root)}"
+                if download_name:
+                    response.headers.set('Content-Disposition', 'inline', filename=download_name)
+                response.set_etag(digest)
+                response.last_modified = last_modified
+            else:
+                response = send_file(path, mimetype=mimetype, download_name=download_name,
+                                     etag=digest, last_modified=last_modified, conditional=True)
+            response.headers['Cache-Control'] = cache_control
+            return response
+
+    if data is None:
+        data = store.get(db.session, digest)
+        if data is None:
+            return jsonify({"error": "File not found"}), 404
+    response = send_file(io.BytesIO(data), mimetype=mimetype, download_name=download_name,
+                         etag=digest, last_modified=last_modified, conditional=True)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
 
 @profile_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_profile():
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    profile = user.profile
+    profile = _profile_of(user.id)
     return jsonify(serialize_profile(user, profile)), 200
 
 
 @profile_bp.route('/<int:user_id>', methods=['GET'])
 def get_public_profile(user_id):
-    """Get a public view of another user's profile (no auth required)."""
-    user = User.query.get(user_id)
+    """
+    Get a public view of another user's profile (no auth required).
+    Sends an ETag; a matching If-None-Match gets a 304.
+    """
+    user = load_user_summary(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    profile = user.profile
-    # Return a subset — omit resume and email for privacy
-    return jsonify({
-        "user_id": user.id,
-        "full_name": (profile.full_name if profile else None),
-        "program": (profile.program if profile else None),
-        "year": (profile.year if profile else None),
-        "bio": (profile.bio if profile else None),
-        "skills": (profile.skills if profile else None),
-        "linkedin": (profile.linkedin if profile else None),
-        "discord": (profile.discord if profile else None),
-        "instagram": (profile.instagram if profile else None),
-        "has_resume": bool(profile and profile.resume_filename),
-        "resume_filename": (profile.resume_filename if profile else None),
-        "has_avatar": bool(profile and profile.avatar_data),
-    }), 200
+    updated_at = db.session.query(Profile.updated_at).filter_by(user_id=user_id).scalar()
+    etag = make_etag('profile', user_id, updated_at)
+    unchanged = not_modified(etag, 'profile')
+    if unchanged:
+        return unchanged
+
+    profile = _profile_of(user_id)
+    # Return a subset — omit email for privacy
+    return cacheable(jsonify(serialize_public_profile(user, profile)), etag, 'profile'), 200
 
 @profile_bp.route('/', methods=['PUT'])
 @jwt_required()
 def update_profile():
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -80,7 +137,7 @@ def update_profile():
     discord = data.get('discord')
     instagram = data.get('instagram')
 
-    profile = user.profile
+    profile = _profile_of(user.id)
     if not profile:
         profile = Profile(user_id=user.id)
         db.session.add(profile)
@@ -95,6 +152,7 @@ def update_profile():
         profile.bio = bio
     if skills is not None:
         profile.skills = skills
+        sync_skill_tags(db.session, Skill, profile, skills)
     if linkedin is not None:
         profile.linkedin = linkedin
     if discord is not None:
@@ -103,6 +161,9 @@ def update_profile():
         profile.instagram = instagram
 
     db.session.commit()
+    # Search results embed the owner's name
+    invalidate_tags(user_tag(user.id))
+    invalidate_user(user.id)
 
     return jsonify(serialize_profile(user, profile)), 200
 
@@ -110,9 +171,9 @@ def update_profile():
 @profile_bp.route('/resume', methods=['POST'])
 @jwt_required()
 def upload_resume():
-    """Upload a resume PDF file"""
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    """Upload a resume PDF file (max 5MB, streamed; rejected as soon as it's too big)"""
+    limit_request_body(RESUME_MAX_BYTES)
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -127,20 +188,26 @@ def upload_resume():
     if not file.filename.lower().endswith('.pdf'):
         return jsonify({"error": "Only PDF files are allowed"}), 400
 
-    # Read file data
-    file_data = file.read()
-    
-    # Check file size (max 5MB)
-    if len(file_data) > 5 * 1024 * 1024:
-        return jsonify({"error": "File size must be less than 5MB"}), 400
+    try:
+        upload = spool_upload(
+            file, RESUME_MAX_BYTES, {'application/pdf'},
+            too_large_message="File size must be less than 5MB",
+            bad_type_message="Only PDF files are allowed",
+        )
+    except UploadRejected as e:
+        return jsonify({"error": e.message}), e.status_code
 
-    profile = user.profile
+    profile = _profile_of(user.id)
     if not profile:
         profile = Profile(user_id=user.id)
         db.session.add(profile)
 
+    with upload:
+        profile.resume_hash = get_blob_store().put_file(db.session, upload.file, upload.sha256, 'application/pdf')
     profile.resume_filename = file.filename
-    profile.resume_data = file_data
+    profile.resume_size = upload.size
+    profile.has_resume = True
+    profile.resume_data = None
     db.session.commit()
 
     return jsonify({
@@ -152,57 +219,52 @@ def upload_resume():
 @profile_bp.route('/resume', methods=['GET'])
 @jwt_required()
 def download_resume():
-    """Download the user's resume"""
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    """Download the user's resume (supports Range and conditional requests)"""
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    profile = user.profile
-    if not profile or not profile.resume_data:
+    profile = _profile_of(user.id)
+    if not profile or not profile.has_resume:
         return jsonify({"error": "No resume uploaded"}), 404
 
-    return send_file(
-        io.BytesIO(profile.resume_data),
-        mimetype='application/pdf',
-        as_attachment=False,
-        download_name=profile.resume_filename
+    return _send_profile_file(
+        profile, 'resume', 'application/pdf',
+        download_name=profile.resume_filename, cache_control='private, no-cache'
     )
 
 
 @profile_bp.route('/resume/<int:user_id>', methods=['GET'])
 def get_public_resume(user_id):
-    """Download a user's resume (public, no auth)"""
-    user = User.query.get(user_id)
+    """Download a user's resume (public, no auth; supports Range and conditional requests)"""
+    user = load_user_summary(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    profile = user.profile
-    if not profile or not profile.resume_data:
+    profile = _profile_of(user.id)
+    if not profile or not profile.has_resume:
         return jsonify({"error": "No resume uploaded"}), 404
 
-    return send_file(
-        io.BytesIO(profile.resume_data),
-        mimetype='application/pdf',
-        as_attachment=False,
-        download_name=profile.resume_filename
-    )
+    return _send_profile_file(profile, 'resume', 'application/pdf', download_name=profile.resume_filename)
 
 
 @profile_bp.route('/resume', methods=['DELETE'])
 @jwt_required()
 def delete_resume():
     """Delete the user's resume"""
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    profile = user.profile
-    if not profile or not profile.resume_data:
+    profile = _profile_of(user.id)
+    if not profile or not profile.has_resume:
         return jsonify({"error": "No resume to delete"}), 404
 
+    # The blob itself stays until `flask gc-blobs` (another profile may share it)
     profile.resume_filename = None
+    profile.resume_hash = None
+    profile.resume_size = None
+    profile.has_resume = False
     profile.resume_data = None
     db.session.commit()
 
@@ -212,9 +274,9 @@ def delete_resume():
 @profile_bp.route('/avatar', methods=['POST'])
 @jwt_required()
 def upload_avatar():
-    """Upload or replace a profile picture"""
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    """Upload or replace a profile picture (max 2MB, streamed; type checked from the file's bytes)"""
+    limit_request_body(AVATAR_MAX_BYTES)
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
@@ -225,64 +287,139 @@ def upload_avatar():
     if file.filename == '':
         return jsonify({"error": "No file selected"}), 400
 
-    # Check file type
-    allowed_mimetypes = {'image/jpeg', 'image/png', 'image/webp'}
-    mimetype = file.content_type or ''
-    if mimetype not in allowed_mimetypes:
-        return jsonify({"error": "Only JPEG, PNG, and WebP images are allowed"}), 400
-
-    # Read file data
-    file_data = file.read()
-
-    # Check file size (max 2MB)
-    if len(file_data) > 2 * 1024 * 1024:
-        return jsonify({"error": "Image size must be less than 2MB"}), 400
-
-    profile = user.profile
+    # The declared Content-Type is ignored; the type comes from the magic bytes
+    try:
+        upload = spool_upload(
+            file, AVATAR_MAX_BYTES, {'image/jpeg', 'image/png', 'image/webp'},
+            too_large_message="Image size must be less than 2MB",
+            bad_type_message="Only JPEG, PNG, and WebP images are allowed",
+        )
+    except UploadRejected as e:
+        return jsonify({"error": e.message}), e.status_code
+
+    profile = _profile_of(user.id)
     if not profile:
         profile = Profile(user_id=user.id)
         db.session.add(profile)
 
-    profile.avatar_data = file_data
-    profile.avatar_mimetype = mimetype
+    with upload:
+        profile.avatar_hash = get_blob_store().put_file(db.session, upload.file, upload.sha256, upload.mimetype)
+    profile.avatar_size = upload.size
+    profile.has_avatar = True
+    profile.avatar_mimetype = upload.mimetype
+    profile.avatar_data = None
     db.session.commit()
+    # Thumbnails are rendered off the request; get_avatar serves the original until then
+    get_avatar_worker().submit(profile.avatar_hash)
 
-    return jsonify({"message": "Avatar uploaded successfully"}), 200
+    return jsonify({
+        "message": "Avatar uploaded successfully",
+        "avatar_version": avatar_version(profile),
+    }), 200
 
 
 @profile_bp.route('/avatar/<int:user_id>', methods=['GET'])
 def get_avatar(user_id):
-    """Get a user's avatar image (public, no auth)"""
-    user = User.query.get(user_id)
+    """
+    Get a user's avatar image (public, no auth).
+    With ?v=<avatar_version> (from the profile JSON) the response is cacheable
+    forever; without it, clients revalidate with the ETag.
+    With ?size=<px> the nearest pre-generated square thumbnail is served
+    (WebP if the client accepts it, else JPEG); until it exists the original
+    is served with a revalidating Cache-Control.
+    """
+    user = load_user_summary(user_id)
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    profile = user.profile
-    if not profile or not profile.avatar_data:
+    profile = _profile_of(user.id)
+    if not profile or not profile.has_avatar:
         return jsonify({"error": "No avatar"}), 404
 
-    return send_file(
-        io.BytesIO(profile.avatar_data),
-        mimetype=profile.avatar_mimetype or 'image/jpeg',
-        as_attachment=False,
-    )
+    version = avatar_version(profile)
+    immutable = version is not None and request.args.get('v') == version
+    cache_control = IMMUTABLE if immutable else REVALIDATE
+
+    size = request.args.get('size', type=int)
+    if size:
+        if profile.avatar_hash:
+            variants = db.session.query(
+                AvatarVariant.size, AvatarVariant.format, AvatarVariant.blob_hash
+            ).filter_by(source_hash=profile.avatar_hash).all()
+            accepts_webp = 'image/webp' in request.accept_mimetypes
+            variant = pick_variant(variants, size, accepts_webp)
+            if variant:
+                response = _send_blob(variant[2], VARIANT_MIMETYPES[variant[1]], profile.updated_at,
+                                      cache_control=cache_control)
+                response.vary.add('Accept')
+                return response
+        # No thumbnail yet (they're rendered after the upload): the original must
+        # not stick to the sized URL, or the browser never picks up the thumbnail
+        cache_control = REVALIDATE
+
+    return _send_profile_file(profile, 'avatar', profile.avatar_mimetype or 'image/jpeg', cache_control=cache_control)
+
+
+@profile_bp.route('/avatars', methods=['GET'])
+def get_avatar_urls():
+    """
+    Avatar URLs for many users at once (public, no auth), for listing pages.
+    ?ids=1,2,3 (up to MAX_AVATAR_BATCH) and optional ?size=<px>.
+    Returns {"avatars": {"<user_id>": "/api/profile/avatar/<id>?v=...", ...}}
+    with null for users without an avatar. Each URL carries the content hash,
+    so the browser fetches (and caches) each distinct image once.
+    """
+    try:
+        user_ids = sorted({int(part) for part in request.args.get('ids', '').split(',') if part.strip()})
+    except ValueError:
+        return jsonify({"error": "ids must be a comma-separated list of user ids"}), 400
+    if not user_ids:
+        return jsonify({"error": "ids is required"}), 400
+    if len(user_ids) > MAX_AVATAR_BATCH:
+        return jsonify({"error": f"At most {MAX_AVATAR_BATCH} ids per request"}), 400
+    size = request.args.get('size', type=int)
+
+    # One IN (...) query over the columns the URLs need
+    rows = db.session.query(Profile.user_id, Profile.avatar_hash).filter(
+        Profile.user_id.in_(user_ids), Profile.has_avatar.is_(True)
+    ).all()
+    versions = {user_id: (avatar_hash or '')[:AVATAR_VERSION_CHARS] or None for user_id, avatar_hash in rows}
+
+    # The ids too: users without an avatar don't show up in versions, but they are in the body
+    etag = make_etag(user_ids, sorted(versions.items()), size)
+    cached = not_modified(etag, 'avatars')
+    if cached:
+        return cached
+
+    avatars = {}
+    for user_id in user_ids:
+        if user_id not in versions:
+            avatars[str(user_id)] = None
+            continue
+        params = {'v': versions[user_id]} if versions[user_id] else {}
+        if size:
+            params['size'] = size
+        avatars[str(user_id)] = url_for('profile.get_avatar', user_id=user_id, **params)
+    return cacheable(jsonify({"avatars": avatars}), etag, 'avatars')
 
 
 @profile_bp.route('/avatar', methods=['DELETE'])
 @jwt_required()
 def delete_avatar():
     """Delete the user's avatar"""
-    identity = get_jwt_identity()
-    user = User.query.get(identity)
+    user = current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
 
-    profile = user.profile
-    if not profile or not profile.avatar_data:
+    profile = _profile_of(user.id)
+    if not profile or not profile.has_avatar:
         return jsonify({"error": "No avatar to delete"}), 404
 
-    profile.avatar_data = None
+    profile.avatar_hash = None
+    profile.avatar_size = None
+    profile.has_avatar = False
     profile.avatar_mimetype = None
+    profile.avatar_data = None
     db.session.commit()
 
     return jsonify({"message": "Avatar deleted successfully"}), 200
@@ -1,12 +1,151 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import func, or_
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload, load_only, with_expression
 from .. import db
-from app.models import Project, User, Profile, Application
+from app.models import Project, User, Profile, Application, Skill, FacetCount, project_skills
+from app.utils.search import apply_keyword_search
+from app.utils.skills import sync_skill_tags, skill_slugs, matching_ids_query
+from app.utils.cache import get_cache, invalidate_tags, PROJECTS_TAG, user_tag
+from app.utils.auth import current_user, current_user_id, load_user_summary
+from app.utils.counters import bump_application_counts
+from app.utils.facets import project_facets, apply_facet_delta, precomputed_facets, filtered_facets
+from app.utils.suggest import get_suggest_index, project_terms
+from app.utils.recommend import get_recommender
+from app.utils.streaming import requested_stream_mode, stream_rows
+from app.utils.http_cache import make_etag, collection_version, not_modified, cacheable
+from app.serializers import (
+    COMPACT_DESCRIPTION_CHARS, project_serializer, project_list_serializer, project_compact_serializer,
+    project_recommendation_serializer, application_serializer, application_with_applicant_serializer,
+    my_application_serializer
+)
+from app.utils.pagination import (
+    encode_cursor, decode_cursor, apply_keyset, order_keyset, estimate_table_rows, cached_count
+)
+from collections import Counter
+from urllib.parse import urlencode
 import math
 
 project_bp = Blueprint('project', __name__)
 
+# Owner + owner name for list serializers: two IN queries per page instead of
+# two lookups per row. load_only keeps the profile's blob columns out of it.
+_with_owner_name = selectinload(Project.owner).selectinload(User.profile).load_only(Profile.full_name)
+
+
+# Columns behind each selectable list field (?fields=...); 'id' is always included
+_FIELD_COLUMNS = {
+    'title': Project.title,
+    'description': Project.description,
+    'skills': Project.skills,
+    'category': Project.category,
+    'created_at': Project.created_at,
+    'application_count': Project.application_count,
+    'owner': Project.owner_id,
+}
+
+# Full field list per endpoint (the default response shape)
+SEARCH_FIELDS = ('id', 'title', 'description', 'skills', 'category', 'created_at', 'owner', 'application_count')
+MY_PROJECT_FIELDS = ('id', 'title', 'description', 'skills', 'category', 'created_at', 'application_count')
+USER_PROJECT_FIELDS = ('id', 'title', 'description', 'skills', 'category', 'created_at', 'role')
+
+# view=compact: just what a project card renders, with a truncated description
+COMPACT_FIELDS = {'id', 'title', 'description', 'skills', 'category', 'role'}
+
+
+def _requested_fields(default_fields):
+    """
+    Resolve ?fields= / ?view=compact against an endpoint's full field list.
+
+    Returns:
+        (fields, compact) - the set of fields to return, and whether the
+        description should be truncated.
+    """
+    compact = request.args.get('view') == 'compact'
+    raw = request.args.get('fields', '').strip()
+    if raw:
+        fields = {f.strip() for f in raw.split(',')} & set(default_fields)
+    elif compact:
+        fields = COMPACT_FIELDS & set(default_fields)
+    else:
+        fields = set(default_fields)
+    return fields | {'id'}, compact
+
+
+def _load_fields(query, fields, compact, *always):
+    """Restrict the SELECT to the columns ``fields`` need (plus ``always``)."""
+    columns = {Project.owner_id, *always}
+    for field in fields:
+        if field in _FIELD_COLUMNS and not (compact and field == 'description'):
+            columns.add(_FIELD_COLUMNS[field])
+    options = [load_only(*columns)]
+    if compact and 'description' in fields:
+        # Let the database truncate so the full text never leaves it
+        options.append(with_expression(
+            Project.description_preview,
+            func.substr(Project.description, 1, COMPACT_DESCRIPTION_CHARS + 1)
+        ))
+    if 'owner' in fields:
+        options.append(_with_owner_name)
+    return query.options(*options)
+
+
+def _fields_serializer(fields, compact):
+    """Project list serializer restricted to the requested fields."""
+    serializer = project_compact_serializer if compact else project_list_serializer
+    return serializer.only(fields)
+
+# Sort modes available in cursor mode: (key columns, descending, row -> cursor values).
+# Each key ends in Project.id so the order is total and ties can't skip rows.
+KEYSET_SORTS = {
+    'newest': ((Project.created_at, Project.id), True, lambda p: (p.created_at, p.id)),
+    'az': ((Project.title, Project.id), False, lambda p: (p.title, p.id)),
+    'most_applications': ((Project.application_count, Project.id), True, lambda p: (p.application_count, p.id)),
+}
+
+def _cache_key(prefix, keyword, skills_filter, skills_match, category_filter, **extra):
+    """Normalize filter params so equivalent requests share one cache entry."""
+    params = {
+        'q': ' '.join(keyword.lower().split()),
+        'skills': ','.join(sorted(skill_slugs(skills_filter))),
+        'skills_match': skills_match,
+        'category': category_filter,
+        **extra,
+    }
+    return prefix + ':' + urlencode(sorted(params.items()))
+
+
+def _filtered_projects(keyword, skills_filter, skills_match, category_filter):
+    """
+    Project query with the search filters applied.
+
+    Returns:
+        (query, rank) where rank is the full-text relevance expression, or None.
+    """
+    query = Project.query
+    
+    # Apply keyword search (full-text index where the database supports it)
+    rank = None
+    if keyword:
+        dialect = db.session.get_bind().dialect.name
+        query, rank = apply_keyword_search(query, Project, keyword, dialect)
+    
+    # Apply skills filter
+    if skills_filter:
+        # Exact tag match on the normalized skills table (any-of or all-of)
+        slugs = skill_slugs(skills_filter)
+        if slugs:
+            matching_ids = matching_ids_query(
+                project_skills, 'project_id', Skill, slugs, match_all=(skills_match == 'all')
+            )
+            query = query.filter(Project.id.in_(matching_ids))
+    
+    # Apply category filter
+    if category_filter:
+        query = query.filter(Project.category == category_filter)
+
+    return query, rank
+
 @project_bp.route('/', methods=['GET'])
 def list_projects():
     # placeholder listing
@@ -20,8 +159,8 @@ def create_project():
     Required: title, description, category
     Optional: skills (comma-separated)
     """
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
+    user_id = current_user_id()
+    user = current_user()
     
     if not user:
         return jsonify({"msg": "User not found"}), 404
@@ -49,136 +188,260 @@ def create_project():
         category=category,
         skills=skills or None
     )
+    sync_skill_tags(db.session, Skill, project, skills)
     
     db.session.add(project)
+    apply_facet_delta(db.session, FacetCount, Counter(), project_facets(project))
     db.session.commit()
+    invalidate_tags(PROJECTS_TAG)
+    get_suggest_index().apply_delta(Counter(), project_terms(project))
+    get_recommender().mark_changed(project.id, user_id, [s.id for s in project.skill_tags])
     
-    return jsonify({
-        'id': project.id,
-        'title': project.title,
-        'description': project.description,
-        'skills': project.skills,
-        'category': project.category,
-        'owner_id': project.owner_id,
-        'created_at': project.created_at.isoformat()
-    }), 201
+    return jsonify(project_serializer(project)), 201
 
 @project_bp.route('/search', methods=['GET'])
 def search_projects():
     """
     Search and filter projects with pagination.
     Query params:
-    - q: keyword search (title, description)
-    - skills: comma-separated skills to match
+    - q: keyword search (title, description), full-text with prefix matching
+    - skills: comma-separated skills to match (aliases like "JS" are normalized)
+    - skills_match: any (default) or all
     - category: project category
-    - sort: newest (default), az, most_applications
+    - sort: newest (default), az, most_applications, relevance (needs q)
     - page: page number (default 1)
     - limit: results per page (default 10)
+    - cursor: opt-in keyset pagination; pass an empty value for the first page,
+      then the returned next_cursor. Not available for sort=relevance.
+    - total (cursor mode only): omit for no total, 'exact', or 'approx'
+    - fields: comma-separated subset of the project fields to return
+    - view: 'compact' for card-sized results (truncated description, no owner)
+    Sends an ETag (a hash of the response body, kept with the cached entry);
+    a matching If-None-Match gets a 304.
     """
     # Get query parameters
     keyword = request.args.get('q', '').strip()
     skills_filter = request.args.get('skills', '').strip()
+    skills_match = request.args.get('skills_match', 'any')
     category_filter = request.args.get('category', '').strip()
     sort_by = request.args.get('sort', 'newest')
     page = int(request.args.get('page', 1))
     limit = int(request.args.get('limit', 10))
-    
-    # Start building query
-    query = Project.query
-    
-    # Apply keyword search (case-insensitive)
-    if keyword:
-        search_pattern = f"%{keyword}%"
-        query = query.filter(
-            or_(
-                Project.title.ilike(search_pattern),
-                Project.description.ilike(search_pattern)
-            )
-        )
-    
-    # Apply skills filter
-    if skills_filter:
-        # Match any of the provided skills (comma-separated)
-        skills_list = [s.strip() for s in skills_filter.split(',')]
-        skill_conditions = [Project.skills.ilike(f"%{skill}%") for skill in skills_list]
-        query = query.filter(or_(*skill_conditions))
-    
-    # Apply category filter
-    if category_filter:
-        query = query.filter(Project.category == category_filter)
-    
-    # Apply sorting
-    if sort_by == 'az':
-        query = query.order_by(Project.title.asc())
-    elif sort_by == 'most_applications':
-        # Count applications per project and sort
-        query = query.outerjoin(Application).group_by(Project.id).order_by(
-            func.count(Application.id).desc()
-        )
-    else:  # newest (default)
-        query = query.order_by(Project.created_at.desc())
-    
-    # Get total count before pagination
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * limit
-    projects = query.limit(limit).offset(offset).all()
-    
-    # Serialize projects
+
+    # Anonymous and hot: serve repeated searches from the response cache
+    cache = get_cache()
+    fields, compact = _requested_fields(SEARCH_FIELDS)
+    page_params = {'sort': sort_by, 'page': page, 'limit': limit,
+                   'fields': ','.join(sorted(fields)), 'compact': int(compact)}
+    if 'cursor' in request.args:
+        page_params.update(cursor=request.args.get('cursor', ''), total=request.args.get('total', ''))
+    cache_key = _cache_key('search', keyword, skills_filter, skills_match, category_filter, **page_params)
+
+    # Cache first: a hit (or a 304 for it) runs no queries at all. The cached
+    # entry is dropped by the same invalidate_tags calls that make it stale.
+    cached = cache.get(cache_key)
+    if cached is not None:
+        unchanged = not_modified(cached['etag'], 'search')
+        if unchanged:
+            return unchanged
+        response = cacheable(jsonify(cached['payload']), cached['etag'], 'search')
+        response.headers['X-Cache'] = 'HIT'
+        return response, 200
+    
+    query, rank = _filtered_projects(keyword, skills_filter, skills_match, category_filter)
+    
+    if 'cursor' in request.args:
+        # Keyset mode: seek past the last row of the previous page
+        if sort_by not in KEYSET_SORTS:
+            return jsonify({"msg": f"Cursor pagination is not supported for sort={sort_by}"}), 400
+
+        columns, descending, row_key = KEYSET_SORTS[sort_by]
+        token = request.args.get('cursor', '')
+        values = None
+        if token:
+            try:
+                values = decode_cursor(token, sort_by, len(columns))
+            except ValueError as e:
+                return jsonify({"msg": str(e)}), 400
+
+        # Optional total: exact COUNT(*), or approx (planner estimate / cached
+        # count). Counted before the seek, so every page reports the whole search.
+        total_mode = request.args.get('total')
+        total = None
+        if total_mode == 'exact':
+            total = query.count()
+        elif total_mode == 'approx':
+            if not (keyword or skills_filter or category_filter):
+                total = estimate_table_rows(db.session, Project.__tablename__)
+            if total is None:
+                count_key = _cache_key('count', keyword, skills_filter, skills_match, category_filter)
+                total = cached_count(count_key, query)
+
+        if values is not None:
+            query = apply_keyset(query, columns, descending, values)
+
+        query = _load_fields(order_keyset(query, columns, descending), fields, compact, *columns)
+        rows = query.limit(limit + 1).all()
+        projects = rows[:limit]
+        has_more = len(rows) > limit
+        page_meta = {
+            'next_cursor': encode_cursor(sort_by, row_key(projects[-1])) if has_more and projects else None,
+            'total': total,
+            'limit': limit
+        }
+    else:
+        # Apply sorting
+        if sort_by == 'relevance' and rank is not None:
+            query = query.order_by(rank.desc(), Project.created_at.desc())
+        elif sort_by == 'az':
+            query = query.order_by(Project.title.asc())
+        elif sort_by == 'most_applications':
+            # Denormalized counter, served by ix_projects_application_count_id
+            query = query.order_by(Project.application_count.desc(), Project.id.desc())
+        else:  # newest (default)
+            query = query.order_by(Project.created_at.desc())
+
+        # Get total count before pagination
+        total = query.count()
+
+        # Apply pagination
+        offset = (page - 1) * limit
+        projects = _load_fields(query, fields, compact).limit(limit).offset(offset).all()
+
+        # Calculate total pages
+        total_pages = math.ceil(total / limit) if limit > 0 else 0
+        page_meta = {
+            'total': total,
+            'page': page,
+            'pages': total_pages,
+            'limit': limit
+        }
+    
+    # Serialize projects (owner info was eager-loaded with the page)
+    projects_data = _fields_serializer(fields, compact).many(projects)
+    
+    payload = {'projects': projects_data, **page_meta}
+    etag = make_etag(cache_key, payload)
+    owner_tags = {user_tag(project.owner_id) for project in projects}
+    cache.set(cache_key, {'etag': etag, 'payload': payload}, tags=[PROJECTS_TAG, *owner_tags])
+
+    unchanged = not_modified(etag, 'search')
+    if unchanged:
+        return unchanged
+    response = cacheable(jsonify(payload), etag, 'search')
+    response.headers['X-Cache'] = 'MISS'
+    return response, 200
+
+@project_bp.route('/facets', methods=['GET'])
+def get_facets():
+    """
+    Project counts per category and per skill (top N) for a search.
+    Query params: q, skills, skills_match, category (same as /search), and
+    top: number of skills to return (default 20, max 100).
+    Without filters the counts come from the precomputed facet_counts table.
+    """
+    keyword = request.args.get('q', '').strip()
+    skills_filter = request.args.get('skills', '').strip()
+    skills_match = request.args.get('skills_match', 'any')
+    category_filter = request.args.get('category', '').strip()
+    top = min(max(int(request.args.get('top', 20)), 1), 100)
+
+    cache = get_cache()
+    cache_key = _cache_key('facets', keyword, skills_filter, skills_match, category_filter, top=top)
+    facets = cache.get(cache_key)
+    if facets is None:
+        if keyword or skills_filter or category_filter:
+            query, _ = _filtered_projects(keyword, skills_filter, skills_match, category_filter)
+            facets = filtered_facets(db.session, Project, Skill, project_skills, query, top)
+        else:
+            facets = precomputed_facets(db.session, FacetCount, top)
+        cache.set(cache_key, facets, tags=[PROJECTS_TAG])
+
+    return jsonify(facets), 200
+
+@project_bp.route('/suggest', methods=['GET'])
+def suggest():
+    """
+    Autocomplete for the search box, answered from memory.
+    Query params:
+    - prefix: what the user has typed so far
+    - limit: max suggestions (default 10, max 25)
+    Returns skills, categories and project titles; typo-tolerant matches are
+    used when exact prefix matches run short.
+    """
+    prefix = request.args.get('prefix', '')
+    limit = min(max(int(request.args.get('limit', 10)), 1), 25)
+
+    index = get_suggest_index()
+    if index.is_stale():
+        index.rebuild(db.session, Project, Skill, project_skills)
+
+    suggestions, fuzzy = index.suggest(prefix, limit)
+    return jsonify({'suggestions': suggestions, 'fuzzy': fuzzy}), 200
+
+@project_bp.route('/recommended', methods=['GET'])
+@jwt_required()
+def get_recommended_projects():
+    """
+    Projects ranked by how well their skills match the caller's profile skills.
+    Excludes the caller's own projects and ones they already applied to.
+    Query params: limit (default 10, max 50)
+    """
+    user_id = current_user_id()
+    limit = min(max(int(request.args.get('limit', 10)), 1), 50)
+
+    profile = (
+        Profile.query.filter_by(user_id=user_id)
+        .options(load_only(Profile.id), selectinload(Profile.skill_tags))
+        .first()
+    )
+    user_skills = {s.id: s.name for s in profile.skill_tags} if profile else {}
+    if not user_skills:
+        return jsonify({'projects': []}), 200
+
+    applied = {pid for (pid,) in db.session.query(Application.project_id).filter_by(user_id=user_id)}
+
+    recommender = get_recommender()
+    if recommender.is_stale():
+        recommender.rebuild(db.session, Project, project_skills)
+    ranked = recommender.recommend(user_skills.keys(), user_id, applied, limit)
+
+    projects = {
+        p.id: p for p in Project.query.filter(Project.id.in_([pid for pid, _ in ranked]))
+        .options(_with_owner_name, selectinload(Project.skill_tags))
+    }
     projects_data = []
-    for project in projects:
-        # Get owner info
-        owner = User.query.get(project.owner_id)
-        owner_profile = Profile.query.filter_by(user_id=project.owner_id).first()
-        
+    for pid, score in ranked:
+        project = projects.get(pid)
+        if not project:
+            continue
         projects_data.append({
-            'id': project.id,
-            'title': project.title,
-            'description': project.description,
-            'skills': project.skills,
-            'category': project.category,
-            'created_at': project.created_at.isoformat() if project.created_at else None,
-            'owner': {
-                'id': owner.id if owner else None,
-                'email': owner.email if owner else None,
-                'name': owner_profile.full_name if owner_profile else None
-            },
-            'application_count': len(project.applications)
+            **project_recommendation_serializer(project),
+            'score': round(score, 4),
+            'matched_skills': [s.name for s in project.skill_tags if s.id in user_skills]
         })
-    
-    # Calculate total pages
-    total_pages = math.ceil(total / limit) if limit > 0 else 0
-    
-    return jsonify({
-        'projects': projects_data,
-        'total': total,
-        'page': page,
-        'pages': total_pages,
-        'limit': limit
-    }), 200
+
+    return jsonify({'projects': projects_data}), 200
+
+@project_bp.route('/search/cache-stats', methods=['GET'])
+def search_cache_stats():
+    """Hit/miss counters for the search response cache."""
+    return jsonify(get_cache().stats()), 200
 
 @project_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_my_projects():
     """
     Get all projects created by the current user.
+    Supports fields= and view=compact like /search.
     """
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
+    fields, compact = _requested_fields(MY_PROJECT_FIELDS)
     
-    projects = Project.query.filter_by(owner_id=user_id).order_by(Project.created_at.desc()).all()
+    query = Project.query.filter_by(owner_id=user_id).order_by(Project.created_at.desc())
+    projects = _load_fields(query, fields, compact).all()
     
-    projects_data = []
-    for project in projects:
-        projects_data.append({
-            'id': project.id,
-            'title': project.title,
-            'description': project.description,
-            'skills': project.skills,
-            'category': project.category,
-            'created_at': project.created_at.isoformat() if project.created_at else None,
-            'application_count': len(project.applications)
-        })
+    projects_data = _fields_serializer(fields, compact).many(projects)
     
     return jsonify(projects_data), 200
 
@@ -188,45 +451,51 @@ def get_user_projects(user_id):
     """
     Get all projects owned by a specific user (public).
     Also includes projects where the user is an accepted member.
+    Supports fields= and view=compact like /search.
+    Sends an ETag; a matching If-None-Match gets a 304.
     """
-    user = User.query.get(user_id)
-    if not user:
+    if not load_user_summary(user_id):
         return jsonify({"msg": "User not found"}), 404
 
+    fields, compact = _requested_fields(USER_PROJECT_FIELDS)
+    owned_query = Project.query.filter_by(owner_id=user_id)
+    member_query = (
+        Project.query.join(Application, Application.project_id == Project.id)
+        .filter(Application.user_id == user_id, Application.status == 'accepted')
+    )
+    etag = make_etag(
+        'user_projects', user_id, sorted(fields), compact,
+        collection_version(owned_query, Project.updated_at),
+        collection_version(member_query, Project.updated_at),
+    )
+    unchanged = not_modified(etag, 'user_projects')
+    if unchanged:
+        return unchanged
+
+    serialize = _fields_serializer(fields, compact)
+
     # Projects owned by the user
-    owned = Project.query.filter_by(owner_id=user_id).order_by(Project.created_at.desc()).all()
+    owned = _load_fields(owned_query.order_by(Project.created_at.desc()), fields, compact).all()
     projects_data = []
     seen_ids = set()
     for project in owned:
         seen_ids.add(project.id)
-        projects_data.append({
-            'id': project.id,
-            'title': project.title,
-            'description': project.description,
-            'skills': project.skills,
-            'category': project.category,
-            'created_at': project.created_at.isoformat() if project.created_at else None,
-            'role': 'Owner'
-        })
+        item = serialize(project)
+        if 'role' in fields:
+            item['role'] = 'Owner'
+        projects_data.append(item)
 
-    # Projects where user is an accepted member
-    accepted_apps = Application.query.filter_by(user_id=user_id, status='accepted').all()
-    for app in accepted_apps:
-        if app.project_id not in seen_ids:
-            project = Project.query.get(app.project_id)
-            if project:
-                seen_ids.add(project.id)
-                projects_data.append({
-                    'id': project.id,
-                    'title': project.title,
-                    'description': project.description,
-                    'skills': project.skills,
-                    'category': project.category,
-                    'created_at': project.created_at.isoformat() if project.created_at else None,
-                    'role': 'Member'
-                })
+    # Projects where user is an accepted member (one JOIN instead of a lookup per application)
+    member_of = _load_fields(member_query.order_by(Application.id), fields, compact).all()
+    for project in member_of:
+        if project.id not in seen_ids:
+            seen_ids.add(project.id)
+            item = serialize(project)
+            if 'role' in fields:
+                item['role'] = 'Member'
+            projects_data.append(item)
 
-    return jsonify(projects_data), 200
+    return cacheable(jsonify(projects_data), etag, 'user_projects'), 200
 
 @project_bp.route('/<int:project_id>', methods=['PUT'])
 @jwt_required()
@@ -234,7 +503,7 @@ def update_project(project_id):
     """
     Update a project (owner-only).
     """
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     
     project = Project.query.get(project_id)
     if not project:
@@ -244,6 +513,8 @@ def update_project(project_id):
         return jsonify({"msg": "Only project owner can update this project"}), 403
     
     data = request.get_json() or {}
+    facets_before = project_facets(project)
+    terms_before = project_terms(project)
     
     # Update fields if provided
     if 'title' in data:
@@ -266,17 +537,16 @@ def update_project(project_id):
     
     if 'skills' in data:
         project.skills = data['skills'].strip() or None
+        sync_skill_tags(db.session, Skill, project, project.skills)
     
+    apply_facet_delta(db.session, FacetCount, facets_before, project_facets(project))
     db.session.commit()
+    invalidate_tags(PROJECTS_TAG)
+    get_suggest_index().apply_delta(terms_before, project_terms(project))
+    if 'skills' in data:
+        get_recommender().mark_changed(project.id, user_id, [s.id for s in project.skill_tags])
     
-    return jsonify({
-        'id': project.id,
-        'title': project.title,
-        'description': project.description,
-        'skills': project.skills,
-        'category': project.category,
-        'created_at': project.created_at.isoformat() if project.created_at else None
-    }), 200
+    return jsonify(project_serializer(project)), 200
 
 @project_bp.route('/<int:project_id>', methods=['DELETE'])
 @jwt_required()
@@ -284,7 +554,7 @@ def delete_project(project_id):
     """
     Delete a project (owner-only).
     """
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     
     project = Project.query.get(project_id)
     if not project:
@@ -293,11 +563,16 @@ def delete_project(project_id):
     if project.owner_id != user_id:
         return jsonify({"msg": "Only project owner can delete this project"}), 403
     
-    # Delete all applications for this project first
+    # Delete all applications for this project first (its counters go with the row)
     Application.query.filter_by(project_id=project_id).delete()
+    apply_facet_delta(db.session, FacetCount, project_facets(project), Counter())
+    terms_before = project_terms(project)
     
     db.session.delete(project)
     db.session.commit()
+    invalidate_tags(PROJECTS_TAG)
+    get_suggest_index().apply_delta(terms_before, Counter())
+    get_recommender().mark_deleted(project_id)
     
     return jsonify({"msg": "Project deleted successfully"}), 200
 
@@ -306,35 +581,31 @@ def delete_project(project_id):
 def get_my_applications():
     """
     Get all applications submitted by the current user.
+    Query params: stream=ndjson|json to stream the list instead of buffering it.
     """
-    user_id = int(get_jwt_identity())
-    
-    applications = Application.query.filter_by(user_id=user_id).all()
-    
-    apps_data = []
-    for app in applications:
-        project = Project.query.get(app.project_id)
-        owner = User.query.get(project.owner_id) if project else None
-        owner_profile = Profile.query.filter_by(user_id=project.owner_id).first() if project else None
-        
-        apps_data.append({
-            'id': app.id,
-            'project_id': app.project_id,
-            'role': app.role,
-            'status': app.status,
-            'created_at': app.created_at.isoformat(),
-            'project': {
-                'id': project.id if project else None,
-                'title': project.title if project else None,
-                'category': project.category if project else None,
-                'owner': {
-                    'id': owner.id if owner else None,
-                    'name': owner_profile.full_name if owner_profile else None
-                }
-            } if project else None
-        })
+    user_id = current_user_id()
+    
+    # Plain rows in one JOIN: no ORM objects to build for a read-only list
+    query = (
+        select(
+            Application.id, Application.project_id, Application.role, Application.status,
+            Application.created_at,
+            Project.title.label('project_title'),
+            Project.category.label('project_category'),
+            Project.owner_id,
+            Profile.full_name.label('owner_name'),
+        )
+        .join(Project, Project.id == Application.project_id)
+        .outerjoin(Profile, Profile.user_id == Project.owner_id)
+        .where(Application.user_id == user_id)
+        .order_by(Application.id)
+    )
+
+    mode = requested_stream_mode()
+    if mode:
+        return stream_rows(db.session, query, my_application_serializer, mode)
     
-    return jsonify(apps_data), 200
+    return jsonify(my_application_serializer.many(db.session.execute(query))), 200
 
 @project_bp.route('/<int:project_id>/applications', methods=['GET'])
 @jwt_required()
@@ -342,7 +613,7 @@ def get_project_applications(project_id):
     """
     Get all applications for a project (owner-only).
     """
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     project = Project.query.get(project_id)
     
     if not project:
@@ -351,28 +622,20 @@ def get_project_applications(project_id):
     if project.owner_id != user_id:
         return jsonify({"msg": "Only project owner can view applications"}), 403
     
-    applications = Application.query.filter_by(project_id=project_id).all()
-    
-    apps_data = []
-    for app in applications:
-        applicant = User.query.get(app.user_id)
-        applicant_profile = Profile.query.filter_by(user_id=app.user_id).first()
-        
-        apps_data.append({
-            'id': app.id,
-            'project_id': app.project_id,
-            'user_id': app.user_id,
-            'role': app.role,
-            'status': app.status,
-            'created_at': app.created_at.isoformat(),
-            'applicant': {
-                'id': applicant.id if applicant else None,
-                'email': applicant.email if applicant else None,
-                'name': applicant_profile.full_name if applicant_profile else None
-            }
-        })
+    rows = db.session.execute(
+        select(
+            Application.id, Application.project_id, Application.user_id, Application.role,
+            Application.status, Application.created_at,
+            User.email.label('applicant_email'),
+            Profile.full_name.label('applicant_name'),
+        )
+        .join(User, User.id == Application.user_id)
+        .outerjoin(Profile, Profile.user_id == User.id)
+        .where(Application.project_id == project_id)
+        .order_by(Application.id)
+    )
     
-    return jsonify(apps_data), 200
+    return jsonify(application_with_applicant_serializer.many(rows)), 200
 
 @project_bp.route('/<int:project_id>/apply', methods=['POST'])
 @jwt_required()
@@ -381,7 +644,7 @@ def apply_project(project_id):
     Submit an application to a project.
     Required: role
     """
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     
     project = Project.query.get(project_id)
     if not project:
@@ -415,16 +678,11 @@ def apply_project(project_id):
     )
     
     db.session.add(application)
+    bump_application_counts(db.session, Project, project_id, total=1, pending=1)
     db.session.commit()
+    invalidate_tags(PROJECTS_TAG)
     
-    return jsonify({
-        'id': application.id,
-        'project_id': application.project_id,
-        'user_id': application.user_id,
-        'role': application.role,
-        'status': application.status,
-        'created_at': application.created_at.isoformat()
-    }), 201
+    return jsonify(application_serializer(application)), 201
 
 @project_bp.route('/applications/<int:application_id>/status', methods=['PUT'])
 @jwt_required()
@@ -433,7 +691,7 @@ def update_application_status(application_id):
     Update application status (owner-only).
     Required: status (accepted or rejected)
     """
-    user_id = int(get_jwt_identity())
+    user_id = current_user_id()
     
     application = Application.query.get(application_id)
     if not application:
@@ -452,14 +710,13 @@ def update_application_status(application_id):
     if new_status not in ['accepted', 'rejected']:
         return jsonify({"msg": "Status must be 'accepted' or 'rejected'"}), 400
     
+    old_status = application.status
     application.status = new_status
+    if old_status != new_status:
+        deltas = {new_status: 1}
+        if old_status:
+            deltas[old_status] = -1
+        bump_application_counts(db.session, Project, project.id, **deltas)
     db.session.commit()
     
-    return jsonify({
-        'id': application.id,
-        'project_id': application.project_id,
-        'user_id': application.user_id,
-        'role': application.role,
-        'status': application.status,
-        'created_at': application.created_at.isoformat()
-    }), 200
+    return jsonify(application_serializer(application)), 200
@@ -1,5 +1,8 @@
 from app import create_app, db
-from app.models import User, Profile, Project, Application
+from app.models import User, Profile, Project, Application, Skill, FacetCount, project_skills
+from app.utils.counters import reconcile_application_counts
+from app.utils.facets import rebuild_facet_counts
+from app.utils.skills import sync_skill_tags
 from werkzeug.security import generate_password_hash
 
 app = create_app()
@@ -23,7 +26,15 @@ with app.app_context():
     # Applications (Bob applies to Alice's project)
     app1 = Application(applicant=bob, project=proj1, role='Frontend Developer')
 
+    # Normalized skill tags, as the API keeps them next to the free-text skills
+    for tagged in (alice.profile, bob.profile, proj1, proj2):
+        sync_skill_tags(db.session, Skill, tagged, tagged.skills)
+
     db.session.add_all([alice, bob, proj1, proj2, app1])
     db.session.commit()
 
+    # Rows above bypass the API, so fill in the denormalized counters and facets
+    reconcile_application_counts(db.session, Project, Application)
+    rebuild_facet_counts(db.session, FacetCount, Project, Skill, project_skills)
+
     print("✅ Seeded test data.")
@@ -0,0 +1,211 @@
+"""
+Shared JSON shapes for API responses.
+
+Each serializer is compiled once at import time from a field spec: a string is
+turned into an ``operator.attrgetter`` and anything else is called with the
+object. The same serializer works on ORM instances and on result ``Row``
+tuples, so hot list endpoints can SELECT just the columns they need and skip
+building ORM objects altogether.
+"""
+from functools import lru_cache
+from operator import attrgetter
+
+# view=compact truncates descriptions to what a project card shows
+COMPACT_DESCRIPTION_CHARS = 160
+
+
+class Serializer:
+    __slots__ = ('_fields', '_items')
+
+    def __init__(self, fields):
+        self._fields = dict(fields)
+        self._items = tuple(
+            (key, attrgetter(spec) if isinstance(spec, str) else spec)
+            for key, spec in self._fields.items()
+        )
+
+    def __call__(self, obj):
+        return {key: get(obj) for key, get in self._items}
+
+    def many(self, objs):
+        items = self._items
+        return [{key: get(obj) for key, get in items} for obj in objs]
+
+    def keys(self):
+        return tuple(self._fields)
+
+    def only(self, keys):
+        """Serializer restricted to ``keys`` (compiled once per distinct key set)."""
+        return _subset(self, frozenset(keys))
+
+    def extend(self, **fields):
+        """New serializer with extra or replaced fields."""
+        return Serializer({**self._fields, **fields})
+
+
+@lru_cache(maxsize=256)
+def _subset(serializer, keys):
+    return Serializer({key: spec for key, spec in serializer._fields.items() if key in keys})
+
+
+def iso(attr):
+    """Getter for a datetime attribute as an ISO string (None stays None)."""
+    get = attrgetter(attr)
+
+    def getter(obj):
+        value = get(obj)
+        return value.isoformat() if value is not None else None
+    return getter
+
+
+def _description_preview(obj):
+    preview = obj.description_preview
+    if preview and len(preview) > COMPACT_DESCRIPTION_CHARS:
+        preview = preview[:COMPACT_DESCRIPTION_CHARS].rstrip() + '…'
+    return preview
+
+
+def _owner_with_email(project):
+    owner = project.owner
+    profile = owner.profile if owner else None
+    return {
+        'id': owner.id if owner else None,
+        'email': owner.email if owner else None,
+        'name': profile.full_name if profile else None,
+    }
+
+
+def _owner_name(project):
+    owner = project.owner
+    profile = owner.profile if owner else None
+    return {
+        'id': owner.id if owner else None,
+        'name': profile.full_name if profile else None,
+    }
+
+
+# ── projects ─────────────────────────────────────────────────
+project_serializer = Serializer({
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'skills': 'skills',
+    'category': 'category',
+    'owner_id': 'owner_id',
+    'created_at': iso('created_at'),
+    'application_count': 'application_count',
+})
+
+# List rows; 'owner' needs owner + owner.profile eager-loaded
+project_list_serializer = project_serializer.extend(owner=_owner_with_email)
+project_compact_serializer = project_list_serializer.extend(description=_description_preview)
+# Recommendations; the route adds score and matched_skills
+project_recommendation_serializer = project_serializer.extend(owner=_owner_name)
+
+
+# ── applications ─────────────────────────────────────────────
+application_serializer = Serializer({
+    'id': 'id',
+    'project_id': 'project_id',
+    'user_id': 'user_id',
+    'role': 'role',
+    'status': 'status',
+    'created_at': iso('created_at'),
+})
+
+# Rows from a SELECT joining applications -> users -> profiles
+application_with_applicant_serializer = application_serializer.extend(
+    applicant=lambda row: {
+        'id': row.user_id,
+        'email': row.applicant_email,
+        'name': row.applicant_name,
+    },
+)
+
+# Rows from a SELECT joining applications -> projects -> profiles (of the owner)
+my_application_serializer = Serializer({
+    'id': 'id',
+    'project_id': 'project_id',
+    'role': 'role',
+    'status': 'status',
+    'created_at': iso('created_at'),
+    'project': lambda row: {
+        'id': row.project_id,
+        'title': row.project_title,
+        'category': row.project_category,
+        'owner': {'id': row.owner_id, 'name': row.owner_name},
+    },
+})
+
+
+# ── HTF submissions ──────────────────────────────────────────
+def _submitter(row):
+    if row.submitter_name:
+        name = row.submitter_name
+    elif row.submitter_email:
+        name = row.submitter_email.split('@')[0]
+    else:
+        name = 'Unknown'
+    return {'id': row.user_id, 'name': name}
+
+
+# Rows from a SELECT joining htf_submissions -> users -> profiles
+htf_submission_serializer = Serializer({
+    'id': 'id',
+    'project_name': 'project_name',
+    'team_name': 'team_name',
+    'youtube_url': 'youtube_url',
+    'github_url': 'github_url',
+    'description': 'description',
+    'created_at': iso('created_at'),
+    'submitter': _submitter,
+})
+
+
+# ── profiles ─────────────────────────────────────────────────
+# Metadata columns only: nothing here may touch the deferred blob columns
+_profile_fields = Serializer({
+    'full_name': 'full_name',
+    'program': 'program',
+    'year': 'year',
+    'bio': 'bio',
+    'skills': 'skills',
+    'linkedin': 'linkedin',
+    'discord': 'discord',
+    'instagram': 'instagram',
+    'resume_filename': 'resume_filename',
+    'resume_size': 'resume_size',
+})
+_empty_profile = dict.fromkeys(_profile_fields.keys())
+
+# Length of the content-hash prefix used in avatar URLs (?v=...)
+AVATAR_VERSION_CHARS = 16
+
+
+def avatar_version(profile):
+    """Content-hash token for the avatar URL, or None (no avatar / not migrated yet)."""
+    if profile and profile.has_avatar and profile.avatar_hash:
+        return profile.avatar_hash[:AVATAR_VERSION_CHARS]
+    return None
+
+
+def serialize_profile(user, profile):
+    """Full profile for its owner (includes email)."""
+    return {
+        'user_id': user.id,
+        'email': user.email,
+        **(_profile_fields(profile) if profile else _empty_profile),
+        'has_avatar': bool(profile and profile.has_avatar),
+        'avatar_version': avatar_version(profile),
+    }
+
+
+def serialize_public_profile(user, profile):
+    """Public view of a profile: no email."""
+    return {
+        'user_id': user.id,
+        **(_profile_fields(profile) if profile else _empty_profile),
+        'has_resume': bool(profile and profile.has_resume),
+        'has_avatar': bool(profile and profile.has_avatar),
+        'avatar_version': avatar_version(profile),
+    }
@@ -0,0 +1,221 @@
+"""
+Bulk announcements to every member.
+
+``AnnouncementTemplate`` wraps the body in the club's email layout once and
+compiles it into ``string.Template``s; each recipient only costs a
+substitution of ``$name`` / ``$email`` (HTML-escaped in the HTML part).
+
+``send_announcement`` streams recipients from ``users`` in id order over its
+own connection with ``yield_per`` (a server-side cursor where the driver
+supports it), hands them to a small pool of threads that each keep one
+SMTPConnection open, and paces the whole pool with a shared ``Throttle``.
+Progress is the highest user id below which every recipient has been handled;
+it is committed every ``progress_every`` recipients, so an interrupted run
+resumes (``flask announce --resume <id>``) without emailing anyone twice,
+except for at most the last uncommitted stretch. A recipient the SMTP server
+refuses is handed to the email outbox (app.utils.outbox), whose worker retries
+it with backoff.
+"""
+import html
+import queue
+import threading
+import time
+from datetime import datetime
+from string import Template
+from sqlalchemy import select
+
+LAYOUT_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+        .header {{ background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }}
+        .content {{ background: #f8fafc; padding: 30px; border-radius: 0 0 8px 8px; }}
+        .footer {{ text-align: center; margin-top: 20px; color: #64748b; font-size: 14px; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>{title}</h1>
+        </div>
+        <div class="content">
+            {body}
+        </div>
+        <div class="footer">
+            <p>You're receiving this because you have a UofT Projects Club account.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+# Sentinel telling a sender thread to finish
+_DONE = object()
+
+
+class AnnouncementTemplate:
+    """Subject/HTML/text compiled once; ``render`` only substitutes $name and $email."""
+
+    def __init__(self, subject, body_html, body_text=None):
+        self.subject = Template(subject)
+        self.html = Template(LAYOUT_HTML.format(title=html.escape(subject), body=body_html))
+        self.text = Template(body_text) if body_text else None
+
+    def render(self, email, name=None):
+        """(subject, body_html, body_text) for one recipient."""
+        values = {'email': email, 'name': name or 'there'}
+        escaped = {key: html.escape(value) for key, value in values.items()}
+        return (
+            self.subject.safe_substitute(values),
+            self.html.safe_substitute(escaped),
+            self.text.safe_substitute(values) if self.text else None,
+        )
+
+
+class Throttle:
+    """Spaces calls ``1/rate`` seconds apart across all threads (rate <= 0: unthrottled)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _Progress:
+    """Tracks the id watermark below which every dispatched recipient has been handled."""
+
+    def __init__(self, start_after):
+        self.watermark = start_after
+        self._pending = []   # dispatched ids, ascending
+        self._done = set()
+
+    def dispatched(self, user_id):
+        self._pending.append(user_id)
+
+    def handled(self, user_id):
+        self._done.add(user_id)
+        advanced = 0
+        while advanced < len(self._pending) and self._pending[advanced] in self._done:
+            self._done.discard(self._pending[advanced])
+            advanced += 1
+        if advanced:
+            self.watermark = self._pending[advanced - 1]
+            del self._pending[:advanced]
+
+
+def _recipients(engine, user_model, profile_model, after_id, batch_size):
+    statement = (
+        select(user_model.id, user_model.email, profile_model.full_name)
+        .outerjoin(profile_model, profile_model.user_id == user_model.id)
+        .where(user_model.id > after_id)
+        .order_by(user_model.id)
+    )
+    # Own connection: the cursor must survive the progress commits on the session
+    with engine.connect() as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(statement)
+        for row in result:
+            yield row
+
+
+def send_announcement(session, engine, announcement, models, connection_factory,
+                      pool_size=3, rate=5.0, progress_every=100, batch_size=500, log=print):
+    """
+    Send ``announcement`` (an Announcement row) to every user after its
+    ``last_user_id``. ``models`` is (User, Profile, EmailOutbox);
+    ``connection_factory()`` returns a new SMTPConnection. Returns the row.
+    """
+    from app.utils.outbox import queue_email
+
+    user_model, profile_model, outbox_model = models
+    template = AnnouncementTemplate(announcement.subject, announcement.body_html, announcement.body_text)
+    throttle = Throttle(rate)
+    jobs = queue.Queue(maxsize=pool_size * 4)
+    results = queue.Queue()
+
+    def sender():
+        connection = connection_factory()
+        try:
+            while True:
+                job = jobs.get()
+                if job is _DONE:
+                    return
+                user_id, email, rendered = job
+                throttle.wait()
+                try:
+                    connection.send(email, *rendered)
+                    results.put((user_id, email, rendered, None))
+                except Exception as e:
+                    connection.close()  # reconnects on the next send
+                    results.put((user_id, email, rendered, e))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=sender, name=f'announce-{i}', daemon=True) for i in range(pool_size)]
+    for thread in threads:
+        thread.start()
+
+    progress = _Progress(announcement.last_user_id or 0)
+    announcement.status = 'running'
+    session.commit()
+    handled_since_commit = 0
+
+    def collect():
+        """Record finished sends (main thread only: it owns the session)."""
+        nonlocal handled_since_commit
+        while True:
+            try:
+                user_id, email, rendered, error = results.get_nowait()
+            except queue.Empty:
+                return
+            if error is None:
+                announcement.sent_count += 1
+            else:
+                # Let the outbox worker retry it with backoff
+                queue_email(session, outbox_model, email, *rendered)
+                announcement.failed_count += 1
+                log(f"Deferred {email} to the outbox: {error}")
+            progress.handled(user_id)
+            handled_since_commit += 1
+            if handled_since_commit >= progress_every:
+                announcement.last_user_id = progress.watermark
+                session.commit()
+                log(f"Announcement {announcement.id}: {announcement.sent_count} sent, "
+                    f"{announcement.failed_count} deferred, through user {progress.watermark}")
+                handled_since_commit = 0
+
+    try:
+        for user_id, email, full_name in _recipients(engine, user_model, profile_model,
+                                                      progress.watermark, batch_size):
+            progress.dispatched(user_id)
+            while True:
+                try:
+                    jobs.put((user_id, email, template.render(email, full_name)), timeout=1)
+                    break
+                except queue.Full:
+                    collect()
+            collect()
+    finally:
+        for _ in threads:
+            jobs.put(_DONE)
+        for thread in threads:
+            thread.join()
+        collect()
+        announcement.last_user_id = progress.watermark
+        session.commit()
+
+    announcement.status = 'done'
+    announcement.finished_at = datetime.utcnow()
+    session.commit()
+    return announcement
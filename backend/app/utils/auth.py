@@ -1,12 +1,95 @@
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token
+"""
+Password hashing (see app.utils.passwords), token creation and the
+current-user accessors.
+
+The JWT user loader resolves a token's user once per request (flask-jwt-extended
+keeps the result for the rest of the request), so routes call ``current_user()``
+/ ``current_user_id()`` instead of looking the user up again.
+
+The loader returns a ``UserSummary`` rather than an ORM ``User``; summaries are
+kept in a small per-process cache for USER_CACHE_TTL seconds (0 disables it).
+Writes that change a user call ``invalidate_user`` after committing. Other
+worker processes only see the change once their copy expires, which is why
+the TTL is short.
+"""
+import os
+from flask import current_app, g
+from flask_jwt_extended import create_access_token, get_current_user, get_jwt_identity
 from datetime import timedelta
+from app.utils.cache import LRUCache, user_tag
+from app.utils.passwords import get_password_hasher
 
 def hash_password(password: str) -> str:
-    return generate_password_hash(password)
+    return get_password_hasher().hash(password)
 
 def verify_password(password: str, hash: str) -> bool:
-    return check_password_hash(hash, password)
+    return get_password_hasher().verify(password, hash)
+
+def password_needs_rehash(hash: str) -> bool:
+    return get_password_hasher().needs_rehash(hash)
 
 def create_jwt(identity: str):
     return create_access_token(identity=identity, expires_delta=timedelta(days=7))
+
+
+class UserSummary:
+    """What routes need to know about a user; cheap to cache, never lazy-loads."""
+
+    __slots__ = ('id', 'email')
+
+    def __init__(self, id, email):
+        self.id = id
+        self.email = email
+
+
+def load_user_summary(user_id):
+    """UserSummary for ``user_id``, or None if there is no such user."""
+    cache = current_app.extensions.get('user_cache')
+    key = str(user_id)
+    if cache is not None:
+        summary = cache.get(key)
+        if summary is not None:
+            return summary
+
+    from app import db
+    from app.models import User
+    row = db.session.query(User.id, User.email).filter(User.id == user_id).first()
+    if row is None:
+        return None  # misses aren't cached: the user may be signing up right now
+    summary = UserSummary(row.id, row.email)
+    if cache is not None:
+        cache.set(key, summary, tags=(user_tag(row.id),))
+    return summary
+
+
+def invalidate_user(user_id):
+    """Forget this process's cached summary of ``user_id``. Call after the write commits."""
+    cache = current_app.extensions.get('user_cache')
+    if cache is not None:
+        cache.invalidate_tags(user_tag(user_id))
+
+
+def current_user():
+    """The authenticated user's UserSummary (None without a verified token)."""
+    try:
+        return get_current_user()
+    except RuntimeError:
+        return None  # no JWT verified on this request
+
+
+def current_user_id():
+    """The authenticated user's id as an int (None without a verified token)."""
+    if '_current_user_id' not in g:
+        identity = get_jwt_identity()
+        g._current_user_id = int(identity) if identity else None
+    return g._current_user_id
+
+
+def init_user_cache(app):
+    app.config.setdefault('USER_CACHE_TTL', int(os.getenv('USER_CACHE_TTL', 10)))
+    app.config.setdefault('USER_CACHE_MAX_ENTRIES', int(os.getenv('USER_CACHE_MAX_ENTRIES', 4096)))
+    if app.config['USER_CACHE_TTL'] > 0:
+        app.extensions['user_cache'] = LRUCache(
+            max_entries=app.config['USER_CACHE_MAX_ENTRIES'],
+            default_ttl=app.config['USER_CACHE_TTL'],
+        )
@@ -0,0 +1,151 @@
+"""
+Pre-generated avatar thumbnails.
+
+After an avatar upload commits, a background worker crops the image to a
+square and renders each size in VARIANT_SIZES as WebP plus a JPEG fallback.
+Variants go into the blob store and are recorded against the *source* blob
+hash, so a re-upload of the same image reuses them and a new image simply has
+none until its worker finishes (``get_avatar`` serves the original meanwhile).
+
+Needs Pillow; without it no variants are generated and originals are served.
+"""
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.exc import IntegrityError
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional dependency
+    Image = None
+
+VARIANT_SIZES = (48, 128, 512)
+WEBP = 'webp'
+JPEG = 'jpeg'
+VARIANT_MIMETYPES = {WEBP: 'image/webp', JPEG: 'image/jpeg'}
+# Don't decode anything bigger (decompression bombs); 2 MB uploads never need more
+MAX_SOURCE_PIXELS = 40_000_000
+
+
+def render_variants(data, sizes=VARIANT_SIZES):
+    """
+    Yield (size, format, bytes) for each variant of the image in ``data``.
+    Yields nothing for an image over MAX_SOURCE_PIXELS (the original is served).
+    """
+    try:
+        source = Image.open(io.BytesIO(data))
+    except Image.DecompressionBombError:  # past twice Pillow's own limit
+        return
+    with source:
+        # open() only reads the header, so this is checked before any pixels are decoded
+        width, height = source.size
+        if width * height > MAX_SOURCE_PIXELS:
+            return
+        source = ImageOps.exif_transpose(source)
+        side = min(source.size)
+        has_alpha = source.mode in ('RGBA', 'LA') or 'transparency' in source.info
+        square = ImageOps.fit(source.convert('RGBA' if has_alpha else 'RGB'), (side, side), Image.LANCZOS)
+
+    for size in sizes:
+        # Never upscale; a small source just yields smaller "large" variants
+        image = square.resize((min(size, side),) * 2, Image.LANCZOS)
+
+        out = io.BytesIO()
+        image.save(out, 'WEBP', quality=80, method=4)
+        yield size, WEBP, out.getvalue()
+
+        if image.mode == 'RGBA':
+            flat = Image.new('RGB', image.size, (255, 255, 255))
+            flat.paste(image, mask=image.getchannel('A'))
+            image = flat
+        out = io.BytesIO()
+        image.save(out, 'JPEG', quality=85, optimize=True, progressive=True)
+        yield size, JPEG, out.getvalue()
+
+
+def generate_avatar_variants(session, store, variant_model, source_hash):
+    """Render and store all variants of one avatar blob. Returns how many were added."""
+    if Image is None:
+        return 0
+    existing = {
+        (size, fmt) for size, fmt in
+        session.query(variant_model.size, variant_model.format).filter_by(source_hash=source_hash)
+    }
+    if len(existing) == len(VARIANT_SIZES) * len(VARIANT_MIMETYPES):
+        return 0
+    data = store.get(session, source_hash)
+    if data is None:
+        return 0
+
+    added = 0
+    for size, fmt, rendered in render_variants(data):
+        if (size, fmt) in existing:
+            continue
+        blob_hash = store.put(session, rendered, VARIANT_MIMETYPES[fmt])
+        try:
+            with session.begin_nested():
+                session.add(variant_model(
+                    source_hash=source_hash, size=size, format=fmt,
+                    blob_hash=blob_hash, byte_size=len(rendered),
+                ))
+            added += 1
+        except IntegrityError:
+            pass  # another worker got there first
+    session.commit()
+    return added
+
+
+def pick_variant(variants, size, accepts_webp):
+    """
+    Choose from (size, format, blob_hash) rows: the smallest variant at least
+    ``size`` px (the largest one if none is that big), WebP when accepted.
+    Returns the chosen row or None.
+    """
+    fmt = WEBP if accepts_webp else JPEG
+    candidates = sorted(v for v in variants if v[1] == fmt)
+    if not candidates:
+        return None
+    for candidate in candidates:
+        if candidate[0] >= size:
+            return candidate
+    return candidates[-1]
+
+
+class AvatarWorker:
+    """Runs variant generation off the request thread (inline when workers=0)."""
+
+    def __init__(self, app, workers=2):
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='avatars') if workers else None
+
+    def submit(self, source_hash):
+        if Image is None:
+            return None
+        if self._executor is None:
+            return self._run(source_hash)
+        return self._executor.submit(self._run, source_hash)
+
+    def _run(self, source_hash):
+        from app import db
+        from app.models import AvatarVariant
+        from app.utils.blobs import get_blob_store
+
+        with self.app.app_context():
+            try:
+                return generate_avatar_variants(db.session, get_blob_store(), AvatarVariant, source_hash)
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception("Avatar variant generation failed for %s", source_hash)
+                return 0
+
+
+def init_avatar_worker(app):
+    app.config.setdefault('AVATAR_WORKERS', int(os.getenv('AVATAR_WORKERS', 2)))
+    worker = AvatarWorker(app, workers=app.config['AVATAR_WORKERS'])
+    app.extensions['avatar_worker'] = worker
+    return worker
+
+
+def get_avatar_worker():
+    from flask import current_app
+    return current_app.extensions['avatar_worker']
@@ -0,0 +1,316 @@
+"""
+Content-addressed blob storage for uploaded files (resumes, avatars).
+
+Blobs are keyed by the SHA-256 of their bytes, so identical uploads are stored
+once; rows that use a blob (e.g. ``profiles.resume_hash``) keep only the hash
+plus their own size/mimetype metadata. PDFs are zstd-compressed at rest when
+the optional ``zstandard`` package is installed (and it actually saves space).
+
+Backends:
+- ``DatabaseBlobStore``: the ``blobs`` table. Default; the blob is written in
+  the same transaction as the row that references it.
+- ``FileBlobStore``: files under BLOB_STORE_PATH, fanned out by hash prefix.
+  Writes are atomic renames; a file whose transaction later rolls back is just
+  an orphan.
+
+``put_file`` stores an already-hashed upload (see app.utils.uploads) without
+re-reading it when the blob exists, and the filesystem backend copies it to
+disk in chunks.
+
+Blobs are never deleted when a reference goes away (another profile may share
+it). ``collect_garbage`` removes blobs nothing references any more and that
+haven't been stored within the grace period. A ``put`` that finds its blob
+already stored restarts that period (``touch``), and the delete re-checks it,
+so re-uploading an orphan while GC runs can't leave the new reference pointing
+at a deleted blob.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+ZSTD = 'zstd'
+# Images are already compressed; PDFs usually aren't (much)
+ZSTD_MIMETYPES = {'application/pdf'}
+
+
+def sha256_hex(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _encode(data, mimetype, zstd_level):
+    """Returns (stored bytes, encoding or None)."""
+    if zstandard is not None and zstd_level and mimetype in ZSTD_MIMETYPES:
+        packed = zstandard.ZstdCompressor(level=zstd_level).compress(data)
+        if len(packed) < len(data):
+            return packed, ZSTD
+    return data, None
+
+
+def _decode(stored, encoding):
+    if encoding == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Blob is zstd-compressed but the 'zstandard' package is not installed")
+        return zstandard.ZstdDecompressor().decompress(stored)
+    return stored
+
+
+class DatabaseBlobStore:
+    backend = 'database'
+
+    def __init__(self, blob_model, zstd_level=10):
+        self.model = blob_model
+        self.zstd_level = zstd_level
+
+    def put(self, session, data, mimetype=None, digest=None):
+        """Store ``data`` (no-op if already present). Returns its SHA-256 hex digest."""
+        digest = digest or sha256_hex(data)
+        if self.touch(session, digest):
+            return digest
+        stored, encoding = _encode(data, mimetype, self.zstd_level)
+        # Savepoint so a concurrent upload of the same bytes can't abort the request
+        try:
+            with session.begin_nested():
+                session.add(self.model(sha256=digest, size=len(data), encoding=encoding, data=stored))
+        except IntegrityError:
+            pass
+        return digest
+
+    def put_file(self, session, fileobj, digest, mimetype=None):
+        """Store the contents of a file object whose SHA-256 is already known."""
+        if self.touch(session, digest):
+            return digest
+        fileobj.seek(0)
+        return self.put(session, fileobj.read(), mimetype, digest=digest)
+
+    def exists(self, session, digest):
+        return session.query(self.model.sha256).filter_by(sha256=digest).first() is not None
+
+    def touch(self, session, digest):
+        """
+        Restart a stored blob's GC grace period. False if it isn't stored.
+        The row stays locked until the caller commits, so a concurrent delete
+        waits and then sees the new timestamp.
+        """
+        refreshed = session.query(self.model).filter_by(sha256=digest).update(
+            {self.model.created_at: datetime.utcnow()}, synchronize_session=False
+        )
+        return refreshed > 0
+
+    def get(self, session, digest):
+        """The blob's original bytes, or None if it isn't stored."""
+        row = session.query(self.model.data, self.model.encoding).filter_by(sha256=digest).first()
+        return _decode(row.data, row.encoding) if row else None
+
+    def stored(self, session, min_age):
+        """Hashes of blobs stored at least ``min_age`` (a timedelta) ago."""
+        cutoff = datetime.utcnow() - min_age
+        return [h for (h,) in session.query(self.model.sha256).filter(self.model.created_at < cutoff)]
+
+    def delete(self, session, digests, min_age=None):
+        """Delete blobs; with ``min_age``, only those not stored (or touched) since. Returns the count."""
+        if not digests:
+            return 0
+        query = session.query(self.model).filter(self.model.sha256.in_(digests))
+        if min_age is not None:
+            query = query.filter(self.model.created_at < datetime.utcnow() - min_age)
+        return query.delete(synchronize_session=False)
+
+
+class FileBlobStore:
+    backend = 'filesystem'
+
+    def __init__(self, root, zstd_level=10):
+        self.root = root
+        self.zstd_level = zstd_level
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, digest, encoding=None):
+        name = digest + ('.zst' if encoding == ZSTD else '')
+        return os.path.join(self.root, digest[:2], name)
+
+    def locate(self, digest):
+        """(path, encoding) of a stored blob, or (None, None)."""
+        for encoding in (None, ZSTD):
+            path = self.path(digest, encoding)
+            if os.path.exists(path):
+                return path, encoding
+        return None, None
+
+    def _write(self, target, write):
+        """Atomically create ``target`` by calling ``write(f)`` on a temp file next to it."""
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def put(self, session, data, mimetype=None, digest=None):
+        digest = digest or sha256_hex(data)
+        if self.touch(session, digest):
+            return digest
+        stored, encoding = _encode(data, mimetype, self.zstd_level)
+        self._write(self.path(digest, encoding), lambda f: f.write(stored))
+        return digest
+
+    def put_file(self, session, fileobj, digest, mimetype=None):
+        if self.touch(session, digest):
+            return digest
+        fileobj.seek(0)
+        if zstandard is not None and self.zstd_level and mimetype in ZSTD_MIMETYPES:
+            # Compression decides per blob whether it pays off; needs the whole thing
+            return self.put(session, fileobj.read(), mimetype, digest=digest)
+        self._write(self.path(digest), lambda f: shutil.copyfileobj(fileobj, f))
+        return digest
+
+    def exists(self, session, digest):
+        return self.locate(digest)[0] is not None
+
+    def touch(self, session, digest):
+        """Restart a stored blob's GC grace period (its mtime). False if it isn't stored."""
+        path, _ = self.locate(digest)
+        if path is None:
+            return False
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # collected just now
+            return False
+        return True
+
+    def get(self, session, digest):
+        path, encoding = self.locate(digest)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            return _decode(f.read(), encoding)
+
+    def stored(self, session, min_age):
+        cutoff = time.time() - min_age.total_seconds()
+        digests = []
+        for prefix in os.listdir(self.root):
+            folder = os.path.join(self.root, prefix)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.startswith('.tmp-'):
+                    continue
+                if os.path.getmtime(os.path.join(folder, name)) < cutoff:
+                    digests.append(name.split('.')[0])
+        return digests
+
+    def delete(self, session, digests, min_age=None):
+        """Delete blobs; with ``min_age``, only those not stored (or touched) since. Returns the count."""
+        cutoff = time.time() - min_age.total_seconds() if min_age is not None else None
+        deleted = 0
+        for digest in digests:
+            removed = [self._delete_file(self.path(digest, encoding), cutoff) for encoding in (None, ZSTD)]
+            deleted += any(removed)
+        return deleted
+
+    def _delete_file(self, path, cutoff):
+        """Unlink ``path`` unless it was touched after ``cutoff``. True if it was deleted."""
+        # Move it aside first: from here on a put writes a new file instead of touching this one
+        doomed = os.path.join(os.path.dirname(path), f".tmp-gc-{os.path.basename(path)}")
+        try:
+            os.replace(path, doomed)
+        except FileNotFoundError:
+            return False
+        fresh = cutoff is not None and os.path.getmtime(doomed) >= cutoff
+        if fresh and not os.path.exists(path):
+            os.replace(doomed, path)  # touched just before the move: in use again
+        else:
+            os.unlink(doomed)
+        return not fresh
+
+
+def referenced_blob_hashes(session, profile_model, variant_model):
+    """Every blob hash still in use: profile resumes/avatars and the thumbnails of those avatars."""
+    referenced = set()
+    for resume_hash, avatar_hash in session.query(profile_model.resume_hash, profile_model.avatar_hash):
+        referenced.update(h for h in (resume_hash, avatar_hash) if h)
+    variants = session.query(variant_model.source_hash, variant_model.blob_hash)
+    referenced.update(blob_hash for source_hash, blob_hash in variants if source_hash in referenced)
+    return referenced
+
+
+def collect_garbage(session, store, referenced, grace=timedelta(hours=1)):
+    """
+    Delete blobs not in ``referenced`` (a set of hashes). Blobs stored or
+    touched within ``grace`` are kept, including ones re-stored while this
+    runs: their referencing row may not have committed yet.
+    Returns the number of blobs deleted.
+    """
+    orphans = [digest for digest in store.stored(session, grace) if digest not in referenced]
+    deleted = store.delete(session, orphans, min_age=grace)
+    session.commit()
+    return deleted
+
+
+def migrate_profile_blobs(session, store, profile_model, batch_size=50):
+    """
+    Move legacy ``resume_data``/``avatar_data`` bytes into the blob store, one
+    committed batch at a time so it can run against a live database.
+    Returns the number of profiles migrated.
+    """
+    pending = (
+        (profile_model.resume_data.isnot(None) & profile_model.resume_hash.is_(None))
+        | (profile_model.avatar_data.isnot(None) & profile_model.avatar_hash.is_(None))
+    )
+    migrated = 0
+    while True:
+        ids = [pid for (pid,) in session.query(profile_model.id).filter(pending).limit(batch_size)]
+        if not ids:
+            return migrated
+        # Lock the batch so a concurrent upload can't be overwritten with stale bytes
+        profiles = (
+            session.query(profile_model).filter(profile_model.id.in_(ids))
+            .options(undefer(profile_model.resume_data), undefer(profile_model.avatar_data))
+            .with_for_update().all()
+        )
+        for profile in profiles:
+            if profile.resume_data is not None and profile.resume_hash is None:
+                profile.resume_hash = store.put(session, profile.resume_data, 'application/pdf')
+                profile.resume_size = len(profile.resume_data)
+                profile.has_resume = True
+                profile.resume_data = None
+            if profile.avatar_data is not None and profile.avatar_hash is None:
+                profile.avatar_hash = store.put(session, profile.avatar_data, profile.avatar_mimetype)
+                profile.avatar_size = len(profile.avatar_data)
+                profile.has_avatar = True
+                profile.avatar_data = None
+        session.commit()
+        migrated += len(profiles)
+
+
+def init_blob_store(app):
+    app.config.setdefault('BLOB_STORE_PATH', os.getenv('BLOB_STORE_PATH'))
+    app.config.setdefault('BLOB_ZSTD_LEVEL', int(os.getenv('BLOB_ZSTD_LEVEL', 10)))
+    # nginx internal location aliased to BLOB_STORE_PATH; downloads become X-Accel-Redirects
+    app.config.setdefault('BLOB_ACCEL_REDIRECT', os.getenv('BLOB_ACCEL_REDIRECT'))
+
+    if app.config['BLOB_STORE_PATH']:
+        store = FileBlobStore(app.config['BLOB_STORE_PATH'], zstd_level=app.config['BLOB_ZSTD_LEVEL'])
+    else:
+        from app.models import Blob
+        store = DatabaseBlobStore(Blob, zstd_level=app.config['BLOB_ZSTD_LEVEL'])
+    app.extensions['blob_store'] = store
+    return store
+
+
+def get_blob_store():
+    from flask import current_app
+    return current_app.extensions['blob_store']
@@ -0,0 +1,194 @@
+"""
+Response cache with tag-based invalidation.
+
+Entries are stored with a set of tags (e.g. ``projects``, ``user:42``). Writes
+call ``invalidate_tags`` after they commit, which drops every entry carrying
+any of those tags.
+
+Backends:
+- ``LRUCache``: in-process, bounded, per-entry TTL. Default.
+- ``RedisCache``: shared across gunicorn workers; used when SEARCH_CACHE_URL
+  is set (needs the optional ``redis`` package).
+
+Both expose the same ``get`` / ``set`` / ``invalidate_tags`` / ``stats`` API,
+so anything with that shape can be dropped into ``app.extensions['search_cache']``.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+
+# Tags shared by the routes that read and write cached data
+PROJECTS_TAG = 'projects'
+
+
+def user_tag(user_id):
+    return f"user:{user_id}"
+
+
+class _Stats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with per-entry TTL and a tag index."""
+
+    def __init__(self, max_entries=1024, default_ttl=30):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags)
+        self._tags = {}                # tag -> set(keys)
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[1]
+
+    def set(self, key, value, tags=(), ttl=None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at, value, frozenset(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats.evictions += 1
+
+    def invalidate_tags(self, *tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self._stats.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'entries': len(self._entries),
+                    'max_entries': self.max_entries, **self._stats.as_dict()}
+
+    def _drop(self, key):
+        # Caller holds the lock
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCache:
+    """Shared cache in Redis; tags are Redis sets of member keys."""
+
+    def __init__(self, url, default_ttl=30, prefix='cache:'):
+        if redis is None:
+            raise RuntimeError("SEARCH_CACHE_URL is set but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        # Counters are per process; Redis INFO has the server-wide numbers
+        self._stats = _Stats()
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self._stats.misses += 1
+            return None
+        self._stats.hits += 1
+        return json.loads(raw)
+
+    def set(self, key, value, tags=(), ttl=None):
+        ttl = ttl or self.default_ttl
+        full_key = self.prefix + key
+        pipe = self.client.pipeline()
+        pipe.set(full_key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            pipe.sadd(tag_key, full_key)
+            pipe.expire(tag_key, ttl)
+        pipe.execute()
+
+    def invalidate_tags(self, *tags):
+        for tag in tags:
+            tag_key = f"{self.prefix}tag:{tag}"
+            keys = self.client.smembers(tag_key)
+            if keys:
+                self.client.delete(*keys)
+                self._stats.invalidations += len(keys)
+            self.client.delete(tag_key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self):
+        return {'backend': 'redis', **self._stats.as_dict()}
+
+
+def init_cache(app):
+    """Create the search cache from config and register it on the app."""
+    app.config.setdefault('SEARCH_CACHE_TTL', int(os.getenv('SEARCH_CACHE_TTL', 30)))
+    app.config.setdefault('SEARCH_CACHE_MAX_ENTRIES', int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 1024)))
+    app.config.setdefault('SEARCH_CACHE_URL', os.getenv('SEARCH_CACHE_URL'))
+
+    if app.config['SEARCH_CACHE_URL']:
+        cache = RedisCache(app.config['SEARCH_CACHE_URL'], default_ttl=app.config['SEARCH_CACHE_TTL'])
+    else:
+        cache = LRUCache(
+            max_entries=app.config['SEARCH_CACHE_MAX_ENTRIES'],
+            default_ttl=app.config['SEARCH_CACHE_TTL'],
+        )
+    app.extensions['search_cache'] = cache
+    return cache
+
+
+def get_cache():
+    from flask import current_app
+    return current_app.extensions['search_cache']
+
+
+def invalidate_tags(*tags):
+    """Drop cached responses carrying any of ``tags``. Call after the write commits."""
+    get_cache().invalidate_tags(*tags)
@@ -0,0 +1,116 @@
+"""
+Response compression (gzip, or brotli when the client accepts it and the
+optional ``brotli`` package is installed).
+
+An ``after_request`` hook compresses JSON/text bodies of at least
+COMPRESS_MIN_SIZE bytes; small bodies aren't worth the CPU. Streamed
+responses can't be measured up front, so they are always compressed, chunk by
+chunk, with each chunk flushed so the client sees rows as they're produced.
+Files from ``send_file`` (resumes, avatars) are left alone: PDFs and images
+are already compressed.
+"""
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'text/html', 'text/plain', 'text/css',
+    'text/javascript', 'application/javascript',
+}
+
+
+def _accepted_encodings(header):
+    """Encodings the client accepts (q > 0), from an Accept-Encoding header."""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def _choose_encoding(header):
+    accepted = _accepted_encodings(header)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def _compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)  # 31: gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks, encoding, config):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(config['COMPRESS_LEVEL'], zlib.DEFLATED, 31)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+def compress_response(response, accept_encoding, config):
+    if (
+        response.status_code < 200 or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        chunks = (chunk if isinstance(chunk, bytes) else chunk.encode() for chunk in response.response)
+        response.response = _compress_stream(chunks, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(_compress(data, encoding, config))
+
+    response.headers['Content-Encoding'] = encoding
+    # A strong ETag names exact bytes, so the compressed body gets its own
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f"{etag}-{encoding}")
+    return response
+
+
+def init_compression(app):
+    app.config.setdefault('COMPRESS_ENABLED', os.getenv('COMPRESS_ENABLED', 'true').lower() in ('true', '1', 'yes'))
+    app.config.setdefault('COMPRESS_MIN_SIZE', int(os.getenv('COMPRESS_MIN_SIZE', 1024)))
+    app.config.setdefault('COMPRESS_LEVEL', int(os.getenv('COMPRESS_LEVEL', 6)))
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', int(os.getenv('COMPRESS_BROTLI_QUALITY', 4)))
+    if not app.config['COMPRESS_ENABLED']:
+        return
+
+    from flask import request
+
+    @app.after_request
+    def _compress_after_request(response):
+        return compress_response(response, request.headers.get('Accept-Encoding'), app.config)
@@ -0,0 +1,89 @@
+"""
+Denormalized application counters on ``projects``.
+
+``application_count`` and the per-status counts are bumped with atomic
+``SET col = col + n`` UPDATEs inside the same transaction as the application
+write, so concurrent applies can't lose increments. ``reconcile_application_counts``
+recomputes them from the ``applications`` table to repair any drift (e.g. rows
+written outside the API).
+"""
+from sqlalchemy import case, func
+
+RECONCILE_BATCH_SIZE = 1000
+
+
+def status_columns(project_model):
+    return {
+        'pending': project_model.pending_count,
+        'accepted': project_model.accepted_count,
+        'rejected': project_model.rejected_count,
+    }
+
+
+def bump_application_counts(session, project_model, project_id: int, total: int = 0, **by_status):
+    """
+    Atomically add ``total`` to application_count and each ``by_status`` delta
+    to the matching per-status column, e.g. ``pending=-1, accepted=1``.
+    """
+    columns = status_columns(project_model)
+    values = {}
+    if total:
+        values[project_model.application_count] = project_model.application_count + total
+    for status, delta in by_status.items():
+        if delta and status in columns:
+            values[columns[status]] = columns[status] + delta
+    if values:
+        session.query(project_model).filter(project_model.id == project_id).update(
+            values, synchronize_session=False
+        )
+
+
+def reconcile_application_counts(session, project_model, application_model, batch_size=RECONCILE_BATCH_SIZE):
+    """
+    Recompute every project's counters from ``applications`` in id-ordered batches.
+
+    Returns:
+        Number of projects whose stored counters were wrong and got repaired.
+    """
+    status = application_model.status
+    repaired = 0
+    last_id = 0
+
+    while True:
+        projects = (
+            session.query(project_model)
+            .filter(project_model.id > last_id)
+            .order_by(project_model.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not projects:
+            break
+        ids = [p.id for p in projects]
+
+        actual = {
+            row[0]: row[1:]
+            for row in session.query(
+                application_model.project_id,
+                func.count(application_model.id),
+                func.sum(case((status == 'pending', 1), else_=0)),
+                func.sum(case((status == 'accepted', 1), else_=0)),
+                func.sum(case((status == 'rejected', 1), else_=0)),
+            )
+            .filter(application_model.project_id.in_(ids))
+            .group_by(application_model.project_id)
+        }
+
+        for project in projects:
+            counts = tuple(int(n or 0) for n in actual.get(project.id, (0, 0, 0, 0)))
+            stored = (project.application_count, project.pending_count,
+                      project.accepted_count, project.rejected_count)
+            if stored != counts:
+                (project.application_count, project.pending_count,
+                 project.accepted_count, project.rejected_count) = counts
+                repaired += 1
+
+        session.commit()
+        last_id = ids[-1]
+
+    return repaired
@@ -1,6 +1,10 @@
 """
 Email utility for sending emails via SMTP
 Supports Gmail, Outlook, and custom SMTP servers
+
+Routes don't send mail themselves: they queue it in the email outbox
+(app.utils.outbox) and a worker delivers it over one reused SMTPConnection.
+``send_email`` still sends a single message immediately.
 """
 import os
 import smtplib
@@ -8,6 +12,92 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
+
+def smtp_settings() -> dict:
+    """SMTP configuration from environment variables (see send_email)."""
+    smtp_user = os.getenv('SMTP_USER')
+    return {
+        'host': os.getenv('SMTP_HOST'),
+        'port': int(os.getenv('SMTP_PORT', 587)),
+        'user': smtp_user,
+        'password': os.getenv('SMTP_PASSWORD'),
+        'from_email': os.getenv('SMTP_FROM_EMAIL', smtp_user),
+        'from_name': os.getenv('SMTP_FROM_NAME', 'UofT Projects Club'),
+        # Off only for a local sink (e.g. `flask smtp-sink`), which has no TLS or auth
+        'starttls': os.getenv('SMTP_STARTTLS', 'true').lower() in ('true', '1', 'yes'),
+    }
+
+
+def smtp_configured(settings: dict) -> bool:
+    if not settings['starttls']:
+        return bool(settings['host'])
+    return all([settings['host'], settings['user'], settings['password']])
+
+
+def build_message(to_email: str, subject: str, body_html: str, body_text: Optional[str], settings: dict):
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = f"{settings['from_name']} <{settings['from_email']}>"
+    msg['To'] = to_email
+
+    # Add text and HTML parts
+    if body_text:
+        msg.attach(MIMEText(body_text, 'plain'))
+    msg.attach(MIMEText(body_html, 'html'))
+    return msg
+
+
+class SMTPConnection:
+    """
+    One SMTP session reused for many messages: connect, STARTTLS and login
+    happen once. A connection the server dropped is reopened on the next send.
+    """
+
+    def __init__(self, settings: Optional[dict] = None, timeout: float = 30):
+        self.settings = settings or smtp_settings()
+        self.timeout = timeout
+        self._server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(self.settings['host'], self.settings['port'], timeout=self.timeout)
+        try:
+            if self.settings['starttls']:
+                server.starttls()  # Secure the connection
+            if self.settings['user'] and self.settings['password']:
+                server.login(self.settings['user'], self.settings['password'])
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def send(self, to_email: str, subject: str, body_html: str, body_text: Optional[str] = None):
+        """Send one message; raises on failure (callers decide whether to retry)."""
+        msg = build_message(to_email, subject, body_html, body_text, self.settings)
+        if self._server is None:
+            self._connect()
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connections get dropped; retry once on a fresh one
+            self._server = None
+            self._connect()
+            self._server.send_message(msg)
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                self._server.close()
+            self._server = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 def send_email(
     to_email: str,
     subject: str,
@@ -24,6 +114,7 @@ def send_email(
     - SMTP_PASSWORD: SMTP password or app password
     - SMTP_FROM_EMAIL: Sender email address (optional, defaults to SMTP_USER)
     - SMTP_FROM_NAME: Sender name (optional, defaults to "Projects Club")
+    - SMTP_STARTTLS: "false" for a local sink without TLS/auth (optional)
     
     Args:
         to_email: Recipient email address
@@ -34,38 +125,16 @@ def send_email(
     Returns:
         True if email sent successfully, False otherwise
     """
-    smtp_host = os.getenv('SMTP_HOST')
-    smtp_port = int(os.getenv('SMTP_PORT', 587))
-    smtp_user = os.getenv('SMTP_USER')
-    smtp_password = os.getenv('SMTP_PASSWORD')
-    from_email = os.getenv('SMTP_FROM_EMAIL', smtp_user)
-    from_name = os.getenv('SMTP_FROM_NAME', 'UofT Projects Club')
-    
+    settings = smtp_settings()
+
     # Validate required config
-    if not all([smtp_host, smtp_user, smtp_password]):
+    if not smtp_configured(settings):
         print("ERROR: SMTP configuration missing. Set SMTP_HOST, SMTP_USER, and SMTP_PASSWORD in .env")
         return False
     
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = f"{from_name} <{from_email}>"
-        msg['To'] = to_email
-        
-        # Add text and HTML parts
-        if body_text:
-            part1 = MIMEText(body_text, 'plain')
-            msg.attach(part1)
-        
-        part2 = MIMEText(body_html, 'html')
-        msg.attach(part2)
-        
-        # Connect to SMTP server and send
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()  # Secure the connection
-            server.login(smtp_user, smtp_password)
-            server.send_message(msg)
+        with SMTPConnection(settings) as connection:
+            connection.send(to_email, subject, body_html, body_text)
         
         print(f"✅ Email sent successfully to {to_email}")
         return True
@@ -75,17 +144,16 @@ def send_email(
         return False
 
 
-def send_password_reset_email(to_email: str, reset_link: str, user_email: str) -> bool:
+def password_reset_email(reset_link: str, user_email: str):
     """
-    Send a password reset email
+    Build a password reset email
     
     Args:
-        to_email: Recipient email
         reset_link: Password reset link with token
         user_email: User's email (for reference)
     
     Returns:
-        True if sent successfully
+        (subject, body_html, body_text)
     """
     subject = "Reset Your Password - UofT Projects Club"
     
@@ -156,19 +224,18 @@ The Projects Club Team
 © 2025 UofT Projects Club. All rights reserved.
     """
     
-    return send_email(to_email, subject, body_html, body_text)
+    return subject, body_html, body_text
 
 
-def send_welcome_email(to_email: str, user_email: str) -> bool:
+def welcome_email(user_email: str):
     """
-    Send a welcome email to new users
+    Build a welcome email for new users
     
     Args:
-        to_email: Recipient email
         user_email: User's email
     
     Returns:
-        True if sent successfully
+        (subject, body_html, body_text)
     """
     subject = "Welcome to UofT Projects Club!"
     
@@ -232,4 +299,14 @@ See you around!
 The Projects Club Team
     """
     
-    return send_email(to_email, subject, body_html, body_text)
+    return subject, body_html, body_text
+
+
+def send_password_reset_email(to_email: str, reset_link: str, user_email: str) -> bool:
+    """Send a password reset email right away (routes queue it instead)"""
+    return send_email(to_email, *password_reset_email(reset_link, user_email))
+
+
+def send_welcome_email(to_email: str, user_email: str) -> bool:
+    """Send a welcome email right away (routes queue it instead)"""
+    return send_email(to_email, *welcome_email(user_email))
@@ -0,0 +1,111 @@
+"""
+Facet counts (projects per category / per skill) for the search page.
+
+Unfiltered facets are read from the precomputed ``facet_counts`` table, which
+project writes keep current with small +/- deltas. Filtered facets are computed
+on the fly in a single UNION ALL of two GROUP BYs over the filtered project set.
+"""
+import heapq
+from collections import Counter
+from sqlalchemy import func, literal
+from sqlalchemy.exc import IntegrityError
+
+CATEGORY = 'category'
+SKILL = 'skill'
+
+
+def project_facets(project):
+    """Counter of (facet, value) pairs a project contributes."""
+    values = Counter()
+    if project.category:
+        values[(CATEGORY, project.category)] += 1
+    for skill in project.skill_tags:
+        values[(SKILL, skill.name)] += 1
+    return values
+
+
+def apply_facet_delta(session, facet_model, before: Counter, after: Counter):
+    """Move the precomputed counts from ``before`` to ``after`` for one project write."""
+    delta = Counter(after)
+    delta.subtract(before)
+    for (facet, value), change in delta.items():
+        if change:
+            _bump(session, facet_model, facet, value, change)
+
+
+def _bump(session, facet_model, facet, value, change):
+    updated = (
+        session.query(facet_model)
+        .filter(facet_model.facet == facet, facet_model.value == value)
+        .update({facet_model.count: facet_model.count + change}, synchronize_session=False)
+    )
+    if updated or change < 0:
+        return
+    # First project with this value; savepoint so a concurrent insert can't abort the request
+    try:
+        with session.begin_nested():
+            session.add(facet_model(facet=facet, value=value, count=change))
+    except IntegrityError:
+        session.query(facet_model).filter(
+            facet_model.facet == facet, facet_model.value == value
+        ).update({facet_model.count: facet_model.count + change}, synchronize_session=False)
+
+
+def _shape(rows, top):
+    """Turn (facet, value, count) rows into the response dict, top-N skills first."""
+    categories, skills = [], []
+    for facet, value, count in rows:
+        if not count or value is None:
+            continue
+        (categories if facet == CATEGORY else skills).append({'value': value, 'count': int(count)})
+
+    # Highest count first, ties alphabetical
+    by_count = lambda item: (-item['count'], item['value'])
+    return {
+        'categories': sorted(categories, key=by_count),
+        'skills': heapq.nsmallest(top, skills, key=by_count),
+    }
+
+
+def precomputed_facets(session, facet_model, top: int):
+    rows = session.query(facet_model.facet, facet_model.value, facet_model.count).filter(facet_model.count > 0)
+    return _shape(rows, top)
+
+
+def filtered_facets(session, project_model, skill_model, project_skills, project_query, top: int):
+    """Facet counts over ``project_query`` (already filtered) in one round trip."""
+    by_category = (
+        project_query
+        .with_entities(literal(CATEGORY), project_model.category, func.count(project_model.id))
+        .order_by(None)
+        .group_by(project_model.category)
+    )
+    matching_ids = project_query.with_entities(project_model.id).order_by(None)
+    by_skill = (
+        session.query(literal(SKILL), skill_model.name, func.count(project_skills.c.project_id))
+        .join(project_skills, project_skills.c.skill_id == skill_model.id)
+        .filter(project_skills.c.project_id.in_(matching_ids))
+        .group_by(skill_model.name)
+    )
+    return _shape(by_category.union_all(by_skill).all(), top)
+
+
+def rebuild_facet_counts(session, facet_model, project_model, skill_model, project_skills):
+    """Recompute the whole ``facet_counts`` table from scratch. Returns rows written."""
+    session.query(facet_model).delete(synchronize_session=False)
+
+    rows = [
+        facet_model(facet=CATEGORY, value=category, count=count)
+        for category, count in session.query(project_model.category, func.count(project_model.id))
+        .filter(project_model.category.isnot(None))
+        .group_by(project_model.category)
+    ]
+    rows += [
+        facet_model(facet=SKILL, value=name, count=count)
+        for name, count in session.query(skill_model.name, func.count(project_skills.c.project_id))
+        .join(project_skills, project_skills.c.skill_id == skill_model.id)
+        .group_by(skill_model.name)
+    ]
+    session.add_all(rows)
+    session.commit()
+    return len(rows)
@@ -0,0 +1,85 @@
+"""
+ETags and conditional GET for read endpoints.
+
+A route computes its ETag from cheap version data (``updated_at`` columns,
+row counts, the request's own parameters) before it loads or serializes
+anything. If the client's If-None-Match already names that ETag the route
+answers 304 straight away; otherwise it builds the response as usual and
+passes it through ``cacheable``.
+
+Routes backed by the response cache (search) instead hash the response body
+and keep that ETag next to the cached payload. The cache is checked first, so
+a hit or a 304 costs no queries; the tag invalidation that drops a stale entry
+also retires its ETag.
+
+Cache-Control is set per route name. Defaults live in DEFAULT_CACHE_CONTROL;
+override one with app.config['CACHE_CONTROL'] = {'search': '...'} or the
+CACHE_CONTROL_<ROUTE> env var (e.g. CACHE_CONTROL_SEARCH='public, max-age=60').
+"""
+import hashlib
+import os
+from flask import current_app, request
+from sqlalchemy import func
+
+DEFAULT_CACHE_CONTROL = {
+    # Revalidate every time; a 304 costs one small query
+    'profile': 'public, no-cache',
+    'user_projects': 'public, no-cache',
+    # The URLs inside change whenever someone's avatar does
+    'avatars': 'public, no-cache',
+    'search': 'public, max-age=15, must-revalidate',
+    # Depends on who is asking while submissions are hidden
+    'htf': 'private, no-cache',
+}
+
+# Suffixes app.utils.compression adds to ETags of compressed bodies
+_ENCODING_SUFFIXES = ('', '-gzip', '-br')
+
+
+def make_etag(*parts):
+    """Strong ETag value (unquoted) from anything with a stable repr."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+
+
+def collection_version(query, updated_at_column):
+    """(row count, latest updated_at) of a query - changes when any row is added, edited or removed."""
+    count, latest = query.with_entities(func.count(), func.max(updated_at_column)).order_by(None).one()
+    return count, latest.isoformat() if latest else None
+
+
+def cache_control(route):
+    overrides = current_app.config.get('CACHE_CONTROL') or {}
+    if route in overrides:
+        return overrides[route]
+    return os.getenv(f"CACHE_CONTROL_{route.upper()}", DEFAULT_CACHE_CONTROL.get(route, 'no-cache'))
+
+
+def _matching_tag(etag):
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return None
+    if if_none_match.star_tag:
+        return etag
+    for suffix in _ENCODING_SUFFIXES:
+        if if_none_match.contains_weak(etag + suffix):
+            return etag + suffix
+    return None
+
+
+def not_modified(etag, route):
+    """A 304 response if the client already has ``etag``, else None."""
+    matched = _matching_tag(etag)
+    if matched is None:
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(matched)
+    response.headers['Cache-Control'] = cache_control(route)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def cacheable(response, etag, route):
+    """Attach the ETag and the route's Cache-Control to a full response."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control(route)
+    return response
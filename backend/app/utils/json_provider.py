@@ -0,0 +1,50 @@
+"""
+Flask JSON provider backed by orjson.
+
+``jsonify`` goes through ``app.json``; swapping in this provider makes every
+response encode with orjson, several times faster than the stdlib encoder on
+large lists. Responses are built straight from orjson's bytes, without the
+str round trip the default provider does.
+
+orjson is optional: ``init_json_provider`` leaves Flask's default provider in
+place when it isn't installed, or when JSON_ORJSON=false.
+"""
+import os
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    # Response dicts are built in a fixed order; sorting keys is wasted work
+    sort_keys = False
+
+    def _options(self, kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.pop('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.pop('indent', None):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options(kwargs)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self._app.debug if self.compact is None else not self.compact
+        body = orjson.dumps(obj, default=self.default, option=self._options({'indent': indent}))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    app.config.setdefault('JSON_ORJSON', os.getenv('JSON_ORJSON', 'true').lower() in ('true', '1', 'yes'))
+    if orjson is not None and app.config['JSON_ORJSON']:
+        app.json = OrjsonProvider(app)
+    return app.json
@@ -0,0 +1,213 @@
+"""
+Periodic housekeeping.
+
+Each ``Job`` has a name, an interval and a function ``fn(session) -> int``
+(rows/items it touched). ``run_due_jobs`` runs every job whose last start is
+older than its interval and records start/finish times, duration, result and
+error in ``maintenance_runs``; ``flask maintenance status`` prints them.
+
+Runs come from ``flask maintenance run`` (cron, or ``--loop`` as its own
+process; see the Procfile) or, with MAINTENANCE_THREAD=true, from a daemon
+thread in every app worker. Either way a pass first takes a session-level
+PostgreSQL advisory lock with ``pg_try_advisory_lock``: whoever gets it is the
+leader for that pass and everyone else skips it, so the jobs never run twice
+at once however many workers or cron hosts there are. Other databases have no
+such lock; there the caller is assumed to be the only runner.
+
+Jobs work in committed batches so they never hold long locks on a live
+database:
+
+- ``expire-reset-tokens`` deletes expired/used password reset tokens
+  (``password_reset_tokens.expires_at`` is indexed for this).
+- ``reconcile-counters`` repairs the denormalized project application counters.
+- ``gc-blobs`` deletes blobs no profile references any more. Uploads keep
+  running meanwhile: a blob stored again during the pass restarts its grace
+  period and is kept (see app.utils.blobs).
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+TOKEN_BATCH_SIZE = 1000
+BLOB_GRACE = timedelta(hours=1)
+# Arbitrary app-wide key for pg_try_advisory_lock
+ADVISORY_LOCK_KEY = 0x70726F6A
+
+
+class Job:
+    __slots__ = ('name', 'interval', 'fn')
+
+    def __init__(self, name, interval, fn):
+        self.name = name
+        self.interval = interval  # seconds between starts
+        self.fn = fn
+
+
+def expire_reset_tokens(session, token_model, batch_size=TOKEN_BATCH_SIZE):
+    """Delete expired or used reset tokens, one committed batch at a time. Returns rows deleted."""
+    stale = (token_model.expires_at < datetime.utcnow()) | (token_model.used == True)
+    deleted = 0
+    while True:
+        ids = [tid for (tid,) in session.query(token_model.id).filter(stale).limit(batch_size)]
+        if not ids:
+            return deleted
+        session.query(token_model).filter(token_model.id.in_(ids)).delete(synchronize_session=False)
+        session.commit()
+        deleted += len(ids)
+
+
+def _expire_reset_tokens(session):
+    from app.models import PasswordResetToken
+    return expire_reset_tokens(session, PasswordResetToken)
+
+
+def _reconcile_counters(session):
+    from app.models import Project, Application
+    from app.utils.counters import reconcile_application_counts
+    return reconcile_application_counts(session, Project, Application)
+
+
+def _gc_blobs(session):
+    from app.models import Profile, AvatarVariant
+    from app.utils.blobs import get_blob_store, collect_garbage, referenced_blob_hashes
+    referenced = referenced_blob_hashes(session, Profile, AvatarVariant)
+    return collect_garbage(session, get_blob_store(), referenced, grace=BLOB_GRACE)
+
+
+JOBS = (
+    Job('expire-reset-tokens', 3600, _expire_reset_tokens),
+    Job('reconcile-counters', 86400, _reconcile_counters),
+    Job('gc-blobs', 86400, _gc_blobs),
+)
+
+
+def get_job(name):
+    for job in JOBS:
+        if job.name == name:
+            return job
+    return None
+
+
+class leader_lock:
+    """
+    ``with leader_lock(engine) as leader:`` -- ``leader`` is True if this process
+    holds the maintenance advisory lock until the block exits (always True off
+    PostgreSQL). The lock lives on its own connection, so job commits don't drop it.
+    """
+
+    def __init__(self, engine, key=ADVISORY_LOCK_KEY):
+        self.engine = engine
+        self.key = key
+        self._connection = None
+
+    def __enter__(self):
+        if self.engine.dialect.name != 'postgresql':
+            return True
+        self._connection = self.engine.connect()
+        acquired = self._connection.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': self.key}).scalar()
+        if not acquired:
+            self._connection.close()
+            self._connection = None
+        return bool(acquired)
+
+    def __exit__(self, *exc):
+        if self._connection is not None:
+            try:
+                self._connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': self.key})
+            finally:
+                self._connection.close()  # closing the session releases it anyway
+                self._connection = None
+
+
+def run_job(session, run_model, job, log=print):
+    """Run ``job`` now and record its timing in ``run_model``. Returns the row."""
+    run = session.get(run_model, job.name) or run_model(job=job.name, run_count=0, error_count=0,
+                                                        total_duration_ms=0)
+    run.last_started_at = datetime.utcnow()
+    session.add(run)
+    session.commit()
+
+    start = time.perf_counter()
+    result, error = None, None
+    try:
+        result = job.fn(session)
+    except Exception as e:
+        session.rollback()
+        error = f"{type(e).__name__}: {e}"
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    run = session.get(run_model, job.name)
+    run.last_finished_at = datetime.utcnow()
+    run.last_duration_ms = duration_ms
+    run.last_result = result
+    run.last_error = error[:1000] if error else None
+    run.run_count += 1
+    run.error_count += 1 if error else 0
+    run.total_duration_ms += duration_ms
+    session.commit()
+    if error:
+        log(f"maintenance {job.name} failed after {duration_ms:.0f} ms: {error}")
+    else:
+        log(f"maintenance {job.name}: {result} in {duration_ms:.0f} ms")
+    return run
+
+
+def due_jobs(session, run_model, jobs=JOBS, now=None):
+    now = now or datetime.utcnow()
+    started = dict(session.query(run_model.job, run_model.last_started_at))
+    return [
+        job for job in jobs
+        if started.get(job.name) is None or now - started[job.name] >= timedelta(seconds=job.interval)
+    ]
+
+
+def run_due_jobs(session, engine, run_model, jobs=JOBS, force=False, log=print):
+    """
+    One maintenance pass: if this process wins the leader lock, run every due
+    job (every job in ``jobs`` with ``force``). Returns the jobs' run rows, or
+    None if another process is the leader.
+    """
+    with leader_lock(engine) as leader:
+        if not leader:
+            return None
+        todo = list(jobs) if force else due_jobs(session, run_model, jobs)
+        return [run_job(session, run_model, job, log=log) for job in todo]
+
+
+class MaintenanceThread(threading.Thread):
+    """Runs a maintenance pass every ``tick`` seconds inside an app context."""
+
+    def __init__(self, app, tick):
+        super().__init__(name='maintenance', daemon=True)
+        self.app = app
+        self.tick = tick
+        self._stop_event = threading.Event()
+
+    def run(self):
+        from app import db
+        from app.models import MaintenanceRun
+
+        while not self._stop_event.wait(self.tick):
+            with self.app.app_context():
+                try:
+                    run_due_jobs(db.session, db.engine, MaintenanceRun, log=self.app.logger.info)
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception('maintenance pass failed')
+                finally:
+                    db.session.remove()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def init_maintenance(app):
+    app.config.setdefault('MAINTENANCE_THREAD',
+                          os.getenv('MAINTENANCE_THREAD', 'false').lower() in ('true', '1', 'yes'))
+    app.config.setdefault('MAINTENANCE_TICK_SECONDS', float(os.getenv('MAINTENANCE_TICK_SECONDS', 60)))
+    if app.config['MAINTENANCE_THREAD']:
+        thread = MaintenanceThread(app, app.config['MAINTENANCE_TICK_SECONDS'])
+        app.extensions['maintenance_thread'] = thread
+        thread.start()
@@ -0,0 +1,176 @@
+"""
+Email outbox.
+
+Routes don't talk to the SMTP server: ``queue_email`` adds a row to
+``email_outbox`` in the request's own transaction, so signup or a password
+reset commits in milliseconds and the mail goes out only if the change did.
+``flask email-worker`` (a separate process; see the Procfile) delivers due
+rows in batches over one reused, authenticated SMTPConnection.
+
+A failed message is retried with exponential backoff (EMAIL_RETRY_BASE_SECONDS,
+doubling per attempt, capped at an hour) and marked 'failed' after
+EMAIL_MAX_ATTEMPTS.
+
+Several workers can share one outbox. A batch is claimed before anything is
+sent: each row's ``next_attempt_at`` is pushed CLAIM_SECONDS ahead by a
+conditional UPDATE (only if it's still due), committed straight away, so two
+workers can never claim the same message on any database; on PostgreSQL,
+FOR UPDATE SKIP LOCKED also keeps them from contending for the same rows.
+A batch can take longer to send than CLAIM_SECONDS (50 messages against a
+server that takes the full SMTP timeout on each), so just before each message
+goes out its claim is renewed, again conditionally: if the claim lapsed and
+another worker took the message, this worker skips it. Delivery is
+at-least-once: a worker killed mid-batch leaves its rows claimed, and they're
+resent once the claim lapses.
+
+EMAIL_OUTBOX=false sends immediately instead (no worker needed).
+"""
+import os
+import smtplib
+import time
+from datetime import datetime, timedelta
+
+MAX_RETRY_DELAY = 3600
+# How long a claim reserves a message; renewed per message, so it only has to
+# outlast one send (the SMTP timeout is 30 s)
+CLAIM_SECONDS = 300
+# The message itself was refused; the connection is still fine for the next one
+_MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError, smtplib.SMTPSenderRefused)
+
+
+def queue_email(session, outbox_model, to_email, subject, body_html, body_text=None):
+    """Add a message to the outbox. The caller commits (with whatever triggered it)."""
+    entry = outbox_model(to_email=to_email, subject=subject, body_html=body_html, body_text=body_text,
+                         status='pending', attempts=0, next_attempt_at=datetime.utcnow())
+    session.add(entry)
+    return entry
+
+
+def retry_delay(attempts, base):
+    """Seconds to wait after the ``attempts``-th failed attempt."""
+    return min(MAX_RETRY_DELAY, base * 2 ** (attempts - 1))
+
+
+def _claim_until(now):
+    return now + timedelta(seconds=CLAIM_SECONDS)
+
+
+def claim_batch(session, outbox_model, batch_size, now):
+    """Reserve up to ``batch_size`` due messages for this worker; returns them in send order."""
+    due = (outbox_model.status == 'pending') & (outbox_model.next_attempt_at <= now)
+    candidates = [
+        entry_id for (entry_id,) in
+        session.query(outbox_model.id).filter(due)
+        .order_by(outbox_model.next_attempt_at, outbox_model.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ]
+    claimed_until = _claim_until(now)
+    claimed = []
+    for entry_id in candidates:
+        # Matches nothing if another worker claimed it since we looked
+        if session.query(outbox_model).filter(outbox_model.id == entry_id, due).update(
+            {outbox_model.next_attempt_at: claimed_until}, synchronize_session=False
+        ):
+            claimed.append(entry_id)
+    session.commit()
+    if not claimed:
+        return []
+    entries = {e.id: e for e in session.query(outbox_model).filter(outbox_model.id.in_(claimed))}
+    return [entries[entry_id] for entry_id in claimed]
+
+
+def _move_claim(session, outbox_model, entry_id, held, until):
+    """Move this worker's claim on a message from ``held`` to ``until``; False if it isn't ours any more."""
+    return session.query(outbox_model).filter(
+        outbox_model.id == entry_id, outbox_model.status == 'pending', outbox_model.next_attempt_at == held
+    ).update({outbox_model.next_attempt_at: until}, synchronize_session=False) > 0
+
+
+def drain_outbox(session, outbox_model, connection, batch_size=50, max_attempts=8, retry_base=30):
+    """
+    Claim one batch of due messages, send it over ``connection`` and commit.
+    Returns (claimed, sent). Each message's claim is renewed (and the previous
+    message's outcome committed) just before it's sent; one whose claim was
+    lost to another worker is skipped. A connection-level error stops the
+    batch early; the messages it didn't reach are released, due again straight
+    away.
+    """
+    now = datetime.utcnow()
+    batch = claim_batch(session, outbox_model, batch_size, now)
+    held = _claim_until(now)
+    sent = 0
+    for position, entry in enumerate(batch):
+        renewed = _claim_until(datetime.utcnow())
+        owned = _move_claim(session, outbox_model, entry.id, held, renewed)
+        session.commit()
+        if not owned:
+            continue
+        entry.attempts += 1
+        try:
+            connection.send(entry.to_email, entry.subject, entry.body_html, entry.body_text)
+        except Exception as e:
+            entry.last_error = str(e)[:1000]
+            if entry.attempts >= max_attempts:
+                entry.status = 'failed'
+            else:
+                entry.next_attempt_at = now + timedelta(seconds=retry_delay(entry.attempts, retry_base))
+            if not isinstance(e, _MESSAGE_ERRORS):
+                # Server unreachable / auth failed: don't burn the rest of the batch's attempts
+                connection.close()
+                for unsent in batch[position + 1:]:
+                    _move_claim(session, outbox_model, unsent.id, held, now)
+                batch = batch[:position + 1]
+                break
+        else:
+            entry.status = 'sent'
+            entry.sent_at = datetime.utcnow()
+            entry.last_error = None
+            sent += 1
+    session.commit()
+    return len(batch), sent
+
+
+def run_outbox_worker(session, outbox_model, connection, config, once=False, log=print):
+    """Drain the outbox until interrupted (or until it's empty, with ``once``)."""
+    try:
+        while True:
+            claimed, sent = drain_outbox(
+                session, outbox_model, connection,
+                batch_size=config['EMAIL_BATCH_SIZE'],
+                max_attempts=config['EMAIL_MAX_ATTEMPTS'],
+                retry_base=config['EMAIL_RETRY_BASE_SECONDS'],
+            )
+            if claimed:
+                log(f"Sent {sent}/{claimed} queued email(s)")
+            if claimed == config['EMAIL_BATCH_SIZE']:
+                continue  # more may be waiting
+            if once:
+                return
+            # Don't hold an idle SMTP session open between polls
+            if not claimed:
+                connection.close()
+            time.sleep(config['EMAIL_POLL_SECONDS'])
+    finally:
+        connection.close()
+
+
+def deliver_email(to_email, subject, body_html, body_text=None):
+    """Queue a message in the outbox (or send it now when EMAIL_OUTBOX is off)."""
+    from flask import current_app
+    from app import db
+    from app.models import EmailOutbox
+    from app.utils.email import send_email
+
+    if not current_app.config['EMAIL_OUTBOX']:
+        return send_email(to_email, subject, body_html, body_text)
+    queue_email(db.session, EmailOutbox, to_email, subject, body_html, body_text)
+    return True
+
+
+def init_outbox(app):
+    app.config.setdefault('EMAIL_OUTBOX', os.getenv('EMAIL_OUTBOX', 'true').lower() in ('true', '1', 'yes'))
+    app.config.setdefault('EMAIL_BATCH_SIZE', int(os.getenv('EMAIL_BATCH_SIZE', 50)))
+    app.config.setdefault('EMAIL_MAX_ATTEMPTS', int(os.getenv('EMAIL_MAX_ATTEMPTS', 8)))
+    app.config.setdefault('EMAIL_RETRY_BASE_SECONDS', int(os.getenv('EMAIL_RETRY_BASE_SECONDS', 30)))
+    app.config.setdefault('EMAIL_POLL_SECONDS', float(os.getenv('EMAIL_POLL_SECONDS', 5)))
@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque url-safe token holding the sort mode and the sort key of
+the last row on the previous page, e.g. ``(created_at, id)``. The next page is
+a seek (``WHERE (created_at, id) < (:v, :id)``) on the matching composite index
+instead of an ever-growing OFFSET.
+"""
+import base64
+import json
+import time
+from datetime import datetime
+from sqlalchemy import text, tuple_
+
+# Seconds a cached COUNT(*) stays valid for total=approx
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+_count_cache = {}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _json_object_hook(obj):
+    if '$dt' in obj:
+        return datetime.fromisoformat(obj['$dt'])
+    return obj
+
+
+def encode_cursor(sort: str, values) -> str:
+    payload = json.dumps([sort, *values], default=_json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str, sort: str, size: int):
+    """
+    Decode a cursor made by ``encode_cursor``.
+
+    Raises:
+        ValueError: if the token is malformed, has the wrong arity, or was
+            issued for a different sort mode.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()), object_hook=_json_object_hook)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+
+    if not isinstance(payload, list) or len(payload) != size + 1 or payload[0] != sort:
+        raise ValueError("Cursor does not match this sort order")
+    return payload[1:]
+
+
+def apply_keyset(query, columns, descending: bool, values):
+    """Filter ``query`` to rows strictly after ``values`` in (columns) order."""
+    key = tuple_(*columns)
+    bound = tuple_(*values)
+    return query.filter(key < bound if descending else key > bound)
+
+
+def order_keyset(query, columns, descending: bool):
+    return query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+
+def estimate_table_rows(session, table_name: str):
+    """Planner row estimate for a whole table (Postgres only), else None."""
+    if session.get_bind().dialect.name != 'postgresql':
+        return None
+    estimate = session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+        {'name': table_name}
+    ).scalar()
+    # reltuples is -1 for tables that have never been analyzed
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def cached_count(key, query):
+    """Exact ``query.count()``, memoized per process for COUNT_CACHE_TTL seconds."""
+    now = time.monotonic()
+    hit = _count_cache.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.clear()
+    value = query.count()
+    _count_cache[key] = (now + COUNT_CACHE_TTL, value)
+    return value
@@ -0,0 +1,178 @@
+"""
+Password hashing off the request thread.
+
+werkzeug's scrypt/pbkdf2 are deliberately slow (hundreds of ms of CPU), so
+``PasswordHasher`` runs them in a small process pool: the request thread only
+waits on a future, the worker's other threads keep the GIL, and at most
+PASSWORD_HASH_WORKERS cores go to hashing however many logins arrive at once.
+Jobs beyond PASSWORD_HASH_MAX_QUEUE (running + waiting, counted until the
+pool actually finishes them) are refused straight away with ``HasherBusy``
+(a 503 with Retry-After) instead of piling up. If a pool process dies (OOM
+kill, crash) the pool is broken for good, so it is dropped and the job retried
+once on a fresh pool.
+
+This only pays off with threaded gunicorn workers (the Procfile runs
+``--worker-class gthread``): a sync worker serves one request at a time, so it
+would block on the future anyway and never queue more than one hash.
+
+The cost comes from PASSWORD_HASH_PROFILE (see COST_PROFILES) or an explicit
+werkzeug method string in PASSWORD_HASH_METHOD. Hashes record their own
+parameters, so old hashes keep verifying after a change; ``needs_rehash``
+tells login to upgrade them while it has the plain password.
+
+``init_password_hasher`` starts the pool while create_app runs, i.e. inside
+each gunicorn worker after it forks, and its processes are forked from that
+worker. That happens before any other thread exists (the avatar and
+maintenance threads start later in create_app, gunicorn's request threads
+after the app is loaded), so no lock another thread holds gets copied into
+the hashing processes. They only ever run werkzeug's hash functions. ('spawn'
+or 'forkserver' would re-import the entry script in every hashing process; for
+``python run.py`` that means a second create_app and migration run.) A pool
+inherited across a fork (gunicorn --preload) is dropped and rebuilt, as is a
+broken one; both are rebuilt by forking the running worker.
+PASSWORD_HASH_WORKERS=0 hashes inline (tests, single-process dev).
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# werkzeug method strings; 'default' is werkzeug's own default
+COST_PROFILES = {
+    'fast': 'scrypt:16384:8:1',      # dev/tests
+    'default': 'scrypt:32768:8:1',
+    'strong': 'scrypt:65536:8:1',
+}
+
+
+class HasherBusy(Exception):
+    """Too many password hashes queued; the client should retry shortly."""
+
+
+def _method_params(method):
+    """The parameter prefix a hash made with ``method`` starts with (e.g. 'scrypt:32768:8:1')."""
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+class PasswordHasher:
+    def __init__(self, method, workers=2, max_queue=32, timeout=10):
+        self.method = method
+        self.params = _method_params(method)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = None
+        self._pid = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password, password_hash):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if ``password_hash`` wasn't made with the current method/cost."""
+        return password_hash.split('$', 1)[0] != self.params
+
+    def stats(self):
+        return {'workers': self.workers, 'pending': self._pending, 'max_queue': self.max_queue,
+                'method': self.params}
+
+    def start(self):
+        """Fork the pool's processes now (the fork start method launches them all on the first job)."""
+        if self.workers:
+            self._run(int)
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        try:
+            return self._submit(fn, *args)
+        except BrokenProcessPool:
+            pass  # a pool process died (OOM kill, crash); _submit dropped the pool
+        try:
+            return self._submit(fn, *args)
+        except BrokenProcessPool:
+            raise HasherBusy()
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_queue:
+                raise HasherBusy()
+            if self._pid != os.getpid():
+                self._executor = None  # inherited from the parent; its threads didn't come along
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('fork')
+                )
+                self._pid = os.getpid()
+            executor = self._executor
+            try:
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._discard(executor)
+                raise
+            self._pending += 1
+        # Released when the pool is done with it, not when this request gives up
+        future.add_done_callback(self._finished)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()  # drops it if still queued; a running hash stays counted
+            raise HasherBusy()
+        except BrokenProcessPool:
+            with self._lock:
+                self._discard(executor)
+            raise
+
+    def _discard(self, executor):
+        """Drop a broken pool (call with the lock held) so the next job builds a new one."""
+        if self._executor is executor:
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def init_password_hasher(app):
+    app.config.setdefault('PASSWORD_HASH_PROFILE', os.getenv('PASSWORD_HASH_PROFILE', 'default'))
+    app.config.setdefault('PASSWORD_HASH_METHOD', os.getenv('PASSWORD_HASH_METHOD'))
+    app.config.setdefault('PASSWORD_HASH_WORKERS', int(os.getenv('PASSWORD_HASH_WORKERS', 2)))
+    app.config.setdefault('PASSWORD_HASH_MAX_QUEUE', int(os.getenv('PASSWORD_HASH_MAX_QUEUE', 32)))
+    app.config.setdefault('PASSWORD_HASH_TIMEOUT', float(os.getenv('PASSWORD_HASH_TIMEOUT', 10)))
+
+    method = app.config['PASSWORD_HASH_METHOD'] or COST_PROFILES[app.config['PASSWORD_HASH_PROFILE']]
+    hasher = PasswordHasher(
+        method,
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_queue=app.config['PASSWORD_HASH_MAX_QUEUE'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT'],
+    )
+    app.extensions['password_hasher'] = hasher
+    hasher.start()  # before create_app starts any thread
+
+    from flask import jsonify
+
+    @app.errorhandler(HasherBusy)
+    def _hasher_busy(error):
+        response = jsonify({"error": "Server is busy, please try again in a moment"})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    return hasher
+
+
+def get_password_hasher():
+    from flask import current_app
+    return current_app.extensions['password_hasher']
@@ -0,0 +1,245 @@
+"""
+Rate-limit storage shared by every worker process on one host.
+
+Flask-Limiter's default ``memory://`` storage lives inside each gunicorn
+worker, so a "5/minute" limit really allowed 5 per minute per worker.
+``SharedMemoryStorage`` (``shm://<path>``) keeps the counters in a small
+memory-mapped file instead: every worker maps the same pages, so a check is a
+hash lookup in shared memory under an exclusive ``flock`` (plus a thread lock,
+since flock doesn't exclude threads sharing a file descriptor). Nothing is
+written to disk on the request path beyond what the kernel chooses to flush,
+and no external service is needed. Workers on *different* hosts don't share
+the file; a multi-host deployment should point RATELIMIT_STORAGE_URI at Redis
+instead.
+
+The file is an open-addressing hash table of RATELIMIT_SHM_SLOTS fixed-size
+slots ``(key hash, count, expires at)``. Keys are identified by an 8-byte
+BLAKE2b digest; lookups probe at most ``MAX_PROBE`` slots, and when all of them
+hold live counters the one expiring soonest is evicted (the table is sized so
+that only happens under a flood of distinct keys).
+
+It supports Flask-Limiter's fixed-window and sliding-window-counter strategies;
+the sliding window check-and-increment runs under a single lock, so concurrent
+workers can't both squeeze in the last hit.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from math import floor
+from urllib.parse import urlparse
+from limits.storage import Storage, SlidingWindowCounterSupport
+from limits.storage.base import TimestampedSlidingWindow
+
+try:
+    import fcntl
+except ImportError:  # Windows: counters are then only shared between threads
+    fcntl = None
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), 'projects-club-ratelimit')
+DEFAULT_SLOTS = 65536
+MAX_PROBE = 32
+
+_MAGIC = b'RLSHM001'
+_HEADER = struct.Struct('<8sQ')     # magic, slot count
+_SLOT = struct.Struct('<Qqd')       # key hash, count, expires at (epoch seconds)
+
+
+def _key_hash(key):
+    # 0 marks a never-used slot
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+
+
+class SharedMemoryStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """limits storage over a memory-mapped counter table; URI ``shm://<path>``."""
+
+    STORAGE_SCHEME = ['shm']
+
+    def __init__(self, uri=None, wrap_exceptions=False, slots=DEFAULT_SLOTS, **options):
+        self.path = (urlparse(uri).path if uri else '') or DEFAULT_PATH
+        self.slots = int(slots)
+        self.size = _HEADER.size + self.slots * _SLOT.size
+        self._pid = None
+        self._open()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    def _open(self):
+        self._pid = os.getpid()
+        self._thread_lock = threading.Lock()
+        self._file = open(self.path, 'a+b')
+        self._flock()
+        try:
+            if os.fstat(self._file.fileno()).st_size != self.size:
+                self._file.truncate(self.size)
+            self._map = mmap.mmap(self._file.fileno(), self.size)
+            magic, slots = _HEADER.unpack_from(self._map, 0)
+            if (magic, slots) != (_MAGIC, self.slots):
+                self._map[:] = bytes(self.size)
+                _HEADER.pack_into(self._map, 0, _MAGIC, self.slots)
+        finally:
+            self._funlock()
+
+    def _flock(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+    def _funlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _locked(self, fn, *args):
+        if os.getpid() != self._pid:
+            # Forked (e.g. gunicorn --preload): flock is per open file, so get our own
+            self._map.close()
+            self._file.close()
+            self._open()
+        with self._thread_lock:
+            self._flock()
+            try:
+                return fn(*args)
+            finally:
+                self._funlock()
+
+    # -- slot table (call with the lock held) ------------------------------
+
+    def _offset(self, index):
+        return _HEADER.size + index * _SLOT.size
+
+    def _find(self, key, now, create):
+        """Offset of ``key``'s live slot (None if absent and not ``create``)."""
+        digest = _key_hash(key)
+        start = digest % self.slots
+        reusable = None
+        oldest = None
+        for probe in range(MAX_PROBE):
+            offset = self._offset((start + probe) % self.slots)
+            slot_hash, count, expires_at = _SLOT.unpack_from(self._map, offset)
+            if slot_hash == digest:
+                if expires_at > now:
+                    return offset
+                reusable = offset if reusable is None else reusable
+                break
+            if slot_hash == 0 or expires_at <= now:
+                if reusable is None:
+                    reusable = offset
+                if slot_hash == 0:
+                    break  # end of this key's probe chain
+            elif oldest is None or expires_at < oldest[1]:
+                oldest = (offset, expires_at)
+        if not create:
+            return None
+        offset = reusable if reusable is not None else oldest[0]
+        _SLOT.pack_into(self._map, offset, digest, 0, 0.0)
+        return offset
+
+    def _incr(self, key, expiry, amount, now):
+        offset = self._find(key, now, create=True)
+        _, count, expires_at = _SLOT.unpack_from(self._map, offset)
+        if count == 0 and expires_at <= now:
+            expires_at = now + expiry
+        count += amount
+        _SLOT.pack_into(self._map, offset, _key_hash(key), count, expires_at)
+        return count
+
+    def _read(self, key, now):
+        """(count, expires at) of a live counter, else (0, None)."""
+        offset = self._find(key, now, create=False)
+        if offset is None:
+            return 0, None
+        _, count, expires_at = _SLOT.unpack_from(self._map, offset)
+        return count, expires_at
+
+    def _clear(self, key, now):
+        offset = self._find(key, now, create=False)
+        if offset is not None:
+            # Keep the hash so later slots in the probe chain stay reachable
+            _SLOT.pack_into(self._map, offset, _key_hash(key), 0, 0.0)
+
+    def _reset(self, now):
+        live = 0
+        for index in range(self.slots):
+            slot_hash, _, expires_at = _SLOT.unpack_from(self._map, self._offset(index))
+            live += slot_hash != 0 and expires_at > now
+        self._map[_HEADER.size:] = bytes(self.size - _HEADER.size)
+        return live
+
+    # -- limits Storage API ------------------------------------------------
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ValueError)
+
+    def incr(self, key, expiry, amount=1):
+        return self._locked(self._incr, key, expiry, amount, time.time())
+
+    def decr(self, key, amount=1):
+        def decr(now):
+            offset = self._find(key, now, create=False)
+            if offset is None:
+                return 0
+            slot_hash, count, expires_at = _SLOT.unpack_from(self._map, offset)
+            count = max(count - amount, 0)
+            _SLOT.pack_into(self._map, offset, slot_hash, count, expires_at)
+            return count
+        return self._locked(decr, time.time())
+
+    def get(self, key):
+        return self._locked(self._read, key, time.time())[0]
+
+    def get_expiry(self, key):
+        now = time.time()
+        expires_at = self._locked(self._read, key, now)[1]
+        return expires_at if expires_at is not None else now
+
+    def clear(self, key):
+        self._locked(self._clear, key, time.time())
+
+    def check(self):
+        return not self._map.closed
+
+    def reset(self):
+        return self._locked(self._reset, time.time())
+
+    # -- sliding window counter ----------------------------------------
+
+    def _window(self, key, expiry, now):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count, _ = self._read(previous_key, now)
+        current_count, _ = self._read(current_key, now)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+
+        def acquire(now):
+            previous_count, previous_ttl, current_count, _ = self._window(key, expiry, now)
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            # Twice the window: the counter is still needed as "previous" in the next window
+            self._incr(self.sliding_window_keys(key, expiry, now)[1], 2 * expiry, amount, now)
+            return True
+        return self._locked(acquire, time.time())
+
+    def get_sliding_window(self, key, expiry):
+        return self._locked(self._window, key, expiry, time.time())
+
+    def clear_sliding_window(self, key, expiry):
+        def clear(now):
+            for window_key in self.sliding_window_keys(key, expiry, now):
+                self._clear(window_key, now)
+        self._locked(clear, time.time())
+
+
+def init_rate_limits(app):
+    """Storage/strategy defaults for Flask-Limiter; call before ``limiter.init_app``."""
+    app.config.setdefault('RATELIMIT_STORAGE_URI', os.getenv('RATELIMIT_STORAGE_URI', f"shm://{DEFAULT_PATH}"))
+    app.config.setdefault('RATELIMIT_STRATEGY', os.getenv('RATELIMIT_STRATEGY', 'sliding-window-counter'))
+    if app.config['RATELIMIT_STORAGE_URI'].startswith('shm:'):
+        app.config.setdefault('RATELIMIT_STORAGE_OPTIONS',
+                              {'slots': int(os.getenv('RATELIMIT_SHM_SLOTS', DEFAULT_SLOTS))})
@@ -0,0 +1,154 @@
+"""
+Skill-match project recommendations.
+
+Projects are rows of a sparse project x skill matrix (CSR), weighted by IDF so
+rare skills count for more than ubiquitous ones, and L2-normalized per row.
+Scoring every project for a user is one sparse matrix-vector product with the
+user's binary skill vector; the top k come from ``np.argpartition``.
+
+Writes don't rebuild the matrix. Changed/deleted projects go into a small
+pending overlay that is masked out of the matrix scores and scored directly;
+the matrix is rebuilt once the overlay grows past RECOMMEND_MAX_PENDING or
+RECOMMEND_REBUILD_SECONDS have passed (which also picks up other workers' writes).
+"""
+import math
+import os
+import threading
+import time
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+
+
+class Recommender:
+    def __init__(self, rebuild_seconds=300, max_pending=256):
+        self.rebuild_seconds = rebuild_seconds
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._matrix = sparse.csr_matrix((0, 0))
+        self._project_ids = np.zeros(0, dtype=np.int64)
+        self._owner_ids = np.zeros(0, dtype=np.int64)
+        self._row_of = {}
+        self._col_of = {}
+        self._idf = np.zeros(0)
+        self._pending = {}  # project_id -> (owner_id, frozenset(skill_ids)) or None if deleted
+
+    def rebuild(self, session, project_model, project_skills):
+        with self._lock:
+            pending_at_start = dict(self._pending)
+
+        projects = session.execute(
+            select(project_model.id, project_model.owner_id).order_by(project_model.id)
+        ).all()
+        links = session.execute(select(project_skills.c.project_id, project_skills.c.skill_id)).all()
+
+        project_ids = np.fromiter((p[0] for p in projects), dtype=np.int64, count=len(projects))
+        owner_ids = np.fromiter((p[1] for p in projects), dtype=np.int64, count=len(projects))
+        row_of = {int(pid): i for i, pid in enumerate(project_ids)}
+        col_of = {sid: j for j, sid in enumerate(sorted({s for _, s in links}))}
+
+        links = [(p, s) for p, s in links if p in row_of]
+        rows = np.fromiter((row_of[p] for p, _ in links), dtype=np.int64, count=len(links))
+        cols = np.fromiter((col_of[s] for _, s in links), dtype=np.int64, count=len(links))
+        n_projects, n_skills = len(project_ids), len(col_of)
+
+        # IDF: a skill on every project says little about fit
+        df = np.bincount(cols, minlength=n_skills)
+        idf = np.log((n_projects + 1) / (df + 1)) + 1.0
+        matrix = sparse.csr_matrix((idf[cols], (rows, cols)), shape=(n_projects, n_skills))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix = sparse.diags(1.0 / norms) @ matrix
+
+        with self._lock:
+            self._matrix = matrix.tocsr()
+            self._project_ids, self._owner_ids = project_ids, owner_ids
+            self._row_of, self._col_of, self._idf = row_of, col_of, idf
+            # Keep overlay entries written while the build was reading
+            self._pending = {
+                pid: entry for pid, entry in self._pending.items()
+                if pid not in pending_at_start or pending_at_start[pid] is not entry
+            }
+            self._built_at = time.monotonic()
+
+    def is_stale(self):
+        return (
+            self._built_at is None
+            or time.monotonic() - self._built_at > self.rebuild_seconds
+            or len(self._pending) > self.max_pending
+        )
+
+    def mark_changed(self, project_id, owner_id, skill_ids):
+        with self._lock:
+            self._pending[project_id] = (owner_id, frozenset(skill_ids))
+
+    def mark_deleted(self, project_id):
+        with self._lock:
+            self._pending[project_id] = None
+
+    def _overlay_score(self, skill_ids, user_skill_ids):
+        """Score a pending project the same way its matrix row would be scored."""
+        if not skill_ids:
+            return 0.0
+        # Skills new since the last build count as maximally rare
+        rare = math.log(len(self._project_ids) + 1) + 1.0
+        weights = {
+            s: (self._idf[self._col_of[s]] if s in self._col_of else rare) for s in skill_ids
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        matched = sum(w for s, w in weights.items() if s in user_skill_ids)
+        return float(matched / norm)
+
+    def recommend(self, user_skill_ids, exclude_owner_id, exclude_project_ids, k):
+        """
+        Returns:
+            Up to ``k`` (project_id, score) pairs with score > 0, best first.
+        """
+        user_skill_ids = set(user_skill_ids)
+        with self._lock:
+            user_cols = {self._col_of[s] for s in user_skill_ids if s in self._col_of}
+            candidates = []
+
+            if user_cols and len(self._project_ids):
+                user_vector = np.zeros(self._matrix.shape[1])
+                user_vector[list(user_cols)] = 1.0
+                scores = self._matrix @ user_vector
+
+                scores[self._owner_ids == exclude_owner_id] = 0.0
+                for pid in set(exclude_project_ids) | self._pending.keys():
+                    row = self._row_of.get(pid)
+                    if row is not None:
+                        scores[row] = 0.0
+
+                top = min(k, len(scores))
+                best = np.argpartition(-scores, top - 1)[:top]
+                candidates = [
+                    (int(self._project_ids[i]), float(scores[i])) for i in best if scores[i] > 0
+                ]
+
+            for pid, entry in self._pending.items():
+                if entry is None or pid in exclude_project_ids or entry[0] == exclude_owner_id:
+                    continue
+                score = self._overlay_score(entry[1], user_skill_ids)
+                if score > 0:
+                    candidates.append((pid, score))
+
+        candidates.sort(key=lambda item: (-item[1], -item[0]))
+        return candidates[:k]
+
+
+def init_recommender(app):
+    app.config.setdefault('RECOMMEND_REBUILD_SECONDS', int(os.getenv('RECOMMEND_REBUILD_SECONDS', 300)))
+    app.config.setdefault('RECOMMEND_MAX_PENDING', int(os.getenv('RECOMMEND_MAX_PENDING', 256)))
+    recommender = Recommender(
+        rebuild_seconds=app.config['RECOMMEND_REBUILD_SECONDS'],
+        max_pending=app.config['RECOMMEND_MAX_PENDING'],
+    )
+    app.extensions['recommender'] = recommender
+    return recommender
+
+
+def get_recommender():
+    from flask import current_app
+    return current_app.extensions['recommender']
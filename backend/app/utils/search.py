@@ -0,0 +1,109 @@
+"""
+Full-text search for projects.
+
+- PostgreSQL: a generated ``projects.search_vector`` tsvector column (title
+  weighted above description) with a GIN index. Postgres keeps it current on
+  every INSERT/UPDATE, so routes never have to touch it.
+- SQLite (local/dev): an external-content FTS5 table ``projects_fts`` kept in
+  sync with ``projects`` by triggers.
+- Any other backend falls back to the old ILIKE scan.
+"""
+import re
+from sqlalchemy import DDL, event, func, literal_column, or_, table, column
+
+# Max tokens taken from a query string; keeps pathological inputs cheap
+MAX_TOKENS = 16
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+POSTGRES_DDL = [
+    """
+    ALTER TABLE projects ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_projects_search_vector ON projects USING GIN (search_vector)",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, description, content='projects', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF title, description ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+_projects_fts = table('projects_fts', column('rowid'))
+
+
+def register_search_ddl(projects_table):
+    """Attach the per-dialect search DDL so ``db.create_all()`` builds it too."""
+    for statement in POSTGRES_DDL:
+        event.listen(projects_table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    for statement in SQLITE_DDL:
+        event.listen(projects_table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+
+
+def tokenize(keyword: str):
+    """Split a raw search string into lowercase word tokens."""
+    return _TOKEN_RE.findall(keyword.lower())[:MAX_TOKENS]
+
+
+def apply_keyword_search(query, model, keyword: str, dialect: str):
+    """
+    Filter ``query`` down to projects matching ``keyword``.
+
+    Every token is prefix-matched (so partially typed words still hit) and all
+    tokens must match.
+
+    Returns:
+        (query, rank) where ``rank`` is a SQL expression to sort on with
+        ``.desc()`` (higher is a better match), or None when the backend has no
+        ranking and the ILIKE fallback was used.
+    """
+    tokens = tokenize(keyword)
+
+    if tokens and dialect == 'postgresql':
+        tsquery = func.to_tsquery('english', ' & '.join(f'{t}:*' for t in tokens))
+        vector = literal_column('projects.search_vector')
+        query = query.filter(vector.op('@@')(tsquery))
+        return query, func.ts_rank_cd(vector, tsquery)
+
+    if tokens and dialect == 'sqlite':
+        match = ' '.join(f'"{t}"*' for t in tokens)
+        fts = literal_column('projects_fts')
+        query = query.join(_projects_fts, _projects_fts.c.rowid == model.id).filter(fts.op('MATCH')(match))
+        # bm25() is "lower is better"; negate it so callers always sort desc.
+        # Title matches weigh 10x description matches.
+        return query, -func.bm25(fts, 10.0, 1.0)
+
+    search_pattern = f"%{keyword}%"
+    query = query.filter(
+        or_(
+            model.title.ilike(search_pattern),
+            model.description.ilike(search_pattern)
+        )
+    )
+    return query, None
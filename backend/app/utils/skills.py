@@ -0,0 +1,144 @@
+"""
+Skill tag normalization and lookup.
+
+Projects and profiles still keep the free-text ``skills`` string the user typed
+(that is what the UI displays), but every write also syncs a normalized set of
+``Skill`` rows through the ``project_skills`` / ``profile_skills`` association
+tables. Filtering goes through those indexed tables instead of ILIKE, so
+"Java" no longer matches "JavaScript".
+"""
+import re
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+# Lowercased alias -> canonical display name
+SKILL_ALIASES = {
+    'js': 'JavaScript',
+    'javascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'typescript': 'TypeScript',
+    'py': 'Python',
+    'python3': 'Python',
+    'golang': 'Go',
+    'cpp': 'C++',
+    'c plus plus': 'C++',
+    'csharp': 'C#',
+    'c sharp': 'C#',
+    'react.js': 'React',
+    'reactjs': 'React',
+    'react native': 'React Native',
+    'node': 'Node.js',
+    'nodejs': 'Node.js',
+    'node js': 'Node.js',
+    'vue.js': 'Vue',
+    'vuejs': 'Vue',
+    'next.js': 'Next.js',
+    'nextjs': 'Next.js',
+    'postgres': 'PostgreSQL',
+    'postgresql': 'PostgreSQL',
+    'psql': 'PostgreSQL',
+    'mongo': 'MongoDB',
+    'mongodb': 'MongoDB',
+    'ml': 'Machine Learning',
+    'machine learning': 'Machine Learning',
+    'dl': 'Deep Learning',
+    'deep learning': 'Deep Learning',
+    'ai': 'AI',
+    'nlp': 'NLP',
+    'cv': 'Computer Vision',
+    'k8s': 'Kubernetes',
+    'aws': 'AWS',
+    'gcp': 'Google Cloud',
+    'html5': 'HTML',
+    'css3': 'CSS',
+    'tailwindcss': 'Tailwind CSS',
+    'tailwind': 'Tailwind CSS',
+    'ui/ux': 'UI/UX',
+    'ux/ui': 'UI/UX',
+}
+
+MAX_SKILL_LENGTH = 64
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_skill(raw: str):
+    """
+    Canonicalize a single skill name.
+
+    Returns:
+        (slug, name) where ``slug`` is the lowercase lookup key and ``name`` the
+        display form, or None if ``raw`` is blank.
+    """
+    cleaned = _WHITESPACE_RE.sub(' ', (raw or '').strip())[:MAX_SKILL_LENGTH]
+    if not cleaned:
+        return None
+    name = SKILL_ALIASES.get(cleaned.lower(), cleaned)
+    return name.lower(), name
+
+
+def parse_skills(csv: str):
+    """Parse a comma-separated skills string into ordered, de-duplicated (slug, name) pairs."""
+    seen = {}
+    for part in (csv or '').split(','):
+        normalized = normalize_skill(part)
+        if normalized and normalized[0] not in seen:
+            seen[normalized[0]] = normalized[1]
+    return list(seen.items())
+
+
+def get_or_create_skills(session, skill_model, pairs):
+    """Resolve (slug, name) pairs to Skill rows with one lookup, inserting any new ones."""
+    if not pairs:
+        return []
+
+    slugs = [slug for slug, _ in pairs]
+    existing = {
+        skill.slug: skill
+        for skill in session.query(skill_model).filter(skill_model.slug.in_(slugs))
+    }
+
+    for slug, name in pairs:
+        if slug in existing:
+            continue
+        # Savepoint so a concurrent insert of the same skill doesn't abort the outer transaction
+        try:
+            with session.begin_nested():
+                skill = skill_model(slug=slug, name=name)
+                session.add(skill)
+            existing[slug] = skill
+        except IntegrityError:
+            existing[slug] = session.query(skill_model).filter_by(slug=slug).one()
+
+    return [existing[slug] for slug in slugs]
+
+
+def sync_skill_tags(session, skill_model, obj, csv: str):
+    """Point ``obj.skill_tags`` at the normalized skills in ``csv``."""
+    obj.skill_tags = get_or_create_skills(session, skill_model, parse_skills(csv))
+
+
+def skill_slugs(csv: str):
+    """Lookup keys for a comma-separated filter string."""
+    return [slug for slug, _ in parse_skills(csv)]
+
+
+def matching_ids_query(assoc_table, owner_column: str, skill_model, slugs, match_all=False):
+    """
+    Build a SELECT of owner ids (project_id / profile_id) tagged with the given skills.
+
+    ``match_all=False`` returns owners with any of the skills, ``True`` only
+    owners with every one of them. Both are served by the (skill_id, owner_id)
+    index on the association table.
+    """
+    owner_col = assoc_table.c[owner_column]
+    stmt = (
+        select(owner_col)
+        .join(skill_model, skill_model.id == assoc_table.c.skill_id)
+        .where(skill_model.slug.in_(slugs))
+    )
+    if match_all:
+        stmt = stmt.group_by(owner_col).having(func.count(assoc_table.c.skill_id) == len(slugs))
+    else:
+        stmt = stmt.distinct()
+    return stmt
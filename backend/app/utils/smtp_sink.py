@@ -0,0 +1,116 @@
+"""
+Local stand-in SMTP server for development and tests.
+
+Accepts any message without TLS or auth and keeps it in ``messages`` instead of
+delivering it. Point the app at it with SMTP_HOST=localhost, SMTP_PORT=<port>,
+SMTP_STARTTLS=false, or run ``flask smtp-sink`` to print incoming mail.
+
+    with SMTPSink() as sink:            # picks a free port
+        ...send to sink.port...
+        sink.messages[0].subject
+"""
+import socketserver
+import threading
+from email import message_from_bytes, policy
+
+
+class SinkMessage:
+    __slots__ = ('mail_from', 'recipients', 'data', 'message')
+
+    def __init__(self, mail_from, recipients, data):
+        self.mail_from = mail_from
+        self.recipients = recipients
+        self.data = data
+        self.message = message_from_bytes(data, policy=policy.default)
+
+    @property
+    def subject(self):
+        return self.message['Subject']
+
+    @property
+    def to(self):
+        return self.message['To']
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        mail_from, recipients = None, []
+        self.reply('220 smtp-sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb, _, arg = line.decode('utf-8', 'replace').strip().partition(' ')
+            verb = verb.upper()
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 smtp-sink')
+            elif verb == 'MAIL':
+                mail_from, recipients = arg.partition(':')[2].strip(' <>'), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(arg.partition(':')[2].strip(' <>'))
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line in (b'.\r\n', b'.\n'):
+                        break
+                    # Undo dot-stuffing
+                    lines.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                self.server.sink.received(SinkMessage(mail_from, recipients, b''.join(lines)))
+                self.reply('250 OK: queued')
+            elif verb == 'RSET':
+                mail_from, recipients = None, []
+                self.reply('250 OK')
+            elif verb == 'NOOP':
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SMTPSink:
+    def __init__(self, host='127.0.0.1', port=0, on_message=None):
+        self.messages = []
+        self.on_message = on_message
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _SMTPHandler)
+        self._server.sink = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+
+    def received(self, message):
+        with self._lock:
+            self.messages.append(message)
+        if self.on_message:
+            self.on_message(message)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='smtp-sink', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
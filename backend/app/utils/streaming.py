@@ -0,0 +1,63 @@
+"""
+Streamed list responses for endpoints that can return unbounded collections.
+
+Clients opt in with ``?stream=ndjson`` (one JSON object per line; also chosen
+by ``Accept: application/x-ndjson``) or ``?stream=json`` (the usual JSON
+document, written incrementally). Rows come from the database with
+``yield_per``, which uses a server-side cursor where the driver supports it,
+and are encoded a batch at a time, so memory stays flat however many rows
+there are.
+"""
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON = 'ndjson'
+JSON = 'json'
+STREAM_BATCH_SIZE = 500
+
+
+def requested_stream_mode():
+    """'ndjson', 'json', or None for a normal buffered response."""
+    mode = request.args.get('stream', '').lower()
+    if mode in (NDJSON, JSON):
+        return mode
+    if request.accept_mimetypes.best == 'application/x-ndjson':
+        return NDJSON
+    return None
+
+
+def _batches(session, statement, serializer, batch_size):
+    result = session.execute(statement.execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield serializer.many(partition)
+    finally:
+        result.close()
+
+
+def stream_rows(session, statement, serializer, mode, prefix=None, suffix=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    Stream the rows of ``statement`` through ``serializer``.
+
+    In json mode the rows form an array, wrapped in ``prefix``/``suffix``
+    (e.g. ``'{"submissions":['`` and ``']}'``); ndjson mode ignores them.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        if mode == NDJSON:
+            for items in _batches(session, statement, serializer, batch_size):
+                yield ''.join(dumps(item) + '\n' for item in items)
+            return
+
+        yield prefix or '['
+        first = True
+        for items in _batches(session, statement, serializer, batch_size):
+            if not items:
+                continue
+            body = ','.join(dumps(item) for item in items)
+            yield body if first else ',' + body
+            first = False
+        yield suffix or ']'
+
+    mimetype = 'application/x-ndjson' if mode == NDJSON else 'application/json'
+    return Response(stream_with_context(generate()), mimetype=mimetype)
@@ -0,0 +1,218 @@
+"""
+In-memory autocomplete over skill names, categories and project titles.
+
+The index is a sorted array of ``(key, kind, label)`` tuples searched with
+``bisect``; each label is indexed under every word start, so "learn" finds
+"Machine Learning". When a prefix has too few hits, a trigram index proposes
+candidates that are then checked with a bounded edit distance, so "pyhton"
+still suggests "Python".
+
+Each worker keeps its own index. Writes in a worker update it incrementally;
+a full rebuild every SUGGEST_REBUILD_SECONDS picks up writes made elsewhere.
+"""
+import bisect
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from sqlalchemy import select
+
+KIND_ORDER = {'skill': 0, 'category': 1, 'title': 2}
+MAX_WORDS_INDEXED = 8
+MAX_SCAN = 200
+FUZZY_MIN_PREFIX = 3
+FUZZY_CANDIDATES = 50
+
+
+def _normalize(text):
+    return ' '.join((text or '').lower().split())
+
+
+def _word_starts(label):
+    """Every suffix of the normalized label that begins at a word boundary."""
+    words = _normalize(label).split(' ')[:MAX_WORDS_INDEXED]
+    return {' '.join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def project_terms(project):
+    """Counter of (kind, label) entries a project contributes to the index."""
+    terms = Counter()
+    if project.title:
+        terms[('title', project.title)] += 1
+    if project.category:
+        terms[('category', project.category)] += 1
+    for skill in project.skill_tags:
+        terms[('skill', skill.name)] += 1
+    return terms
+
+
+class SuggestIndex:
+    def __init__(self, rebuild_seconds=300):
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self._built_at = None
+        self._reset()
+
+    def _reset(self):
+        self._entries = []                 # sorted (key, kind, label)
+        self._refs = Counter()             # (kind, label) -> projects using it
+        self._trigrams = defaultdict(set)  # trigram -> {(kind, label)}
+
+    # ── building ─────────────────────────────────────────────
+    def rebuild(self, session, project_model, skill_model, project_skills):
+        terms = Counter()
+        for title, category in session.execute(select(project_model.title, project_model.category)):
+            if title:
+                terms[('title', title)] += 1
+            if category:
+                terms[('category', category)] += 1
+        skill_rows = session.execute(
+            select(skill_model.name).join(project_skills, project_skills.c.skill_id == skill_model.id)
+        )
+        for (name,) in skill_rows:
+            terms[('skill', name)] += 1
+
+        entries = sorted(
+            (key, kind, label) for (kind, label) in terms for key in _word_starts(label)
+        )
+        trigrams = defaultdict(set)
+        for term in terms:
+            for word in _normalize(term[1]).split(' '):
+                for gram in _trigrams(word):
+                    trigrams[gram].add(term)
+
+        with self._lock:
+            self._entries, self._refs, self._trigrams = entries, terms, trigrams
+            self._built_at = time.monotonic()
+
+    def is_stale(self):
+        return self._built_at is None or time.monotonic() - self._built_at > self.rebuild_seconds
+
+    def apply_delta(self, before: Counter, after: Counter):
+        """Incrementally move the index from one project's old terms to its new ones."""
+        delta = Counter(after)
+        delta.subtract(before)
+        with self._lock:
+            if self._built_at is None:
+                return  # not built yet; the first query will build it from the DB
+            for term, change in delta.items():
+                if change > 0:
+                    self._add(term, change)
+                elif change < 0:
+                    self._remove(term, -change)
+
+    def _add(self, term, count):
+        self._refs[term] += count
+        if self._refs[term] != count:
+            return
+        kind, label = term
+        for key in _word_starts(label):
+            bisect.insort(self._entries, (key, kind, label))
+        for word in _normalize(label).split(' '):
+            for gram in _trigrams(word):
+                self._trigrams[gram].add(term)
+
+    def _remove(self, term, count):
+        if term not in self._refs:
+            return
+        self._refs[term] -= count
+        if self._refs[term] > 0:
+            return
+        del self._refs[term]
+        kind, label = term
+        for key in _word_starts(label):
+            entry = (key, kind, label)
+            i = bisect.bisect_left(self._entries, entry)
+            if i < len(self._entries) and self._entries[i] == entry:
+                del self._entries[i]
+        for word in _normalize(label).split(' '):
+            for gram in _trigrams(word):
+                self._trigrams[gram].discard(term)
+
+    # ── querying ─────────────────────────────────────────────
+    def suggest(self, prefix, limit=10):
+        """
+        Returns:
+            (suggestions, fuzzy) where suggestions is a list of
+            {'value', 'type'} dicts and fuzzy says whether typo matching was used.
+        """
+        prefix = _normalize(prefix)
+        if not prefix:
+            return [], False
+
+        with self._lock:
+            found = {}
+            i = bisect.bisect_left(self._entries, (prefix,))
+            for key, kind, label in self._entries[i:i + MAX_SCAN]:
+                if not key.startswith(prefix):
+                    break
+                # Whole-label prefix beats a match on a later word; fuzzy hits rank last
+                starts_label = _normalize(label).startswith(prefix)
+                rank = (0 if starts_label else 1, 0, KIND_ORDER[kind], len(label), label)
+                if (kind, label) not in found or rank < found[(kind, label)]:
+                    found[(kind, label)] = rank
+
+            fuzzy = False
+            if len(found) < limit and len(prefix) >= FUZZY_MIN_PREFIX:
+                fuzzy_hits = self._fuzzy(prefix, exclude=found.keys())
+                fuzzy = bool(fuzzy_hits)
+                found.update(fuzzy_hits)
+
+        ranked = sorted(found.items(), key=lambda item: item[1])[:limit]
+        return [{'value': label, 'type': kind} for (kind, label), _ in ranked], fuzzy
+
+    def _fuzzy(self, prefix, exclude):
+        # Typo tolerance scales with what has been typed so far
+        max_distance = 1 if len(prefix) <= 5 else 2
+        last_word = prefix.split(' ')[-1]
+        shared = Counter()
+        for gram in _trigrams(last_word):
+            for term in self._trigrams.get(gram, ()):
+                shared[term] += 1
+
+        hits = {}
+        for term, _ in shared.most_common(FUZZY_CANDIDATES):
+            if term in exclude:
+                continue
+            kind, label = term
+            # Compare against the same-length start of each word, so a partially
+            # typed word isn't penalized for the letters not typed yet
+            best = min(
+                _edit_distance(last_word, word[:len(last_word)], max_distance)
+                for word in _normalize(label).split(' ')
+            )
+            if best <= max_distance:
+                hits[term] = (2, best, KIND_ORDER[kind], len(label), label)
+        return hits
+
+
+def init_suggest(app):
+    app.config.setdefault('SUGGEST_REBUILD_SECONDS', int(os.getenv('SUGGEST_REBUILD_SECONDS', 300)))
+    index = SuggestIndex(rebuild_seconds=app.config['SUGGEST_REBUILD_SECONDS'])
+    app.extensions['suggest_index'] = index
+    return index
+
+
+def get_suggest_index():
+    from flask import current_app
+    return current_app.extensions['suggest_index']
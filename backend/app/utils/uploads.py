@@ -0,0 +1,132 @@
+"""
+Size-bounded, streamed file uploads.
+
+The cheapest place to stop an oversized upload is before the form is parsed:
+``limit_request_body`` answers 413 straight away when the declared
+Content-Length passes the per-endpoint limit (plus a little room for the
+multipart envelope). A body without a Content-Length (chunked) is still
+bounded by MAX_CONTENT_LENGTH, the global ceiling Werkzeug enforces while
+parsing, and by ``spool_upload``'s own byte count.
+
+``spool_upload`` then copies the parsed file in chunks into a
+SpooledTemporaryFile (in memory while small, on disk after that), hashing as
+it goes and rejecting it the moment it passes the endpoint's limit. The type
+is decided from the magic bytes of the first chunk, not the client's
+Content-Type or file name.
+"""
+import hashlib
+import os
+import tempfile
+from flask import abort, request
+
+CHUNK_SIZE = 64 * 1024
+# Spooled uploads stay in memory up to this size
+SPOOL_MAX_MEMORY = 512 * 1024
+# Boundaries, part headers and the odd extra form field
+MULTIPART_OVERHEAD = 64 * 1024
+
+RESUME_MAX_BYTES = 5 * 1024 * 1024
+AVATAR_MAX_BYTES = 2 * 1024 * 1024
+
+# (offset, signature, mimetype)
+_SIGNATURES = (
+    (0, b'%PDF-', 'application/pdf'),
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (8, b'WEBP', 'image/webp'),
+)
+
+
+class UploadRejected(Exception):
+    """The upload is too large or not an allowed type (``message`` is user-facing)."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class SpooledUpload:
+    """An accepted upload: the spooled file (rewound), its size, SHA-256 and sniffed mimetype."""
+
+    __slots__ = ('file', 'size', 'sha256', 'mimetype')
+
+    def __init__(self, file, size, sha256, mimetype):
+        self.file = file
+        self.size = size
+        self.sha256 = sha256
+        self.mimetype = mimetype
+
+    def read(self):
+        self.file.seek(0)
+        return self.file.read()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def sniff_mimetype(head):
+    """Mimetype from a file's leading bytes, or None if it isn't a type we accept."""
+    for offset, signature, mimetype in _SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            if mimetype == 'image/webp' and head[:4] != b'RIFF':
+                continue
+            return mimetype
+    return None
+
+
+def limit_request_body(max_bytes):
+    """Reject a declared-too-large body before the form is parsed (call before touching request.files)."""
+    if request.content_length is not None and request.content_length > max_bytes + MULTIPART_OVERHEAD:
+        abort(413)
+
+
+def spool_upload(file, max_bytes, allowed_mimetypes, too_large_message, bad_type_message):
+    """
+    Copy a werkzeug FileStorage into a spooled temp file in CHUNK_SIZE pieces.
+    Raises UploadRejected as soon as the data passes ``max_bytes`` or if the
+    first chunk doesn't look like one of ``allowed_mimetypes``.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    digest = hashlib.sha256()
+    size = 0
+    mimetype = None
+    try:
+        while True:
+            chunk = file.stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if mimetype is None:
+                mimetype = sniff_mimetype(chunk)
+                if mimetype not in allowed_mimetypes:
+                    raise UploadRejected(bad_type_message)
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadRejected(too_large_message, 413)
+            digest.update(chunk)
+            spooled.write(chunk)
+        if mimetype is None:
+            raise UploadRejected(bad_type_message)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return SpooledUpload(spooled, size, digest.hexdigest(), mimetype)
+
+
+def init_uploads(app):
+    # Flask's own default is None (unlimited), so setdefault wouldn't apply
+    if app.config.get('MAX_CONTENT_LENGTH') is None:
+        app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH', 8 * 1024 * 1024)) or None
+
+    from flask import jsonify
+
+    @app.errorhandler(413)
+    def _request_too_large(error):
+        return jsonify({"error": "Request body is too large"}), 413
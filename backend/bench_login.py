@@ -0,0 +1,101 @@
+"""
+Benchmark: login latency under concurrent load.
+Fires ``concurrency`` threads at POST /api/auth/login against a throwaway
+SQLite database and reports p50/p99 latency, throughput, and how many logins
+were turned away with 503 (hash queue full). Runs once with inline hashing
+(PASSWORD_HASH_WORKERS=0) and once with the process pool, so you can compare.
+Run this with: python bench_login.py [logins] [concurrency] [pool_workers]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from app import create_app, db
+from app.models import User
+from app.utils.passwords import COST_PROFILES
+from werkzeug.security import generate_password_hash
+
+N_USERS = 20
+
+
+def make_config(db_path, workers):
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        SECRET_KEY = JWT_SECRET_KEY = 'bench-secret-key-bench-secret-key'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        RATELIMIT_ENABLED = False
+        PASSWORD_HASH_WORKERS = workers
+    return BenchConfig
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(label, workers, logins, concurrency, db_path):
+    app = create_app(make_config(db_path, workers))
+    client = app.test_client()
+    latencies, statuses = [], []
+    lock = threading.Lock()
+    counter = iter(range(logins))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            body = {'email': f"user{i % N_USERS}@mail.utoronto.ca", 'password': 'password123'}
+            start = time.perf_counter()
+            status = client.post('/api/auth/login', json=body).status_code
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                statuses.append(status)
+
+    # Warm-up: a concurrent burst starts all of the pool's processes outside the measurement
+    burst = [threading.Thread(target=client.post, args=('/api/auth/login',),
+                              kwargs={'json': {'email': 'user0@mail.utoronto.ca', 'password': 'password123'}})
+             for _ in range(concurrency)]
+    for t in burst:
+        t.start()
+    for t in burst:
+        t.join()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    app.extensions['password_hasher'].shutdown()
+
+    ok = [lat for lat, status in zip(latencies, statuses) if status == 200]
+    busy = statuses.count(503)
+    print(f"{label:<22} p50 {percentile(ok, 50) * 1000:7.1f} ms  p99 {percentile(ok, 99) * 1000:7.1f} ms  "
+          f"{len(ok) / elapsed:6.1f} logins/s  503s: {busy}")
+
+
+def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    pool_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = create_app(make_config(db_path, 0))
+    with app.app_context():
+        db.create_all()
+        password_hash = generate_password_hash('password123', method=COST_PROFILES['default'])
+        db.session.add_all(User(email=f"user{i}@mail.utoronto.ca", password_hash=password_hash)
+                           for i in range(N_USERS))
+        db.session.commit()
+
+    print(f"{logins} logins, {concurrency} concurrent clients, {os.cpu_count()} CPU(s)")
+    run('inline hashing', 0, logins, concurrency, db_path)
+    run(f'process pool ({pool_workers})', pool_workers, logins, concurrency, db_path)
+
+
+if __name__ == '__main__':
+    main()
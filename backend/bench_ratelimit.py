@@ -0,0 +1,62 @@
+"""
+Benchmark: per-check overhead of the rate-limit storages.
+Times ``limiter.hit`` for in-process ``memory://`` and the shared-memory
+``shm://`` storage (app.utils.ratelimit) under the fixed-window and
+sliding-window-counter strategies, spread over ``keys`` distinct keys (clients),
+then repeats the shm sliding-window run from ``processes`` concurrent processes
+to show the cost of contending for the lock.
+Run this with: python bench_ratelimit.py [checks] [keys] [processes]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+import app.utils.ratelimit  # noqa: F401  (registers the shm:// scheme)
+
+ITEM = parse('1000000/minute')  # never trips: measure the check, not the rejection
+
+
+def time_checks(uri, strategy, checks, keys):
+    limiter = strategy(storage_from_string(uri))
+    names = [f"user:{i}" for i in range(keys)]
+    start = time.perf_counter()
+    for i in range(checks):
+        limiter.hit(ITEM, names[i % keys])
+    return (time.perf_counter() - start) / checks
+
+
+def _worker(uri, checks, keys, results):
+    results.put(time_checks(uri, SlidingWindowCounterRateLimiter, checks, keys))
+
+
+def main():
+    checks = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    keys = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    processes = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    shm_uri = f"shm://{os.path.join(tempfile.mkdtemp(), 'ratelimit')}"
+    print(f"{checks} checks over {keys} keys, {os.cpu_count()} CPU(s)")
+    for label, uri in (('memory://', 'memory://'), ('shm://', shm_uri)):
+        for name, strategy in (('fixed-window', FixedWindowRateLimiter),
+                               ('sliding-window-counter', SlidingWindowCounterRateLimiter)):
+            per_check = time_checks(uri, strategy, checks, keys)
+            print(f"{label:<10} {name:<24} {per_check * 1e6:6.1f} us/check")
+
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_worker, args=(shm_uri, checks, keys, results))
+               for _ in range(processes)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join()
+    per_check = [results.get() for _ in workers]
+    print(f"shm:// x{processes} processes sliding-window-counter "
+          f"{sum(per_check) / len(per_check) * 1e6:6.1f} us/check (mean per process)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark: serializing a 1,000-project search payload.
+Compares the old path (hand-built dicts + Flask's default JSON provider) with
+the shared serializers + orjson provider. No database needed.
+Run this with: python bench_serialization.py [n_projects] [repeats]
+"""
+import sys
+import timeit
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.serializers import project_list_serializer
+from app.utils.json_provider import OrjsonProvider, orjson
+
+FIELDS = ('id', 'title', 'description', 'skills', 'category', 'created_at', 'owner', 'application_count')
+
+
+def make_projects(n):
+    now = datetime.utcnow()
+    projects = []
+    for i in range(n):
+        owner = SimpleNamespace(
+            id=i % 50, email=f"user{i % 50}@mail.utoronto.ca",
+            profile=SimpleNamespace(full_name=f"Student {i % 50}"),
+        )
+        projects.append(SimpleNamespace(
+            id=i, title=f"Project {i}", owner_id=owner.id, owner=owner,
+            description="Looking for teammates to build something fun. " * 6,
+            skills="Python, React, Flask, PostgreSQL", category="Web Development",
+            created_at=now - timedelta(minutes=i), application_count=i % 7,
+        ))
+    return projects
+
+
+def legacy(projects, provider):
+    data = []
+    for project in projects:
+        item = {'id': project.id, 'title': project.title, 'description': project.description,
+                'skills': project.skills, 'category': project.category,
+                'created_at': project.created_at.isoformat() if project.created_at else None,
+                'application_count': project.application_count}
+        owner = project.owner
+        owner_profile = owner.profile if owner else None
+        item['owner'] = {
+            'id': owner.id if owner else None,
+            'email': owner.email if owner else None,
+            'name': owner_profile.full_name if owner_profile else None
+        }
+        data.append(item)
+    return provider.dumps({'projects': data, 'total': len(data)})
+
+
+def shared(projects, provider):
+    data = project_list_serializer.only(FIELDS).many(projects)
+    return provider.dumps({'projects': data, 'total': len(data)})
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    app = Flask(__name__)
+    projects = make_projects(n)
+
+    cases = [('dicts + default provider', legacy, DefaultJSONProvider(app)),
+             ('serializers + default provider', shared, DefaultJSONProvider(app))]
+    if orjson is not None:
+        cases.append(('serializers + orjson provider', shared, OrjsonProvider(app)))
+    else:
+        print("orjson not installed; skipping the orjson case")
+
+    baseline = None
+    for label, fn, provider in cases:
+        best = min(timeit.repeat(lambda: fn(projects, provider), number=1, repeat=repeats))
+        baseline = baseline or best
+        print(f"{label:<32} {best * 1000:8.2f} ms  ({baseline / best:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""add full-text search to projects
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = 'i9j0k1l2m3n4'
+down_revision = 'h8i9j0k1l2m3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        # Generated column: Postgres recomputes it on every INSERT/UPDATE
+        op.execute("""
+            ALTER TABLE projects ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_projects_search_vector ON projects USING GIN (search_vector)")
+
+    elif dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE projects_fts USING fts5(
+                title, description, content='projects', content_rowid='id'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER projects_fts_ai AFTER INSERT ON projects BEGIN
+                INSERT INTO projects_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER projects_fts_ad AFTER DELETE ON projects BEGIN
+                INSERT INTO projects_fts(projects_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER projects_fts_au AFTER UPDATE OF title, description ON projects BEGIN
+                INSERT INTO projects_fts(projects_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO projects_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        """)
+        # Index the rows that already exist
+        op.execute("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_projects_search_vector")
+        op.execute("ALTER TABLE projects DROP COLUMN IF EXISTS search_vector")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS projects_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS projects_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS projects_fts_ai")
+        op.execute("DROP TABLE IF EXISTS projects_fts")
@@ -0,0 +1,157 @@
+"""add normalized skill tags
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-16
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'j0k1l2m3n4o5'
+down_revision = 'i9j0k1l2m3n4'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+# A frozen copy of app.utils.skills as of this revision, so the backfill
+# doesn't change when the app's normalization does
+_SKILL_ALIASES = {
+    'js': 'JavaScript',
+    'javascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'typescript': 'TypeScript',
+    'py': 'Python',
+    'python3': 'Python',
+    'golang': 'Go',
+    'cpp': 'C++',
+    'c plus plus': 'C++',
+    'csharp': 'C#',
+    'c sharp': 'C#',
+    'react.js': 'React',
+    'reactjs': 'React',
+    'react native': 'React Native',
+    'node': 'Node.js',
+    'nodejs': 'Node.js',
+    'node js': 'Node.js',
+    'vue.js': 'Vue',
+    'vuejs': 'Vue',
+    'next.js': 'Next.js',
+    'nextjs': 'Next.js',
+    'postgres': 'PostgreSQL',
+    'postgresql': 'PostgreSQL',
+    'psql': 'PostgreSQL',
+    'mongo': 'MongoDB',
+    'mongodb': 'MongoDB',
+    'ml': 'Machine Learning',
+    'machine learning': 'Machine Learning',
+    'dl': 'Deep Learning',
+    'deep learning': 'Deep Learning',
+    'ai': 'AI',
+    'nlp': 'NLP',
+    'cv': 'Computer Vision',
+    'k8s': 'Kubernetes',
+    'aws': 'AWS',
+    'gcp': 'Google Cloud',
+    'html5': 'HTML',
+    'css3': 'CSS',
+    'tailwindcss': 'Tailwind CSS',
+    'tailwind': 'Tailwind CSS',
+    'ui/ux': 'UI/UX',
+    'ux/ui': 'UI/UX',
+}
+
+_MAX_SKILL_LENGTH = 64
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _parse_skills(csv):
+    """Comma-separated skills -> ordered, de-duplicated (slug, name) pairs."""
+    seen = {}
+    for part in (csv or '').split(','):
+        cleaned = _WHITESPACE_RE.sub(' ', part.strip())[:_MAX_SKILL_LENGTH]
+        if not cleaned:
+            continue
+        name = _SKILL_ALIASES.get(cleaned.lower(), cleaned)
+        seen.setdefault(name.lower(), name)
+    return list(seen.items())
+
+
+def _backfill(conn, skills, source, assoc, owner_column):
+    """Copy the CSV ``skills`` column of ``source`` into ``assoc``, BATCH_SIZE rows at a time."""
+    skill_ids = {slug: skill_id for skill_id, slug in conn.execute(sa.select(skills.c.id, skills.c.slug))}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(source.c.id, source.c.skills)
+            .where(source.c.id > last_id)
+            .order_by(source.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        links = []
+        for owner_id, csv in rows:
+            for slug, name in _parse_skills(csv):
+                if slug not in skill_ids:
+                    skill_ids[slug] = conn.execute(
+                        skills.insert().values(slug=slug, name=name).returning(skills.c.id)
+                    ).scalar_one()
+                links.append({owner_column: owner_id, 'skill_id': skill_ids[slug]})
+
+        if links:
+            conn.execute(assoc.insert(), links)
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    op.create_table('skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('slug', sa.String(length=64), nullable=False),
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_skills_slug'), 'skills', ['slug'], unique=True)
+
+    op.create_table('project_skills',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'skill_id'),
+    )
+    op.create_index('ix_project_skills_skill_id_project_id', 'project_skills', ['skill_id', 'project_id'])
+
+    op.create_table('profile_skills',
+        sa.Column('profile_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['profile_id'], ['profiles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('profile_id', 'skill_id'),
+    )
+    op.create_index('ix_profile_skills_skill_id_profile_id', 'profile_skills', ['skill_id', 'profile_id'])
+
+    # Backfill from the existing comma-separated columns
+    conn = op.get_bind()
+    meta = sa.MetaData()
+    skills = sa.Table('skills', meta, autoload_with=conn)
+    projects = sa.Table('projects', meta, sa.Column('id', sa.Integer), sa.Column('skills', sa.Text))
+    profiles = sa.Table('profiles', meta, sa.Column('id', sa.Integer), sa.Column('skills', sa.Text))
+    project_skills = sa.Table('project_skills', meta, autoload_with=conn)
+    profile_skills = sa.Table('profile_skills', meta, autoload_with=conn)
+
+    _backfill(conn, skills, projects, project_skills, 'project_id')
+    _backfill(conn, skills, profiles, profile_skills, 'profile_id')
+
+
+def downgrade():
+    op.drop_index('ix_profile_skills_skill_id_profile_id', table_name='profile_skills')
+    op.drop_table('profile_skills')
+    op.drop_index('ix_project_skills_skill_id_project_id', table_name='project_skills')
+    op.drop_table('project_skills')
+    op.drop_index(op.f('ix_skills_slug'), table_name='skills')
+    op.drop_table('skills')
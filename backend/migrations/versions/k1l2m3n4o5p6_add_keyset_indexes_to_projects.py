@@ -0,0 +1,23 @@
+"""add keyset pagination indexes to projects
+
+Revision ID: k1l2m3n4o5p6
+Revises: j0k1l2m3n4o5
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+
+revision = 'k1l2m3n4o5p6'
+down_revision = 'j0k1l2m3n4o5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_projects_created_at_id', 'projects', ['created_at', 'id'])
+    op.create_index('ix_projects_title_id', 'projects', ['title', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_projects_title_id', table_name='projects')
+    op.drop_index('ix_projects_created_at_id', table_name='projects')
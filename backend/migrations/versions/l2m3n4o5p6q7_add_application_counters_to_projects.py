@@ -0,0 +1,42 @@
+"""add denormalized application counters to projects
+
+Revision ID: l2m3n4o5p6q7
+Revises: k1l2m3n4o5p6
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'l2m3n4o5p6q7'
+down_revision = 'k1l2m3n4o5p6'
+branch_labels = None
+depends_on = None
+
+COUNTERS = {
+    'application_count': None,
+    'pending_count': 'pending',
+    'accepted_count': 'accepted',
+    'rejected_count': 'rejected',
+}
+
+
+def upgrade():
+    for column in COUNTERS:
+        op.add_column('projects', sa.Column(column, sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing applications
+    for column, status in COUNTERS.items():
+        status_filter = f" AND applications.status = '{status}'" if status else ''
+        op.execute(
+            f"UPDATE projects SET {column} = ("
+            f"SELECT COUNT(*) FROM applications WHERE applications.project_id = projects.id{status_filter})"
+        )
+
+    op.create_index('ix_projects_application_count_id', 'projects', ['application_count', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_projects_application_count_id', table_name='projects')
+    for column in reversed(list(COUNTERS)):
+        op.drop_column('projects', column)
@@ -0,0 +1,41 @@
+"""add facet_counts table
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'm3n4o5p6q7r8'
+down_revision = 'l2m3n4o5p6q7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('facet_counts',
+        sa.Column('facet', sa.String(length=16), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('facet', 'value'),
+    )
+
+    # Backfill from existing projects
+    op.execute("""
+        INSERT INTO facet_counts (facet, value, count)
+        SELECT 'category', category, COUNT(*) FROM projects
+        WHERE category IS NOT NULL
+        GROUP BY category
+    """)
+    op.execute("""
+        INSERT INTO facet_counts (facet, value, count)
+        SELECT 'skill', skills.name, COUNT(*) FROM project_skills
+        JOIN skills ON skills.id = project_skills.skill_id
+        GROUP BY skills.name
+    """)
+
+
+def downgrade():
+    op.drop_table('facet_counts')
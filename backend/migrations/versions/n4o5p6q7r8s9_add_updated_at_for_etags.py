@@ -0,0 +1,31 @@
+"""add updated_at to projects, profiles and htf_submissions
+
+Revision ID: n4o5p6q7r8s9
+Revises: m3n4o5p6q7r8
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'n4o5p6q7r8s9'
+down_revision = 'm3n4o5p6q7r8'
+branch_labels = None
+depends_on = None
+
+TABLES = ('projects', 'profiles', 'htf_submissions')
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Existing rows: last known change is their creation (profiles have no created_at)
+    op.execute("UPDATE projects SET updated_at = created_at")
+    op.execute("UPDATE htf_submissions SET updated_at = created_at")
+    op.execute("UPDATE profiles SET updated_at = CURRENT_TIMESTAMP")
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_column(table, 'updated_at')
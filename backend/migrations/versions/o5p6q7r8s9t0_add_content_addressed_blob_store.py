@@ -0,0 +1,42 @@
+"""add content-addressed blob store for resumes and avatars
+
+Revision ID: o5p6q7r8s9t0
+Revises: n4o5p6q7r8s9
+Create Date: 2026-10-16
+
+Schema only. Existing resume/avatar bytes are moved out of the profiles table
+afterwards, in small committed batches, by `flask migrate-blobs`; until then
+the app falls back to the legacy columns.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'o5p6q7r8s9t0'
+down_revision = 'n4o5p6q7r8s9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('encoding', sa.String(length=16), nullable=True),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+    op.add_column('profiles', sa.Column('resume_hash', sa.String(length=64), nullable=True))
+    op.add_column('profiles', sa.Column('resume_size', sa.Integer(), nullable=True))
+    op.add_column('profiles', sa.Column('avatar_hash', sa.String(length=64), nullable=True))
+    op.add_column('profiles', sa.Column('avatar_size', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    # Blobs are not copied back; run this only before `flask migrate-blobs`
+    op.drop_column('profiles', 'avatar_size')
+    op.drop_column('profiles', 'avatar_hash')
+    op.drop_column('profiles', 'resume_size')
+    op.drop_column('profiles', 'resume_hash')
+    op.drop_table('blobs')
@@ -0,0 +1,34 @@
+"""add has_resume/has_avatar flags to profiles
+
+Revision ID: p6q7r8s9t0u1
+Revises: o5p6q7r8s9t0
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'p6q7r8s9t0u1'
+down_revision = 'o5p6q7r8s9t0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('profiles', sa.Column('has_resume', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.add_column('profiles', sa.Column('has_avatar', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    # Backfill from whichever storage each profile is using (blob store or legacy column)
+    op.execute(
+        "UPDATE profiles SET has_resume = TRUE, resume_size = COALESCE(resume_size, LENGTH(resume_data)) "
+        "WHERE resume_hash IS NOT NULL OR resume_data IS NOT NULL"
+    )
+    op.execute(
+        "UPDATE profiles SET has_avatar = TRUE, avatar_size = COALESCE(avatar_size, LENGTH(avatar_data)) "
+        "WHERE avatar_hash IS NOT NULL OR avatar_data IS NOT NULL"
+    )
+
+
+def downgrade():
+    op.drop_column('profiles', 'has_avatar')
+    op.drop_column('profiles', 'has_resume')
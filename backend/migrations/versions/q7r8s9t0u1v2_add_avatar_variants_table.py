@@ -0,0 +1,30 @@
+"""add avatar_variants table
+
+Revision ID: q7r8s9t0u1v2
+Revises: p6q7r8s9t0u1
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'q7r8s9t0u1v2'
+down_revision = 'p6q7r8s9t0u1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'avatar_variants',
+        sa.Column('source_hash', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('format', sa.String(length=8), nullable=False),
+        sa.Column('blob_hash', sa.String(length=64), nullable=False),
+        sa.Column('byte_size', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('source_hash', 'size', 'format'),
+    )
+
+
+def downgrade():
+    op.drop_table('avatar_variants')
@@ -0,0 +1,35 @@
+"""add announcements table
+
+Revision ID: s9t0u1v2w3x4
+Revises: r8s9t0u1v2w3
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 's9t0u1v2w3x4'
+down_revision = 'r8s9t0u1v2w3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'announcements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body_html', sa.Text(), nullable=False),
+        sa.Column('body_text', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False, server_default='pending'),
+        sa.Column('last_user_id', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sent_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failed_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade():
+    op.drop_table('announcements')
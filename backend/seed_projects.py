@@ -3,7 +3,9 @@ Seed script to add sample projects for testing the search functionality.
 Run this with: python seed_projects.py
 """
 from app import create_app, db
-from app.models import Project, User
+from app.models import Project, User, Skill, FacetCount, project_skills
+from app.utils.facets import rebuild_facet_counts
+from app.utils.skills import sync_skill_tags
 from datetime import datetime, timedelta
 
 def seed_projects():
@@ -109,10 +111,13 @@ def seed_projects():
             existing = Project.query.filter_by(title=proj_data['title']).first()
             if not existing:
                 project = Project(**proj_data)
+                sync_skill_tags(db.session, Skill, project, project.skills)
                 db.session.add(project)
                 added += 1
         
         db.session.commit()
+        # Inserted directly, so recount the precomputed search facets
+        rebuild_facet_counts(db.session, FacetCount, Project, Skill, project_skills)
         print(f"✅ Successfully added {added} sample projects to the database!")
         print(f"   Total projects in database: {Project.query.count()}")
 
@@ -0,0 +1,82 @@
+"""
+Shared fixtures: a fresh app on in-memory SQLite per test, a client, user
+signup, and ``count_queries`` for asserting how much SQL a request runs.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db as _db
+from app.utils import pagination
+
+
+class TestConfig:
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = JWT_SECRET_KEY = 'test-secret-key-test-secret-key-test'
+    RATELIMIT_ENABLED = False
+    RATELIMIT_STORAGE_URI = 'memory://'
+    # Inline and cheap: no process pool or background threads in tests
+    PASSWORD_HASH_PROFILE = 'fast'
+    PASSWORD_HASH_WORKERS = 0
+    AVATAR_WORKERS = 0
+    MAINTENANCE_THREAD = False
+
+
+@pytest.fixture
+def app():
+    pagination._count_cache.clear()  # per-process memo; the next test has a new database
+    app = create_app(TestConfig)
+    with app.app_context():
+        _db.create_all()
+    yield app
+    with app.app_context():
+        _db.session.remove()
+        _db.drop_all()
+
+
+@pytest.fixture
+def db(app):
+    with app.app_context():
+        yield _db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def signup(client):
+    """``signup(email, full_name=None)`` -> (auth headers, user id)."""
+    def signup(email, full_name=None):
+        response = client.post('/api/auth/signup', json={'email': email, 'password': 'password123'})
+        assert response.status_code == 201, response.get_json()
+        body = response.get_json()
+        headers = {'Authorization': f"Bearer {body['access_token']}"}
+        if full_name:
+            client.put('/api/profile/', json={'full_name': full_name}, headers=headers)
+        return headers, body['user_id']
+    return signup
+
+
+@pytest.fixture
+def count_queries(app):
+    """``with count_queries() as statements:`` collects every SQL statement run inside."""
+    @contextmanager
+    def count_queries():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = _db.engine
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+    return count_queries
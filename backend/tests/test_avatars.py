@@ -0,0 +1,72 @@
+"""Avatar delivery: thumbnails and their Cache-Control."""
+import io
+
+import pytest
+from PIL import Image
+
+from app.models import AvatarVariant
+from app.utils import avatars
+from app.utils.avatars import render_variants
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (256, 256), 'blue').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def avatar(client, signup):
+    """(user id, avatar version) of a member with an uploaded avatar."""
+    headers, user_id = signup('member@mail.utoronto.ca')
+    response = client.post('/api/profile/avatar', headers=headers,
+                           data={'avatar': (io.BytesIO(_png()), 'me.png')}, content_type='multipart/form-data')
+    assert response.status_code == 200
+    return user_id, response.get_json()['avatar_version']
+
+
+def test_sized_avatar_is_immutable_when_thumbnail_served(client, avatar):
+    user_id, version = avatar
+    response = client.get(f"/api/profile/avatar/{user_id}?v={version}&size=64")
+    assert response.status_code == 200
+    assert response.mimetype in ('image/jpeg', 'image/webp')
+    assert 'immutable' in response.headers['Cache-Control']
+
+
+def test_sized_avatar_fallback_to_original_revalidates(client, db, avatar):
+    user_id, version = avatar
+    # As right after an upload, before the worker has rendered the thumbnails
+    db.session.query(AvatarVariant).delete()
+    db.session.commit()
+    response = client.get(f"/api/profile/avatar/{user_id}?v={version}&size=64")
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert 'immutable' not in response.headers['Cache-Control']
+
+
+def test_unsized_avatar_with_version_is_immutable(client, avatar):
+    user_id, version = avatar
+    response = client.get(f"/api/profile/avatar/{user_id}?v={version}")
+    assert 'immutable' in response.headers['Cache-Control']
+
+
+def test_avatar_batch_etag_covers_the_requested_ids(client, avatar):
+    user_id, _ = avatar
+    first = client.get(f"/api/profile/avatars?ids={user_id}")
+    assert first.status_code == 200
+    # Same avatars found, but another (avatar-less) id is asked for
+    response = client.get(f"/api/profile/avatars?ids={user_id},999999",
+                          headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.get_json()['avatars'] == {str(user_id): first.get_json()['avatars'][str(user_id)],
+                                              '999999': None}
+    again = client.get(f"/api/profile/avatars?ids={user_id}", headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_oversized_source_is_skipped_without_touching_pillows_limit(monkeypatch):
+    limit = Image.MAX_IMAGE_PIXELS
+    assert len(list(render_variants(_png()))) == 2 * len(avatars.VARIANT_SIZES)
+    monkeypatch.setattr(avatars, 'MAX_SOURCE_PIXELS', 100 * 100)
+    assert list(render_variants(_png())) == []
+    assert Image.MAX_IMAGE_PIXELS == limit
@@ -0,0 +1,61 @@
+"""
+The legacy ``resume_data`` / ``avatar_data`` columns are deferred: no read
+path may SELECT them (file bytes come from the blob store).
+"""
+import io
+
+import pytest
+from PIL import Image
+
+BLOB_COLUMNS = ('resume_data', 'avatar_data')
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), 'red').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def member(client, signup):
+    """A member with a project, a resume and an avatar."""
+    headers, user_id = signup('member@mail.utoronto.ca', full_name='Member')
+    client.post('/api/projects/', headers=headers, json={
+        'title': 'Robot arm', 'description': 'Build it', 'category': 'Hardware', 'skills': 'Python',
+    })
+    pdf = b'%PDF-1.4\n' + b'0' * 2048
+    response = client.post('/api/profile/resume', headers=headers,
+                           data={'resume': (io.BytesIO(pdf), 'cv.pdf')}, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_json()
+    response = client.post('/api/profile/avatar', headers=headers,
+                           data={'avatar': (io.BytesIO(_png()), 'me.png')}, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_json()
+    return headers, user_id
+
+
+def _blob_selects(statements):
+    return [s for s in statements
+            if s.lstrip().upper().startswith('SELECT') and any(column in s for column in BLOB_COLUMNS)]
+
+
+@pytest.mark.parametrize('path, authenticated', [
+    ('/api/profile/', True),
+    ('/api/profile/{user_id}', False),
+    ('/api/profile/resume', True),
+    ('/api/profile/resume/{user_id}', False),
+    ('/api/profile/avatar/{user_id}', False),
+    ('/api/profile/avatar/{user_id}?size=64', False),
+    ('/api/profile/avatars?ids={user_id}', False),
+    ('/api/projects/search', False),
+    ('/api/projects/me', True),
+    ('/api/projects/user/{user_id}', False),
+    ('/api/projects/applications/me', True),
+    ('/api/htf/', True),
+])
+def test_read_paths_skip_blob_columns(client, member, count_queries, path, authenticated):
+    headers, user_id = member
+    with count_queries() as statements:
+        response = client.get(path.format(user_id=user_id), headers=headers if authenticated else {})
+    assert response.status_code == 200
+    assert statements, "expected the request to query the database"
+    assert _blob_selects(statements) == []
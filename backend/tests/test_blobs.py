@@ -0,0 +1,72 @@
+"""Blob stores: dedup, garbage collection, and re-uploads racing the collector."""
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Blob, Profile
+from app.utils.blobs import DatabaseBlobStore, FileBlobStore, collect_garbage
+
+GRACE = timedelta(hours=1)
+
+
+@pytest.fixture(params=['database', 'filesystem'])
+def store(request, db, tmp_path):
+    if request.param == 'database':
+        return DatabaseBlobStore(Blob)
+    return FileBlobStore(str(tmp_path / 'blobs'))
+
+
+def _age(store, db, digest):
+    """Make a stored blob look older than the grace period."""
+    if store.backend == 'database':
+        db.session.query(Blob).filter_by(sha256=digest).update({Blob.created_at: datetime.utcnow() - 2 * GRACE})
+        db.session.commit()
+    else:
+        path, _ = store.locate(digest)
+        old = (datetime.utcnow() - 2 * GRACE).timestamp()
+        os.utime(path, (old, old))
+
+
+def test_identical_bytes_are_stored_once(store, db):
+    first = store.put(db.session, b'hello')
+    assert store.put(db.session, b'hello') == first
+    db.session.commit()
+    assert store.get(db.session, first) == b'hello'
+    assert store.stored(db.session, timedelta(seconds=-60)) == [first]
+
+
+def test_gc_deletes_only_old_unreferenced_blobs(store, db):
+    kept, orphan, fresh = (store.put(db.session, data) for data in (b'kept', b'orphan', b'fresh'))
+    db.session.commit()
+    _age(store, db, kept)
+    _age(store, db, orphan)
+    assert collect_garbage(db.session, store, {kept}, grace=GRACE) == 1
+    assert store.get(db.session, orphan) is None
+    assert store.get(db.session, kept) == b'kept'
+    assert store.get(db.session, fresh) == b'fresh'
+
+
+def test_reupload_during_gc_keeps_the_blob(store, db):
+    digest = store.put(db.session, b'avatar')
+    db.session.commit()
+    _age(store, db, digest)
+    # GC has listed it as an orphan...
+    orphans = store.stored(db.session, GRACE)
+    assert orphans == [digest]
+    # ...when the same bytes are uploaded again
+    assert store.put(db.session, b'avatar') == digest
+    db.session.commit()
+    assert store.delete(db.session, orphans, min_age=GRACE) == 0
+    db.session.commit()
+    assert store.get(db.session, digest) == b'avatar'
+
+
+def test_missing_blob_is_a_404(client, db, signup):
+    _, user_id = signup('member@mail.utoronto.ca')
+    profile = Profile.query.filter_by(user_id=user_id).one()
+    profile.has_avatar = True
+    profile.avatar_hash = 'f' * 64
+    profile.avatar_mimetype = 'image/png'
+    db.session.commit()
+    assert client.get(f"/api/profile/avatar/{user_id}").status_code == 404
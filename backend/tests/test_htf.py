@@ -0,0 +1,29 @@
+"""HTF listing ETags: only the visible submissions and their submitters' profiles count."""
+import pytest
+
+
+@pytest.fixture
+def submitter(client, signup, monkeypatch):
+    monkeypatch.setenv('HTF_REVEAL', 'true')
+    headers, _ = signup('hacker@mail.utoronto.ca', full_name='Hacker')
+    response = client.post('/api/htf/', headers=headers, json={
+        'project_name': 'Hack', 'team_name': 'Team', 'youtube_url': 'https://youtube.com/watch?v=x',
+        'github_url': 'https://github.com/x/y', 'description': 'A hack',
+    })
+    assert response.status_code == 201
+    return headers
+
+
+def test_unrelated_profile_edit_keeps_etag(client, signup, submitter):
+    etag = client.get('/api/htf/').headers['ETag']
+    headers, _ = signup('bystander@mail.utoronto.ca')
+    client.put('/api/profile/', json={'full_name': 'Bystander'}, headers=headers)
+    assert client.get('/api/htf/', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_submitter_rename_changes_etag(client, submitter):
+    etag = client.get('/api/htf/').headers['ETag']
+    client.put('/api/profile/', json={'full_name': 'Renamed Hacker'}, headers=submitter)
+    response = client.get('/api/htf/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['submissions'][0]['submitter']['name'] == 'Renamed Hacker'
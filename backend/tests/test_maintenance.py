@@ -0,0 +1,44 @@
+"""Scheduled maintenance jobs."""
+from datetime import datetime, timedelta
+
+from app.models import Blob, MaintenanceRun
+from app.utils.blobs import get_blob_store
+from app.utils.maintenance import BLOB_GRACE, get_job, run_due_jobs
+
+
+def _old_blob(db, data):
+    digest = get_blob_store().put(db.session, data)
+    db.session.query(Blob).filter_by(sha256=digest).update({Blob.created_at: datetime.utcnow() - 2 * BLOB_GRACE})
+    db.session.commit()
+    return digest
+
+
+def test_gc_job_keeps_a_blob_reuploaded_during_the_run(db, monkeypatch):
+    store = get_blob_store()
+    orphan, reuploaded = _old_blob(db, b'orphan'), _old_blob(db, b'reuploaded')
+    listed = store.stored
+
+    def stored_then_reupload(session, min_age):
+        digests = listed(session, min_age)
+        store.put(session, b'reuploaded')  # a member uploads the same bytes again
+        session.commit()
+        return digests
+    monkeypatch.setattr(store, 'stored', stored_then_reupload)
+
+    [run] = run_due_jobs(db.session, db.engine, MaintenanceRun, jobs=[get_job('gc-blobs')], log=lambda line: None)
+    assert run.last_error is None
+    assert run.last_result == 1
+    assert store.get(db.session, orphan) is None
+    assert store.get(db.session, reuploaded) == b'reuploaded'
+
+
+def test_job_runs_again_only_after_its_interval(db):
+    job = get_job('expire-reset-tokens')
+
+    def runs():
+        return run_due_jobs(db.session, db.engine, MaintenanceRun, jobs=[job], log=lambda line: None)
+    assert len(runs()) == 1
+    assert runs() == []
+    db.session.get(MaintenanceRun, job.name).last_started_at -= timedelta(seconds=job.interval)
+    db.session.commit()
+    assert len(runs()) == 1
@@ -0,0 +1,185 @@
+"""
+Email outbox lifecycle against the local SMTP sink: queued at signup,
+delivered in batches, retried with backoff, and never sent twice when two
+workers drain the same outbox.
+"""
+import smtplib
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import create_app, db as _db
+from app.models import EmailOutbox
+from app.utils.email import SMTPConnection, smtp_settings
+from app.utils import outbox
+from app.utils.outbox import CLAIM_SECONDS, drain_outbox, queue_email, run_outbox_worker
+from app.utils.smtp_sink import SMTPSink
+from conftest import TestConfig
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    with SMTPSink() as sink:
+        monkeypatch.setenv('SMTP_HOST', sink.host)
+        monkeypatch.setenv('SMTP_PORT', str(sink.port))
+        monkeypatch.setenv('SMTP_STARTTLS', 'false')
+        monkeypatch.setenv('SMTP_FROM_EMAIL', 'club@example.com')
+        yield sink
+
+
+def _queue(n):
+    for i in range(n):
+        queue_email(_db.session, EmailOutbox, f"member{i}@mail.utoronto.ca", f"Hello {i}", f"<p>Hi {i}</p>")
+    _db.session.commit()
+
+
+class FlakyConnection:
+    """Refuses the first ``failures`` messages, then delivers to ``sent``."""
+
+    def __init__(self, failures, error=smtplib.SMTPRecipientsRefused({})):
+        self.failures = failures
+        self.error = error
+        self.sent = []
+        self.closed = 0
+
+    def send(self, to_email, subject, body_html, body_text=None):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.sent.append(to_email)
+
+    def close(self):
+        self.closed += 1
+
+
+def test_signup_queues_welcome_email(client, db):
+    response = client.post('/api/auth/signup', json={'email': 'new@mail.utoronto.ca', 'password': 'password123'})
+    assert response.status_code == 201
+    (entry,) = db.session.query(EmailOutbox).all()
+    assert (entry.to_email, entry.status, entry.attempts) == ('new@mail.utoronto.ca', 'pending', 0)
+
+
+def test_worker_delivers_in_batches_through_sink(app, db, sink):
+    _queue(5)
+    app.config['EMAIL_BATCH_SIZE'] = 2
+    run_outbox_worker(db.session, EmailOutbox, SMTPConnection(smtp_settings()), app.config, once=True,
+                      log=lambda message: None)
+    assert sorted(m.to for m in sink.messages) == sorted(f"member{i}@mail.utoronto.ca" for i in range(5))
+    assert {e.status for e in db.session.query(EmailOutbox)} == {'sent'}
+
+
+def test_refused_message_is_retried_with_backoff(db):
+    _queue(1)
+    connection = FlakyConnection(failures=2)
+    before = datetime.utcnow()
+    assert drain_outbox(db.session, EmailOutbox, connection, retry_base=30) == (1, 0)
+    entry = db.session.query(EmailOutbox).one()
+    assert (entry.status, entry.attempts) == ('pending', 1)
+    assert entry.last_error
+    assert before + timedelta(seconds=29) < entry.next_attempt_at < before + timedelta(seconds=40)
+
+    # Not due yet: nothing to do
+    assert drain_outbox(db.session, EmailOutbox, connection) == (0, 0)
+
+    entry.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    drain_outbox(db.session, EmailOutbox, connection, retry_base=30)
+    assert entry.attempts == 2
+    assert entry.next_attempt_at > datetime.utcnow() + timedelta(seconds=55)  # doubled
+
+    entry.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    assert drain_outbox(db.session, EmailOutbox, connection) == (1, 1)
+    assert (entry.status, entry.last_error, connection.sent) == ('sent', None, ['member0@mail.utoronto.ca'])
+
+
+def test_message_fails_after_max_attempts(db):
+    _queue(1)
+    connection = FlakyConnection(failures=10)
+    for _ in range(3):
+        db.session.query(EmailOutbox).update({'next_attempt_at': datetime.utcnow()})
+        db.session.commit()
+        drain_outbox(db.session, EmailOutbox, connection, max_attempts=3)
+    entry = db.session.query(EmailOutbox).one()
+    assert (entry.status, entry.attempts) == ('failed', 3)
+
+
+def test_connection_error_releases_rest_of_batch(db):
+    _queue(3)
+    connection = FlakyConnection(failures=1, error=smtplib.SMTPServerDisconnected('gone'))
+    assert drain_outbox(db.session, EmailOutbox, connection) == (1, 0)
+    assert connection.closed == 1
+    # The two messages it didn't reach are due again straight away, without a used attempt
+    assert drain_outbox(db.session, EmailOutbox, connection) == (2, 2)
+    assert sorted(e.attempts for e in db.session.query(EmailOutbox)) == [1, 1, 1]
+
+
+def test_two_workers_never_send_twice(tmp_path, monkeypatch):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'outbox.db'}"
+
+    app = create_app(FileConfig)
+    with app.app_context():
+        _db.create_all()
+        _queue(60)
+
+    # A slow server, so the two workers' batches overlap
+    with SMTPSink(on_message=lambda message: time.sleep(0.005)) as sink:
+        settings = {**smtp_settings(), 'host': sink.host, 'port': sink.port, 'starttls': False,
+                    'from_email': 'club@example.com'}
+        errors = []
+
+        def worker():
+            try:
+                with app.app_context():
+                    connection = SMTPConnection(settings)
+                    while drain_outbox(_db.session, EmailOutbox, connection, batch_size=5)[0]:
+                        pass
+                    connection.close()
+                    _db.session.remove()
+            except Exception as e:  # surfaced below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    deliveries = Counter(m.to for m in sink.messages)
+    assert len(deliveries) == 60
+    assert max(deliveries.values()) == 1
+
+
+def test_lapsed_claim_is_not_sent_twice(db, monkeypatch):
+    """A batch slower than CLAIM_SECONDS: a message another worker took meanwhile is skipped."""
+    start = datetime.utcnow()
+    clock = {'now': start}
+
+    class Clock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return clock['now']
+    monkeypatch.setattr(outbox, 'datetime', Clock)
+    _queue(3)
+
+    other = FlakyConnection(failures=0)
+
+    class SlowConnection(FlakyConnection):
+        def send(self, to_email, *args):
+            super().send(to_email, *args)
+            clock['now'] += timedelta(seconds=CLAIM_SECONDS / 2)
+            if len(self.sent) == 2:
+                # The rest of the batch's original claim has lapsed: a second worker drains the outbox
+                drain_outbox(db.session, EmailOutbox, other)
+
+    slow = SlowConnection(failures=0)
+    drain_outbox(db.session, EmailOutbox, slow)
+    assert slow.sent == ['member0@mail.utoronto.ca', 'member1@mail.utoronto.ca']
+    assert other.sent == ['member2@mail.utoronto.ca']
+    entries = db.session.query(EmailOutbox).all()
+    assert {(e.status, e.attempts) for e in entries} == {('sent', 1)}
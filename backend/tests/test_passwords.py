@@ -0,0 +1,105 @@
+"""PasswordHasher in pool mode: the bounded queue and the pool's lifecycle."""
+import threading
+import time
+
+import pytest
+
+from app.utils.passwords import COST_PROFILES, HasherBusy, PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(COST_PROFILES['fast'], workers=1, max_queue=2, timeout=5)
+    yield hasher
+    hasher.shutdown()
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_hash_and_verify_in_pool(hasher):
+    password_hash = hasher.hash('password123')
+    assert hasher.verify('password123', password_hash)
+    assert not hasher.verify('wrong', password_hash)
+    assert hasher.stats()['pending'] == 0
+
+
+def test_full_queue_is_refused(hasher):
+    threads = [threading.Thread(target=hasher._run, args=(time.sleep, 0.5)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: hasher.stats()['pending'] == 2)
+    with pytest.raises(HasherBusy):
+        hasher.hash('password123')
+    for thread in threads:
+        thread.join()
+    assert hasher.stats()['pending'] == 0
+
+
+def test_timed_out_job_stays_counted_until_it_finishes(hasher):
+    hasher.timeout = 0.1
+    with pytest.raises(HasherBusy):
+        hasher._run(time.sleep, 0.5)
+    # The pool process is still busy with it
+    assert hasher.stats()['pending'] == 1
+    _wait_for(lambda: hasher.stats()['pending'] == 0)
+
+
+def test_busy_rehash_does_not_fail_login(app, client, signup, monkeypatch):
+    signup('user@mail.utoronto.ca')
+    hasher = app.extensions['password_hasher']
+    monkeypatch.setattr(hasher, 'params', 'scrypt:65536:8:1')  # every stored hash is now outdated
+
+    def busy(password):
+        raise HasherBusy()
+    monkeypatch.setattr(hasher, 'hash', busy)
+    response = client.post('/api/auth/login', json={'email': 'user@mail.utoronto.ca', 'password': 'password123'})
+    assert response.status_code == 200
+    assert response.get_json()['access_token']
+
+
+def test_dead_pool_process_is_replaced(hasher):
+    hasher.hash('password123')
+    pool = hasher._executor
+    for process in list(pool._processes.values()):
+        process.kill()
+    _wait_for(lambda: pool._broken)
+    password_hash = hasher.hash('password123')
+    assert hasher._executor is not pool
+    assert hasher.verify('password123', password_hash)
+    assert hasher.stats()['pending'] == 0
+
+
+def test_job_on_a_dying_process_is_retried(hasher):
+    hasher.hash('password123')
+    pool = hasher._executor
+
+    def kill_soon():
+        time.sleep(0.2)
+        for process in list(pool._processes.values()):
+            process.kill()
+    killer = threading.Thread(target=kill_soon)
+    killer.start()
+    assert hasher._run(time.sleep, 0.5) is None
+    killer.join()
+    assert hasher._executor is not pool
+    assert hasher.stats()['pending'] == 0
+
+
+def test_start_forks_the_pool_up_front(hasher):
+    hasher.start()
+    assert len(hasher._executor._processes) == hasher.workers
+    assert hasher.stats()['pending'] == 0
+
+
+def test_pool_inherited_across_a_fork_is_rebuilt(hasher):
+    hasher.start()
+    inherited = hasher._executor
+    hasher._pid = -1  # as seen from a forked child
+    assert hasher.verify('password123', hasher.hash('password123'))
+    assert hasher._executor is not inherited
+    inherited.shutdown()
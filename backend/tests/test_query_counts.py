@@ -0,0 +1,107 @@
+"""
+Query budgets for list endpoints. Each test runs the request with a few rows
+and with many, and requires the same (small) number of statements for both,
+so a per-row lazy load or lookup fails the test.
+"""
+import pytest
+
+from app.utils.cache import get_cache
+
+SMALL, LARGE = 3, 12
+
+
+@pytest.fixture
+def seed_projects(client, signup):
+    """``seed_projects(n)`` -> (owner headers, project ids): n projects, each with skills and an owner name."""
+    def seed_projects(n, prefix='owner'):
+        ids = []
+        for i in range(n):
+            headers, _ = signup(f"{prefix}{i}@mail.utoronto.ca", full_name=f"Owner {i}")
+            response = client.post('/api/projects/', headers=headers, json={
+                'title': f"Project {prefix} {i}", 'description': 'Build things',
+                'category': 'Web', 'skills': 'Python, React',
+            })
+            assert response.status_code == 201
+            ids.append(response.get_json()['id'])
+        return headers, ids
+    return seed_projects
+
+
+def _statements_for(app, count_queries, request):
+    with app.app_context():
+        get_cache().clear()  # measure the uncached path
+    with count_queries() as statements:
+        response = request()
+    assert response.status_code == 200, response.get_json()
+    return len(statements)
+
+
+def _assert_constant(app, count_queries, request, seed, budget):
+    seed(SMALL)
+    small = _statements_for(app, count_queries, request)
+    seed(LARGE - SMALL)
+    large = _statements_for(app, count_queries, request)
+    assert large == small, f"{small} statements for {SMALL} rows but {large} for {LARGE}"
+    assert large <= budget
+
+
+@pytest.mark.parametrize('query_string', [
+    '',
+    '?view=compact',
+    '?sort=az&limit=50',
+    '?cursor=&limit=50&total=exact',
+    '?q=project&skills=python&limit=50',
+])
+def test_project_search(app, client, count_queries, seed_projects, query_string):
+    calls = iter(range(100))
+
+    def seed(n):
+        seed_projects(n, prefix=f"search{next(calls)}-")
+
+    _assert_constant(app, count_queries, lambda: client.get(f"/api/projects/search{query_string}"),
+                     seed, budget=4)
+
+
+def test_my_applications(app, client, signup, count_queries, seed_projects):
+    applicant, _ = signup('applicant@mail.utoronto.ca')
+    calls = iter(range(100))
+
+    def seed(n):
+        _, ids = seed_projects(n, prefix=f"apps{next(calls)}-")
+        for project_id in ids:
+            client.post(f"/api/projects/{project_id}/apply", json={'role': 'Dev'}, headers=applicant)
+
+    _assert_constant(app, count_queries, lambda: client.get('/api/projects/applications/me', headers=applicant),
+                     seed, budget=2)
+
+
+def test_project_applications(app, client, signup, count_queries, seed_projects):
+    owner, (project_id,) = seed_projects(1, prefix='project-owner')
+    calls = iter(range(100))
+
+    def seed(n):
+        for _ in range(n):
+            headers, _ = signup(f"applicant{next(calls)}@mail.utoronto.ca", full_name='Applicant')
+            client.post(f"/api/projects/{project_id}/apply", json={'role': 'Dev'}, headers=headers)
+
+    _assert_constant(app, count_queries,
+                     lambda: client.get(f"/api/projects/{project_id}/applications", headers=owner),
+                     seed, budget=3)
+
+
+def test_htf_listing(app, client, signup, count_queries, monkeypatch):
+    monkeypatch.setenv('HTF_REVEAL', 'true')
+    calls = iter(range(100))
+
+    def seed(n):
+        for _ in range(n):
+            i = next(calls)
+            headers, _ = signup(f"htf{i}@mail.utoronto.ca", full_name=f"Hacker {i}")
+            response = client.post('/api/htf/', headers=headers, json={
+                'project_name': f"Hack {i}", 'team_name': 'Team',
+                'youtube_url': 'https://youtube.com/watch?v=x', 'github_url': 'https://github.com/x/y',
+                'description': 'A hack',
+            })
+            assert response.status_code == 201, response.get_json()
+
+    _assert_constant(app, count_queries, lambda: client.get('/api/htf/'), seed, budget=3)
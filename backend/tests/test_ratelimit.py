@@ -0,0 +1,110 @@
+"""SharedMemoryStorage (shm://), driven directly through the limits strategies."""
+import multiprocessing
+
+import pytest
+from limits import parse
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+from app.utils import ratelimit
+from app.utils.ratelimit import SharedMemoryStorage
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def uri(tmp_path):
+    return f"shm://{tmp_path / 'ratelimit'}"
+
+
+@pytest.mark.parametrize('strategy', [FixedWindowRateLimiter, SlidingWindowCounterRateLimiter])
+def test_hit_test_and_reset(uri, clock, strategy):
+    storage = SharedMemoryStorage(uri)
+    limiter = strategy(storage)
+    item = parse('3/minute')
+    assert all(limiter.hit(item, 'user:1') for _ in range(3))
+    assert not limiter.test(item, 'user:1')
+    assert not limiter.hit(item, 'user:1')
+    assert limiter.test(item, 'user:2')  # other keys have their own budget
+    limiter.clear(item, 'user:1')
+    assert limiter.hit(item, 'user:1')
+    assert storage.reset() >= 1
+    assert limiter.get_window_stats(item, 'user:1').remaining == 3
+
+
+def test_fixed_window_expires(uri, clock):
+    limiter = FixedWindowRateLimiter(SharedMemoryStorage(uri))
+    item = parse('2/minute')
+    assert limiter.hit(item, 'k') and limiter.hit(item, 'k')
+    assert not limiter.hit(item, 'k')
+    clock.now += 61
+    assert limiter.hit(item, 'k')
+
+
+def test_sliding_window_weighs_the_previous_window(uri, clock):
+    limiter = SlidingWindowCounterRateLimiter(SharedMemoryStorage(uri))
+    item = parse('4/minute')
+    clock.now = 60 * 20_000  # start of a window
+    assert all(limiter.hit(item, 'k') for _ in range(4))
+    clock.now += 75  # a quarter into the next window: 3 of the 4 still count
+    assert limiter.hit(item, 'k')
+    assert not limiter.hit(item, 'k')
+    clock.now += 45  # the old window has slid out entirely
+    assert limiter.test(item, 'k')
+
+
+def test_full_table_evicts_the_counter_expiring_soonest(uri, clock):
+    storage = SharedMemoryStorage(uri, slots=ratelimit.MAX_PROBE)
+    for i in range(ratelimit.MAX_PROBE):
+        storage.incr(f"key:{i}", expiry=100 + i)
+    assert storage.incr('one more', expiry=100) == 1
+    assert storage.get('key:0') == 0  # shortest expiry made room
+    assert all(storage.get(f"key:{i}") == 1 for i in range(1, ratelimit.MAX_PROBE))
+    assert storage.get('one more') == 1
+
+
+def test_reopening_with_another_size_starts_empty(uri, clock):
+    SharedMemoryStorage(uri, slots=64).incr('k', expiry=60)
+    assert SharedMemoryStorage(uri, slots=128).get('k') == 0
+    assert SharedMemoryStorage(uri, slots=128).incr('k', expiry=60) == 1
+
+
+def _hammer(uri, attempts, results):
+    limiter = SlidingWindowCounterRateLimiter(SharedMemoryStorage(uri))
+    item = parse('50/hour')
+    results.put(sum(limiter.hit(item, 'shared') for _ in range(attempts)))
+
+
+def test_processes_share_one_budget(uri):
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    workers = [context.Process(target=_hammer, args=(uri, 40, results)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    allowed = [results.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join()
+    assert sum(allowed) == 50
+
+
+def test_storage_opened_before_a_fork_still_shares_counters(uri):
+    storage = SharedMemoryStorage(uri)
+    storage.incr('k', expiry=60)
+    context = multiprocessing.get_context('fork')
+    child = context.Process(target=storage.incr, args=('k', 60))
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+    assert storage.get('k') == 2
@@ -0,0 +1,63 @@
+"""Search response cache: repeated searches are served from the cache."""
+import pytest
+
+
+@pytest.fixture
+def project(client, signup):
+    headers, _ = signup('owner@mail.utoronto.ca', full_name='Owner')
+    response = client.post('/api/projects/', headers=headers, json={
+        'title': 'Robot arm', 'description': 'Build a robot arm', 'category': 'Hardware', 'skills': 'Python',
+    })
+    assert response.status_code == 201
+    return response.get_json()
+
+
+@pytest.mark.parametrize('query_string', [
+    '?q=robot',
+    '?cursor=&total=exact',
+    '?cursor=&total=approx',
+    '?cursor=&total=approx&q=robot&skills=python',
+])
+def test_repeated_search_is_a_hit(client, project, query_string):
+    first = client.get(f"/api/projects/search{query_string}")
+    second = client.get(f"/api/projects/search{query_string}")
+    assert first.status_code == second.status_code == 200
+    assert first.headers['X-Cache'] == 'MISS'
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.get_json() == first.get_json()
+
+
+def test_write_invalidates_cached_search(client, project, signup):
+    client.get('/api/projects/search?q=robot')
+    headers, _ = signup('applicant@mail.utoronto.ca')
+    client.post(f"/api/projects/{project['id']}/apply", json={'role': 'Dev'}, headers=headers)
+    response = client.get('/api/projects/search?q=robot')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json()['projects'][0]['application_count'] == 1
+
+
+def test_cached_search_revalidates_without_queries(client, project, count_queries):
+    first = client.get('/api/projects/search?q=robot')
+    etag = first.headers['ETag']
+    with count_queries() as statements:
+        response = client.get('/api/projects/search?q=robot', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert statements == []
+
+
+def test_unrelated_profile_edit_keeps_search_etag(client, project, signup):
+    etag = client.get('/api/projects/search?q=robot').headers['ETag']
+    headers, _ = signup('someone@mail.utoronto.ca')
+    client.put('/api/profile/', json={'full_name': 'Someone Else'}, headers=headers)
+    response = client.get('/api/projects/search?q=robot', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+def test_owner_rename_changes_search_etag(client, project):
+    first = client.get('/api/projects/search?q=robot')
+    login = client.post('/api/auth/login', json={'email': 'owner@mail.utoronto.ca', 'password': 'password123'})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+    client.put('/api/profile/', json={'full_name': 'Renamed Owner'}, headers=headers)
+    response = client.get('/api/projects/search?q=robot', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != first.headers['ETag']
@@ -0,0 +1,38 @@
+"""Keyset (cursor) pagination of /api/projects/search."""
+import pytest
+
+
+@pytest.fixture
+def projects(client, signup):
+    headers, _ = signup('owner@mail.utoronto.ca', full_name='Owner')
+    for i in range(7):
+        response = client.post('/api/projects/', headers=headers, json={
+            'title': f"Robot {i}", 'description': 'Build a robot', 'category': 'Hardware', 'skills': 'Python',
+        })
+        assert response.status_code == 201
+
+
+@pytest.mark.parametrize('total_mode', ['exact', 'approx'])
+@pytest.mark.parametrize('keyword', ['', 'robot'])
+def test_every_page_reports_the_whole_total(client, projects, total_mode, keyword):
+    url = f"/api/projects/search?q={keyword}&sort=az&limit=3&total={total_mode}&cursor="
+    seen, totals = [], []
+    cursor = ''
+    while True:
+        body = client.get(f"{url}{cursor}").get_json()
+        seen += [p['title'] for p in body['projects']]
+        totals.append(body['total'])
+        if not body['next_cursor']:
+            break
+        cursor = body['next_cursor']
+    assert seen == [f"Robot {i}" for i in range(7)]
+    assert totals == [7, 7, 7]
+
+
+def test_approx_total_cached_by_a_later_page(client, projects):
+    url = '/api/projects/search?q=robot&sort=az&limit=3&cursor='
+    cursor = client.get(f"{url}&total=exact").get_json()['next_cursor']
+    # The second page is the first to fill the cached count
+    second = client.get(f"{url}{cursor}&total=approx").get_json()
+    first = client.get(f"{url}&total=approx").get_json()
+    assert second['total'] == first['total'] == 7
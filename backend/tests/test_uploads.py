@@ -0,0 +1,28 @@
+"""Upload limits: oversized bodies are refused before the form is parsed."""
+import io
+
+
+def test_declared_oversized_resume_is_rejected(client, signup):
+    headers, _ = signup('member@mail.utoronto.ca')
+    pdf = b'%PDF-1.4\n' + b'0' * (6 * 1024 * 1024)
+    response = client.post('/api/profile/resume', headers=headers,
+                           data={'resume': (io.BytesIO(pdf), 'cv.pdf')}, content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert 'error' in response.get_json()
+
+
+def test_file_over_limit_within_envelope_is_rejected(client, signup):
+    headers, _ = signup('member@mail.utoronto.ca')
+    # Over the 5MB resume limit, but within the multipart allowance: the spool counter catches it
+    pdf = b'%PDF-1.4\n' + b'0' * (5 * 1024 * 1024 + 1024)
+    response = client.post('/api/profile/resume', headers=headers,
+                           data={'resume': (io.BytesIO(pdf), 'cv.pdf')}, content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'File size must be less than 5MB'
+
+
+def test_wrong_magic_bytes_are_rejected(client, signup):
+    headers, _ = signup('member@mail.utoronto.ca')
+    response = client.post('/api/profile/resume', headers=headers,
+                           data={'resume': (io.BytesIO(b'not a pdf'), 'cv.pdf')}, content_type='multipart/form-data')
+    assert response.status_code == 400
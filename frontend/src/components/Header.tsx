@@ -29,7 +29,8 @@ function getAvatarUrl(): string | null {
     if (cached) {
       const profile = JSON.parse(cached);
       if (profile.has_avatar && profile.user_id) {
-        return `${API_BASE_URL}/api/profile/avatar/${profile.user_id}`;
+        const url = `${API_BASE_URL}/api/profile/avatar/${profile.user_id}`;
+        return profile.avatar_version ? `${url}?v=${profile.avatar_version}` : url;
       }
     }
   } catch {}
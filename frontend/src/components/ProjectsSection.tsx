@@ -28,7 +28,7 @@ export default function ProjectsSection({ userId }: ProjectsSectionProps) {
       try {
         if (userId !== undefined) {
           // Public view: fetch user's projects via public endpoint
-          const res = await projectApi.getUserProjects(userId);
+          const res = await projectApi.getUserProjects(userId, 'compact');
           if (res.data && Array.isArray(res.data)) {
             setProjects(
               res.data.map((p: any) => ({
@@ -44,7 +44,7 @@ export default function ProjectsSection({ userId }: ProjectsSectionProps) {
         } else {
           // Own profile: fetch owned + member projects
           const [ownedRes, appsRes] = await Promise.all([
-            projectApi.getMyProjects(),
+            projectApi.getMyProjects('compact'),
             projectApi.getMyApplications(),
           ]);
 
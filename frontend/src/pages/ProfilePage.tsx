@@ -25,7 +25,7 @@ export default function ProfilePage({ viewUserId }: ProfilePageProps) {
   const [userEmail, setUserEmail] = useState("");
   const [userId, setUserId] = useState<number | null>(null);
   const [hasAvatar, setHasAvatar] = useState(false);
-  const [avatarVersion, setAvatarVersion] = useState(0);
+  const [avatarVersion, setAvatarVersion] = useState<string | null>(null);
   const [avatarUploading, setAvatarUploading] = useState(false);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -73,12 +73,14 @@ export default function ProfilePage({ viewUserId }: ProfilePageProps) {
           ...profile,
           user_id: response.data.user_id,
           has_avatar: !!response.data.has_avatar,
+          avatar_version: response.data.avatar_version || null,
         }));
         return profile;
       });
       setUserEmail(response.data.email || "");
       setUserId(response.data.user_id || null);
       setHasAvatar(!!response.data.has_avatar);
+      setAvatarVersion(response.data.avatar_version || null);
     }
   };
 
@@ -103,6 +105,7 @@ export default function ProfilePage({ viewUserId }: ProfilePageProps) {
         resume_filename: response.data.resume_filename || ""
       });
       setHasAvatar(!!response.data.has_avatar);
+      setAvatarVersion(response.data.avatar_version || null);
     }
   };
 
@@ -220,14 +223,16 @@ export default function ProfilePage({ viewUserId }: ProfilePageProps) {
     if (response.error) {
       alert(`Error: ${response.error}`);
     } else {
+      const version = response.data?.avatar_version || null;
       setHasAvatar(true);
-      setAvatarVersion((v) => v + 1);
+      setAvatarVersion(version);
       // Update cache so navbar avatar updates
       try {
         const cached = localStorage.getItem('profile_cache');
         if (cached) {
           const c = JSON.parse(cached);
           c.has_avatar = true;
+          c.avatar_version = version;
           localStorage.setItem('profile_cache', JSON.stringify(c));
         }
       } catch {}
@@ -242,13 +247,14 @@ export default function ProfilePage({ viewUserId }: ProfilePageProps) {
       alert(`Error: ${response.error}`);
     } else {
       setHasAvatar(false);
-      setAvatarVersion((v) => v + 1);
+      setAvatarVersion(null);
       // Update cache so navbar avatar updates
       try {
         const cached = localStorage.getItem('profile_cache');
         if (cached) {
           const c = JSON.parse(cached);
           c.has_avatar = false;
+          c.avatar_version = null;
           localStorage.setItem('profile_cache', JSON.stringify(c));
         }
       } catch {}
@@ -262,7 +268,7 @@ export default function ProfilePage({ viewUserId }: ProfilePageProps) {
   };
 
   const avatarUserId = isPublicView ? viewUserId : userId;
-  const avatarUrl = hasAvatar && avatarUserId ? `${profileApi.getAvatarUrl(avatarUserId)}?v=${avatarVersion}` : null;
+  const avatarUrl = hasAvatar && avatarUserId ? profileApi.getAvatarUrl(avatarUserId, avatarVersion) : null;
 
   const fetchResumeBlob = async () => {
     let url: string;
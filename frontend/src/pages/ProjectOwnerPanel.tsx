@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import Header from '../components/Header';
 import Footer from '../components/Footer';
-import { projectApi } from '../utils/api';
+import { projectApi, profileApi } from '../utils/api';
 import { PROJECT_CATEGORIES } from '../constants/categories';
 
 interface Applicant {
@@ -37,6 +37,8 @@ const ProjectOwnerPanel: React.FC = () => {
   const [error, setError] = useState('');
   const [expandedProject, setExpandedProject] = useState<number | null>(null);
   const [applicationUpdating, setApplicationUpdating] = useState<number | null>(null);
+  // Applicant avatar URLs by user id, fetched in one batch request per project
+  const [applicantAvatars, setApplicantAvatars] = useState<Record<string, string | null>>({});
 
   // Edit modal state
   const [editingProject, setEditingProject] = useState<OwnedProject | null>(null);
@@ -105,6 +107,16 @@ const ProjectOwnerPanel: React.FC = () => {
           project.id === projectId ? { ...project, applications: result.data } : project
         )
       );
+
+      const applicantIds = Array.from(
+        new Set((result.data || []).map((app: ProjectApplication) => app.user_id))
+      );
+      if (applicantIds.length > 0) {
+        const avatars = await profileApi.getAvatarUrls(applicantIds, 48);
+        if (avatars.data) {
+          setApplicantAvatars((prev) => ({ ...prev, ...avatars.data }));
+        }
+      }
     }
   };
 
@@ -304,13 +316,26 @@ const ProjectOwnerPanel: React.FC = () => {
                             className="bg-white p-4 rounded-xl ring-1 ring-slate-200"
                           >
                             <div className="flex justify-between items-start mb-3">
-                              <div>
-                                <a href={`#/profile/${app.user_id}`} className="text-sm font-medium text-slate-900 hover:text-slate-700 hover:underline transition">
-                                  {app.applicant?.name || 'Unknown'}
-                                </a>
-                                <p className="text-xs text-slate-500">
-                                  {app.applicant?.email || 'No email'}
-                                </p>
+                              <div className="flex items-center gap-3">
+                                {applicantAvatars[app.user_id] ? (
+                                  <img
+                                    src={applicantAvatars[app.user_id]!}
+                                    alt=""
+                                    className="h-9 w-9 rounded-full object-cover"
+                                  />
+                                ) : (
+                                  <span className="h-9 w-9 rounded-full bg-gradient-to-br from-sky-600 to-indigo-600 text-white grid place-items-center text-sm font-semibold">
+                                    {(app.applicant?.name || app.applicant?.email || '?').charAt(0).toUpperCase()}
+                                  </span>
+                                )}
+                                <div>
+                                  <a href={`#/profile/${app.user_id}`} className="text-sm font-medium text-slate-900 hover:text-slate-700 hover:underline transition">
+                                    {app.applicant?.name || 'Unknown'}
+                                  </a>
+                                  <p className="text-xs text-slate-500">
+                                    {app.applicant?.email || 'No email'}
+                                  </p>
+                                </div>
                               </div>
                               <span className={`text-xs font-medium ${getStatusColor(app.status)}`}>
                                 {app.status.charAt(0).toUpperCase() + app.status.slice(1)}
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from "react";
 import Header from "../components/Header";
 import Footer from "../components/Footer";
-import { projectApi, authUtils } from "../utils/api";
+import { projectApi, profileApi, authUtils } from "../utils/api";
 import { PROJECT_CATEGORIES } from "../constants/categories";
 
 const API_BASE_URL = (import.meta as any).env?.VITE_API_URL || 'http://localhost:5000';
@@ -46,6 +46,9 @@ export default function ProjectSearchPage() {
   const [totalResults, setTotalResults] = useState(0);
   const limit = 10;
 
+  // Owner avatar URLs for the current page, fetched in one batch request
+  const [ownerAvatars, setOwnerAvatars] = useState<Record<string, string | null>>({});
+
   // Apply modal state
   const [showApplyModal, setShowApplyModal] = useState(false);
   const [selectedProject, setSelectedProject] = useState<Project | null>(null);
@@ -79,6 +82,7 @@ export default function ProjectSearchPage() {
       setProjects(data.projects);
       setTotalPages(data.pages);
       setTotalResults(data.total);
+      loadOwnerAvatars(data.projects);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'An error occurred');
     } finally {
@@ -86,6 +90,16 @@ export default function ProjectSearchPage() {
     }
   };
 
+  const loadOwnerAvatars = async (results: Project[]) => {
+    const ownerIds = Array.from(new Set(results.map((project) => project.owner.id)));
+    if (ownerIds.length === 0) {
+      setOwnerAvatars({});
+      return;
+    }
+    const response = await profileApi.getAvatarUrls(ownerIds, 48);
+    setOwnerAvatars(response.data || {});
+  };
+
   // Fetch projects when filters or page changes
   useEffect(() => {
     fetchProjects();
@@ -218,6 +232,7 @@ export default function ProjectSearchPage() {
                   className="w-full px-4 py-3 rounded-lg border border-slate-200 bg-white focus:border-slate-400 focus:ring-1 focus:ring-slate-300 outline-none text-sm"
                 >
                   <option value="newest">Newest First</option>
+                  <option value="relevance">Best Match</option>
                   <option value="az">Alphabetical (A-Z)</option>
                   <option value="most_applications">Most Applications</option>
                 </select>
@@ -295,9 +310,22 @@ export default function ProjectSearchPage() {
                         <h3 className="text-xl font-bold text-slate-900">
                           {project.title}
                         </h3>
-                        <p className="text-sm text-slate-500 mt-1">
-                          By <a href={`#/profile/${project.owner.id}`} className="font-medium text-slate-700 hover:text-slate-900 hover:underline transition">{project.owner.name || project.owner.email}</a> ·{" "}
-                          {new Date(project.created_at).toLocaleDateString()}
+                        <p className="flex items-center gap-2 text-sm text-slate-500 mt-1">
+                          {ownerAvatars[project.owner.id] ? (
+                            <img
+                              src={ownerAvatars[project.owner.id]!}
+                              alt=""
+                              className="h-6 w-6 rounded-full object-cover"
+                            />
+                          ) : (
+                            <span className="h-6 w-6 rounded-full bg-gradient-to-br from-sky-600 to-indigo-600 text-white grid place-items-center text-xs font-semibold">
+                              {(project.owner.name || project.owner.email || "?").charAt(0).toUpperCase()}
+                            </span>
+                          )}
+                          <span>
+                            By <a href={`#/profile/${project.owner.id}`} className="font-medium text-slate-700 hover:text-slate-900 hover:underline transition">{project.owner.name || project.owner.email}</a> ·{" "}
+                            {new Date(project.created_at).toLocaleDateString()}
+                          </span>
                         </p>
                       </div>
                       {project.category && (
@@ -124,16 +124,18 @@ export const authApi = {
 export const projectApi = {
   /**
    * Get user's own projects
+   * Pass view 'compact' for card-sized results (truncated description)
    */
-  getMyProjects: async () => {
-    return apiRequest('/api/projects/me');
+  getMyProjects: async (view?: 'compact') => {
+    return apiRequest(`/api/projects/me${view ? `?view=${view}` : ''}`);
   },
 
   /**
    * Get projects for a specific user (public)
+   * Pass view 'compact' for card-sized results (truncated description)
    */
-  getUserProjects: async (userId: number) => {
-    return apiRequest(`/api/projects/user/${userId}`);
+  getUserProjects: async (userId: number, view?: 'compact') => {
+    return apiRequest(`/api/projects/user/${userId}${view ? `?view=${view}` : ''}`);
   },
 
   /**
@@ -386,10 +388,30 @@ export const profileApi = {
   },
 
   /**
-   * Get avatar URL for a user (public, no auth needed)
+   * Get avatar URL for a user (public, no auth needed).
+   * Pass the profile's avatar_version so the browser can cache it for good.
    */
-  getAvatarUrl: (userId: number) => {
-    return `${API_BASE_URL}/api/profile/avatar/${userId}`;
+  getAvatarUrl: (userId: number, version?: string | null) => {
+    const url = `${API_BASE_URL}/api/profile/avatar/${userId}`;
+    return version ? `${url}?v=${version}` : url;
+  },
+
+  /**
+   * Avatar URLs for many users in one request (listing pages).
+   * Returns a map of user id -> absolute URL, or null when the user has no avatar.
+   */
+  getAvatarUrls: async (userIds: number[], size?: number) => {
+    const params = new URLSearchParams({ ids: userIds.join(',') });
+    if (size) params.set('size', String(size));
+    const response = await apiRequest<{ avatars: Record<string, string | null> }>(`/api/profile/avatars?${params}`);
+    if (response.data) {
+      const urls: Record<string, string | null> = {};
+      for (const [id, path] of Object.entries(response.data.avatars)) {
+        urls[id] = path ? `${API_BASE_URL}${path}` : null;
+      }
+      return { ...response, data: urls };
+    }
+    return { error: response.error, status: response.status };
   },
 
   /**